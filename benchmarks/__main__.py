@@ -0,0 +1,155 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from enum import Enum
+
+import click
+
+from .cases import CASES, DEFAULT_KINDS, FIXED_SIZE_CASES, KIND_INDEPENDENT_CASES
+from .generate import TaskKind, write_task_file
+
+# Constants
+DEFAULT_SIZES = "10,1000,10000"
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class BenchmarkMessages(Enum):
+    RUNNING = "{:<20} {:<6} {:>8} ..."
+    RESULT = "{:<20} {:<6} {:>8} {:>12.4f}s {:>14} tasks/s {:>12} us/task {:>10} KB"
+    FAILED = "{:<20} {:<6} {:>8} failed: {}"
+    SAVED = "Results saved to {}"
+    COMPARE_HEADER = "{:<36} {:>12} {:>12} {:>9}"
+    COMPARE_ROW = "{:<36} {:>11.4f}s {:>11.4f}s {:>+8.1f}%{}"
+    REGRESSION = "  REGRESSION"
+    MISSING = "{:<36} only in {}"
+    REGRESSIONS_FOUND = "{} benchmark(s) slower than the baseline by more than {:.0%}"
+    GENERATED = "Wrote {} {} tasks to {}"
+
+
+def _parse_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _format_number(value, precision=0):
+    return "-" if value is None else f"{value:,.{precision}f}"
+
+
+def _result_key(case, kind, size):
+    return f"{case}/{kind}/{size}"
+
+
+def _run_case_in_subprocess(case, size, kind, timeout):
+    # Every case gets a fresh interpreter so peak memory and import costs don't leak between cases
+    completed = subprocess.run([sys.executable, "-m", "benchmarks", "case", case, str(size), kind],
+                               cwd=ROOT_DIR, capture_output=True, text=True, timeout=timeout)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else
+                           f"exit code {completed.returncode}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option("--cases", "case_names", default=",".join(CASES), show_default=True,
+              help="Comma-separated benchmark cases")
+@click.option("--sizes", default=DEFAULT_SIZES, show_default=True,
+              help="Comma-separated task counts (up to 1000000)")
+@click.option("--kinds", default=",".join(DEFAULT_KINDS), show_default=True,
+              help="Comma-separated plugin kinds for the execute cases")
+@click.option("--save", "save_path", type=click.Path(dir_okay=False, writable=True),
+              help="Write the results to this JSON file, e.g. to keep as a baseline")
+@click.option("--timeout", type=click.FloatRange(min=0, min_open=True), help="Time limit per case in seconds")
+def run(case_names, sizes, kinds, save_path, timeout):
+    results = {}
+    for case in _parse_list(case_names):
+        if case not in CASES:
+            raise click.BadParameter(f"Unknown case '{case}'", param_hint="--cases")
+        case_kinds = ["-"] if case in KIND_INDEPENDENT_CASES else _parse_list(kinds)
+        case_sizes = [FIXED_SIZE_CASES[case]] if case in FIXED_SIZE_CASES else [int(size) for size in _parse_list(sizes)]
+        for kind in case_kinds:
+            for size in case_sizes:
+                try:
+                    result = _run_case_in_subprocess(case, size, kind, timeout)
+                except (RuntimeError, subprocess.TimeoutExpired) as e:
+                    click.echo(BenchmarkMessages.FAILED.value.format(case, kind, size, e))
+                    continue
+                results[_result_key(case, kind, size)] = result
+                click.echo(BenchmarkMessages.RESULT.value.format(
+                    case, kind, size, result["seconds"], _format_number(result.get("throughput")),
+                    _format_number(result.get("per_task_us"), 1), _format_number(result.get("peak_rss_kb"))))
+
+    if save_path:
+        report = {
+            "meta": {
+                "created_at": time.time(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "results": results,
+        }
+        with open(save_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        click.echo(BenchmarkMessages.SAVED.value.format(save_path))
+
+
+@cli.command(hidden=True)
+@click.argument("case", type=click.Choice(list(CASES)))
+@click.argument("size", type=int)
+@click.argument("kind")
+def case(case, size, kind):
+    kind = TaskKind.NOOP.value if kind == "-" else kind
+    click.echo(json.dumps(CASES[case](size, kind)))
+
+
+@cli.command()
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False))
+@click.argument("current", type=click.Path(exists=True, dir_okay=False))
+@click.option("--threshold", type=click.FloatRange(min=0), default=DEFAULT_REGRESSION_THRESHOLD, show_default=True,
+              help="Relative slowdown that counts as a regression (0.1 = 10%)")
+def compare(baseline, current, threshold):
+    with open(baseline, "r", encoding="utf-8") as f:
+        baseline_results = json.load(f)["results"]
+    with open(current, "r", encoding="utf-8") as f:
+        current_results = json.load(f)["results"]
+
+    regressions = 0
+    click.echo(BenchmarkMessages.COMPARE_HEADER.value.format("benchmark", "baseline", "current", "change"))
+    for key in sorted(set(baseline_results) | set(current_results)):
+        if key not in current_results:
+            click.echo(BenchmarkMessages.MISSING.value.format(key, baseline))
+            continue
+        if key not in baseline_results:
+            click.echo(BenchmarkMessages.MISSING.value.format(key, current))
+            continue
+        before = baseline_results[key]["seconds"]
+        after = current_results[key]["seconds"]
+        change = (after - before) / before if before else 0.0
+        regressed = change > threshold
+        regressions += regressed
+        click.echo(BenchmarkMessages.COMPARE_ROW.value.format(
+            key, before, after, change * 100, BenchmarkMessages.REGRESSION.value if regressed else ""))
+
+    if regressions:
+        raise click.ClickException(BenchmarkMessages.REGRESSIONS_FOUND.value.format(regressions, threshold))
+
+
+@cli.command()
+@click.argument("path", type=click.Path(dir_okay=False, writable=True))
+@click.option("--count", type=click.IntRange(min=1), default=1000, show_default=True)
+@click.option("--kind", type=click.Choice(DEFAULT_KINDS), default=TaskKind.NOOP.value, show_default=True)
+def generate(path, count, kind):
+    write_task_file(path, count, kind)
+    click.echo(BenchmarkMessages.GENERATED.value.format(count, kind, path))
+
+
+if __name__ == "__main__":
+    cli()
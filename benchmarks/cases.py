@@ -0,0 +1,115 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict
+
+from taskrunner.models.task_model import TaskModel
+from taskrunner.tasks.async_executor import run_tasks_async
+from taskrunner.tasks.executor import run_tasks_in_parallel, run_tasks_sequentially
+from taskrunner.tasks.metrics import get_peak_rss_kb
+from taskrunner.utils.env_substitution import substitute_env_vars
+from taskrunner.utils.file_loader import load_task_records, load_tasks_from_file
+from taskrunner.utils.output import OutputMode, output_sink
+from taskrunner.utils.plugin_discovery import discover_plugins, discover_plugins_lazily
+
+from .generate import PLACEHOLDER_ENV_VAR, TaskKind, generate_task_entries, nested_config, write_task_file
+from .plugins import BENCHMARK_PLUGINS
+
+# Constants
+STARTUP_COMMANDS = {
+    "help": ["--help"],
+    "list_plugins": ["list-plugins"],
+}
+
+
+def _measure(func, count: int) -> Dict:
+    started = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - started
+    return {
+        "seconds": seconds,
+        "throughput": count / seconds if seconds else None,
+        "per_task_us": seconds / count * 1e6 if count else None,
+        "peak_rss_kb": get_peak_rss_kb(),
+    }
+
+
+def _build_tasks(size, kind):
+    return [TaskModel(**entry) for entry in generate_task_entries(size, kind)]
+
+
+def _load(suffix, load=load_tasks_from_file):
+    def case(size, kind):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, f"tasks{suffix}")
+            write_task_file(path, size, kind)
+            # Peak RSS includes the loaded tasks, since they are still referenced when it is taken
+            tasks = []
+            return _measure(lambda: tasks.extend(load(path)), size)
+    return case
+
+
+def substitute(size, kind):
+    os.environ.setdefault(PLACEHOLDER_ENV_VAR, "secret")
+    configs = [nested_config(index) for index in range(size)]
+    return _measure(lambda: [substitute_env_vars(config) for config in configs], size)
+
+
+def discover(size, kind):
+    # Size is the number of repeated discoveries; each one rescans the plugin folder
+    def run():
+        for _ in range(size):
+            discover_plugins()
+    return _measure(run, size)
+
+
+def discover_lazily(size, kind):
+    def run():
+        for _ in range(size):
+            discover_plugins_lazily()
+    return _measure(run, size)
+
+
+def _execute(run_tasks):
+    def case(size, kind):
+        tasks = _build_tasks(size, kind)
+        # Quiet output keeps the terminal out of the measurement
+        with output_sink(OutputMode.QUIET.value):
+            return _measure(lambda: run_tasks(tasks, BENCHMARK_PLUGINS), size)
+    return case
+
+
+def startup(size, kind):
+    # Wall time of fresh interpreters running the CLI, including imports and plugin discovery
+    results = {}
+    for name, args in STARTUP_COMMANDS.items():
+        started = time.perf_counter()
+        for _ in range(size):
+            subprocess.run([sys.executable, "-m", "taskrunner", *args], check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        results[f"{name}_seconds"] = (time.perf_counter() - started) / size
+    results["seconds"] = sum(results.values())
+    return results
+
+
+CASES: Dict[str, Callable[[int, str], Dict]] = {
+    "load_yaml": _load(".yaml"),
+    "load_jsonl": _load(".jsonl"),
+    "load_records_jsonl": _load(".jsonl", load_task_records),
+    "substitute": substitute,
+    "discover": discover,
+    "discover_lazily": discover_lazily,
+    "execute_sequential": _execute(run_tasks_sequentially),
+    "execute_parallel": _execute(run_tasks_in_parallel),
+    "execute_asyncio": _execute(run_tasks_async),
+    "startup": startup,
+}
+
+# Cases whose cost does not depend on the task kind only run once per size
+KIND_INDEPENDENT_CASES = {"load_yaml", "load_jsonl", "load_records_jsonl", "substitute", "discover", "discover_lazily", "startup"}
+
+# Cases that repeat a fixed amount of work instead of scaling with the task count
+FIXED_SIZE_CASES = {"discover": 20, "discover_lazily": 20, "startup": 3}
+DEFAULT_KINDS = [kind.value for kind in TaskKind]
@@ -0,0 +1,48 @@
+import json
+from enum import Enum
+from typing import Dict, Iterator
+
+import yaml
+
+from .plugins import CPU_ROUNDS, SLEEP_SECONDS
+
+# Constants
+PLACEHOLDER_ENV_VAR = "TASKRUNNER_BENCH_VALUE"
+
+
+class TaskKind(str, Enum):
+    NOOP = "noop"
+    SLEEP = "sleep"
+    CPU = "cpu"
+
+
+def nested_config(index: int) -> Dict:
+    # Several levels of dicts and lists with a few placeholders, like a real HTTP or file task
+    return {
+        "seed": f"task-{index}",
+        "rounds": CPU_ROUNDS,
+        "seconds": SLEEP_SECONDS,
+        "request": {
+            "url": f"https://example.com/items/{index}?token=${{{PLACEHOLDER_ENV_VAR}}}",
+            "headers": {"Accept": "application/json", "X-Request": f"bench-{index}"},
+            "retry": {"codes": [429, 500, 502, 503], "limit": 3},
+        },
+        "labels": [f"group-{index % 10}", "benchmark", {"owner": f"${{{PLACEHOLDER_ENV_VAR}}}"}],
+    }
+
+
+def generate_task_entries(count: int, kind: str = TaskKind.NOOP.value) -> Iterator[Dict]:
+    type_name = f"bench_{kind}"
+    for index in range(count):
+        yield {"name": f"task_{index}", "type": type_name, "config": nested_config(index)}
+
+
+def write_task_file(path: str, count: int, kind: str = TaskKind.NOOP.value):
+    # Written entry by entry so a million-task file never has to fit in memory at once
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for entry in generate_task_entries(count, kind):
+                f.write(json.dumps(entry) + "\n")
+        else:
+            for entry in generate_task_entries(count, kind):
+                f.write(yaml.safe_dump([entry], sort_keys=False))
@@ -0,0 +1,37 @@
+import hashlib
+import time
+
+from taskrunner.plugin_base import BaseTaskRunner
+
+# Constants
+SLEEP_SECONDS = 0.001
+CPU_ROUNDS = 200
+
+
+class NoopTask(BaseTaskRunner):
+    # Measures pure scheduling overhead
+    type_name = "bench_noop"
+
+    def run(self, config):
+        pass
+
+
+class SleepTask(BaseTaskRunner):
+    # I/O-bound stand-in: releases the GIL like a network call would
+    type_name = "bench_sleep"
+
+    def run(self, config):
+        time.sleep(config.get("seconds", SLEEP_SECONDS))
+
+
+class CpuTask(BaseTaskRunner):
+    # CPU-bound stand-in: holds the GIL for the whole run
+    type_name = "bench_cpu"
+
+    def run(self, config):
+        digest = config.get("seed", "").encode()
+        for _ in range(config.get("rounds", CPU_ROUNDS)):
+            digest = hashlib.sha256(digest).digest()
+
+
+BENCHMARK_PLUGINS = {plugin.type_name: plugin for plugin in (NoopTask, SleepTask, CpuTask)}
@@ -1,11 +1,26 @@
 import click
 import logging
+import os
 import re
 from enum import Enum
 
-from .utils.file_loader import load_tasks_from_file
-from .utils.plugin_discovery import discover_plugins
-from .tasks.executor import run_tasks_sequentially, run_tasks_in_parallel
+from .utils.file_loader import load_task_records, iter_task_records, is_compiled_task_file, SupportedFormats
+from .utils.compiled_tasks import CompiledTaskMessages, find_compiled_task, write_compiled_tasks
+from .utils.plugin_discovery import discover_plugins_lazily
+from .utils.plugin_registry import resolve_plugins
+from .tasks.executor import run_tasks_sequentially, run_tasks_in_parallel, run_tasks_in_processes, ExecutionEngine
+from .tasks.async_executor import run_tasks_async
+from .tasks.scheduler import validate_dependencies, validate_type_settings
+from .tasks.metrics import RunMetrics
+from .daemon import serve_daemon
+from .daemon_client import DAEMON_SOCKET_ENV, default_socket_path
+from .tasks.work_queue import serve_queue, run_worker, DEFAULT_QUEUE_ADDRESS, DEFAULT_LEASE_TIMEOUT
+from .utils.http_session import configure_http_session, close_http_session
+from .utils.checkpoint import CheckpointJournal, CheckpointMessages, is_checkpointed, load_checkpoint
+from .utils.config_validation import validate_task_configs
+from .utils.output import OutputMode, emit, output_sink
+from .utils.result_cache import ResultCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_ENTRIES
+from .utils.task_index import TaskIndex, TaskIndexMessages, exact_names, parse_selectors
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -15,6 +30,7 @@ logger = logging.getLogger(__name__)
 DEFAULT_LOG_LEVEL = logging.INFO
 DEBUG_LOG_LEVEL = logging.DEBUG
 DRY_RUN_TAG = "[DRY RUN]"
+SEQUENTIAL_ENGINE_LABEL = "sequential"
 VALIDATION_SUCCESS_PREFIX = "Successfully validated"
 
 
@@ -22,7 +38,7 @@ class TaskRunnerMessages(Enum):
     WELCOME = "TaskRunner - A plugin-based task runner in Python."
     VERBOSE_ENABLED = "Verbose mode enabled"
     LOADED_TASKS = "Loaded {} tasks"
-    FILTERED_TASKS = "Filtered to {} tasks (only='{}')"
+    FILTERED_TASKS = "Selected {} tasks (only='{}')"
     UNKNOWN_TASK_TYPE = "Unknown task type '{}' for task '{}'"
     NO_TASK_FOUND = "No task found with name '{}'"
     TASK_NAMES_MUST_BE_UNIQUE = "Task names must be unique"
@@ -31,6 +47,9 @@ class TaskRunnerMessages(Enum):
     VALIDATION_FAILED = "Validation failed: {}"
     DUPLICATE_TASK_NAMES = "Duplicate task names found: {}"
     UNKNOWN_TASK_TYPES = "Unknown task types: {}"
+    STREAM_DEPENDENCY_ORDER = "Task '{}' depends on '{}', which must appear earlier in the file when streaming"
+    STREAM_REQUIRES_THREAD_ENGINE = "--stream is only supported by the thread engine"
+    INVALID_TYPE_SETTING = "Expected TYPE=VALUE, got '{}'"
 
 
 def format_task_tag(name):
@@ -45,25 +64,94 @@ def _setup_logging(verbose):
         logger.debug(TaskRunnerMessages.VERBOSE_ENABLED.value)
 
 
-def _load_and_validate_tasks(file_path, plugins):
-    tasks = load_tasks_from_file(file_path)
-    
-    # Check for duplicate task names
-    task_names = [task.name for task in tasks]
-    if len(task_names) != len(set(task_names)):
-        duplicates = [name for name in task_names if task_names.count(name) > 1]
-        raise ValueError(TaskRunnerMessages.DUPLICATE_TASK_NAMES.value.format(set(duplicates)))
-    
+def _load_and_validate_tasks(file_path):
+    tasks = load_task_records(file_path)
+
+    # Index names, types and tags in one pass; duplicate names fall out of the same pass
+    index = TaskIndex(tasks)
+    if index.duplicates:
+        raise ValueError(TaskRunnerMessages.DUPLICATE_TASK_NAMES.value.format(set(index.duplicates)))
+
     logger.debug(TaskRunnerMessages.LOADED_TASKS.value.format(len(tasks)))
-    return tasks, task_names
+    return tasks, index
 
 
-def _filter_tasks(tasks, only_task_name):
-    if only_task_name:
-        tasks = [task for task in tasks if task.name == only_task_name]
-        if not tasks:
-            raise ValueError(TaskRunnerMessages.NO_TASK_FOUND.value.format(only_task_name))
-        logger.debug(TaskRunnerMessages.FILTERED_TASKS.value.format(len(tasks), only_task_name))
+def _load_compiled_tasks(file_path, selectors):
+    # Compiled files are indexed by name, so only the selected tasks are decoded; the whole file
+    # was validated (including dependencies) when it was compiled
+    tasks = []
+    for name in dict.fromkeys(selector.pattern for selector in selectors):
+        task = find_compiled_task(file_path, name)
+        if task is None:
+            raise ValueError(TaskRunnerMessages.NO_TASK_FOUND.value.format(name))
+        tasks.append(task)
+    return tasks
+
+
+def _stream_and_validate_tasks(file_path, plugins, selectors):
+    # Same checks as the eager path, applied entry by entry so tasks can start before parsing finishes
+    task_names = set()
+    unmatched = dict.fromkeys(selectors)
+    for task in iter_task_records(file_path):
+        if task.name in task_names:
+            raise ValueError(TaskRunnerMessages.DUPLICATE_TASK_NAMES.value.format({task.name}))
+        missing_dependencies = [name for name in task.depends_on if name not in task_names]
+        task_names.add(task.name)
+
+        if selectors:
+            matching = [selector for selector in selectors if selector.matches(task)]
+            if not matching:
+                continue
+            for selector in matching:
+                unmatched.pop(selector, None)
+        if task.type not in plugins:
+            raise ValueError(TaskRunnerMessages.UNKNOWN_TASK_TYPES.value.format({task.type}))
+        if missing_dependencies and not selectors:
+            raise ValueError(TaskRunnerMessages.STREAM_DEPENDENCY_ORDER.value.format(task.name, missing_dependencies[0]))
+        validate_task_configs([task], plugins)
+        yield task
+
+    if unmatched:
+        raise ValueError(TaskIndexMessages.NO_TASK_MATCHES.value.format(next(iter(unmatched)).text))
+
+
+def _parse_type_settings(convert, setting_name):
+    # Click callback turning repeated TYPE=VALUE options into a dict keyed by task type. Values are
+    # checked here, so every engine rejects them, not just the ones that use the setting
+    def parse(ctx, param, values):
+        settings = {}
+        for value in values:
+            type_name, separator, setting = value.partition("=")
+            if not separator or not type_name:
+                raise click.BadParameter(TaskRunnerMessages.INVALID_TYPE_SETTING.value.format(value))
+            try:
+                settings[type_name.strip()] = convert(setting)
+            except ValueError as e:
+                raise click.BadParameter(str(e))
+        try:
+            validate_type_settings(**{setting_name: settings})
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        return settings or None
+    return parse
+
+
+def _apply_task_defaults(task, retries, backoff, timeout):
+    # Command-line settings only fill in what the task file leaves unset
+    if task.retries is None:
+        task.retries = retries
+    if task.backoff is None:
+        task.backoff = backoff
+    if task.timeout is None:
+        task.timeout = timeout
+    return task
+
+
+def _filter_tasks(tasks, index, selectors):
+    if selectors:
+        tasks = index.select(selectors)
+        logger.debug(TaskRunnerMessages.FILTERED_TASKS.value.format(
+            len(tasks), ",".join(selector.text for selector in selectors)))
     return tasks
 
 
@@ -78,10 +166,50 @@ def _validate_task_types(tasks, plugins):
 
 
 def _prepare_dry_run(tasks):
-    print(TaskRunnerMessages.WOULD_RUN_TASKS.value.format(DRY_RUN_TAG))
+    emit(TaskRunnerMessages.WOULD_RUN_TASKS.value.format(DRY_RUN_TAG))
     for task in tasks:
         tag = format_task_tag(task.name)
-        print(f"  - [{tag}] {task.name} ({task.type})")
+        emit(f"  - [{tag}] {task.name} ({task.type})")
+
+
+def _skip_checkpointed_tasks(tasks, resume_path):
+    # Tasks recorded with the same config hash already succeeded; their dependents treat them as satisfied
+    completed = load_checkpoint(resume_path)
+    if isinstance(tasks, list):
+        remaining = [task for task in tasks if not is_checkpointed(task, completed)]
+        emit(CheckpointMessages.RESUMING.value.format(resume_path, len(tasks) - len(remaining)))
+        return remaining
+    return (task for task in tasks if not is_checkpointed(task, completed))
+
+
+def _run_tasks(tasks, plugins, verbose, parallel, engine, max_workers, plugin_prefix, cache=None, report=None,
+               checkpoint_path=None, type_limits=None, type_weights=None, batch_sizes=None):
+    metrics = None
+    if report:
+        sequential = engine == ExecutionEngine.THREAD.value and not parallel
+        metrics = RunMetrics(SEQUENTIAL_ENGINE_LABEL if sequential else engine)
+    checkpoint = CheckpointJournal(checkpoint_path) if checkpoint_path else None
+
+    try:
+        if engine == ExecutionEngine.ASYNCIO.value:
+            run_tasks_async(tasks, plugins, verbose, max_workers, plugin_prefix, cache, metrics, checkpoint,
+                            type_limits)
+        elif engine == ExecutionEngine.PROCESS.value:
+            run_tasks_in_processes(tasks, plugins, verbose, max_workers, plugin_prefix, cache, metrics,
+                                   checkpoint, type_limits, type_weights)
+        elif parallel:
+            run_tasks_in_parallel(tasks, plugins, verbose, max_workers, plugin_prefix, cache, metrics,
+                                  checkpoint, type_limits, type_weights, batch_sizes)
+        else:
+            run_tasks_sequentially(tasks, plugins, verbose, cache, metrics, checkpoint, batch_sizes)
+    finally:
+        # Flush the journal even when the run fails so --resume can pick up from here
+        if checkpoint is not None:
+            checkpoint.close()
+        # A failed sequential run still reports the tasks that ran before it stopped
+        if metrics is not None:
+            metrics.finish()
+            emit(metrics.write_report(report))
 
 
 @click.group()
@@ -91,37 +219,178 @@ def cli():
 
 @cli.command()
 @click.argument("file")
-@click.option("--only", help="Run only a specific task by name")
+@click.option("--only", multiple=True, metavar="SELECTOR",
+              help="Run only matching tasks: names, globs (build-*), type:TYPE or tag:TAG; comma-separated "
+                   "or repeated, a task runs if any selector matches")
 @click.option("--verbose", is_flag=True, help="Show detailed logs")
 @click.option("--dry-run", is_flag=True, help="Show what would run without executing")
 @click.option("--parallel", is_flag=True, help="Run tasks in parallel")
+@click.option("--engine", type=click.Choice([engine.value for engine in ExecutionEngine]),
+              default=ExecutionEngine.THREAD.value, show_default=True,
+              help="Execution engine; 'asyncio' runs tasks on one event loop, 'process' in worker processes")
+@click.option("--max-workers", type=click.IntRange(min=1),
+              help="Maximum number of concurrently running tasks (default: CPU count for threads)")
+@click.option("--stream", is_flag=True,
+              help="Start running tasks while the file is parsed (supports .jsonl and multi-document YAML)")
+@click.option("--http-pool-size", type=click.IntRange(min=1), envvar="TASKRUNNER_HTTP_POOL_SIZE",
+              help="Maximum pooled HTTP connections per host shared by all tasks")
+@click.option("--http-timeout", type=click.FloatRange(min=0, min_open=True), envvar="TASKRUNNER_HTTP_TIMEOUT",
+              help="Default HTTP request timeout in seconds")
+@click.option("--cache/--no-cache", "use_cache", default=False, envvar="TASKRUNNER_CACHE",
+              help="Skip tasks whose type, config and inputs are unchanged since their last successful run")
+@click.option("--cache-dir", default=DEFAULT_CACHE_DIR, show_default=True, envvar="TASKRUNNER_CACHE_DIR",
+              help="Directory of the result cache")
+@click.option("--cache-max-entries", type=click.IntRange(min=1), default=DEFAULT_MAX_ENTRIES, show_default=True,
+              help="Number of cached results kept before the least recently used are evicted")
+@click.option("--retries", type=click.IntRange(min=0), envvar="TASKRUNNER_RETRIES",
+              help="Default number of retries for failed tasks (a task's own 'retries' takes precedence)")
+@click.option("--backoff", type=click.FloatRange(min=0), envvar="TASKRUNNER_BACKOFF",
+              help="Default base delay in seconds between retries, doubled per attempt with jitter (default: 1)")
+@click.option("--task-timeout", type=click.FloatRange(min=0, min_open=True), envvar="TASKRUNNER_TASK_TIMEOUT",
+              help="Default time limit in seconds for a single task run")
+@click.option("--checkpoint", type=click.Path(dir_okay=False, writable=True),
+              help="Append the name and config hash of every successful task to this journal")
+@click.option("--resume", type=click.Path(dir_okay=False),
+              help="Skip tasks recorded as successful in this journal and keep appending to it")
+@click.option("--report", type=click.Path(dir_okay=False, writable=True),
+              help="Write per-task timings and per-plugin latency percentiles to this JSON file")
+@click.option("--type-limit", "type_limits", multiple=True, callback=_parse_type_settings(int, "type_limits"),
+              metavar="TYPE=N",
+              help="Run at most N tasks of this type at once (repeatable, e.g. --type-limit file=4)")
+@click.option("--type-weight", "type_weights", multiple=True, callback=_parse_type_settings(float, "type_weights"),
+              metavar="TYPE=W", help="Relative share of workers for this type when several types are waiting "
+                                     "(repeatable; thread and process engines)")
+@click.option("--batch-size", "batch_sizes", multiple=True, callback=_parse_type_settings(int, "batch_sizes"),
+              metavar="TYPE=N",
+              help="Hand up to N ready tasks of this type to one run_batch call (repeatable, e.g. --batch-size "
+                   "file=512; thread engine)")
+@click.option("--output", type=click.Choice([mode.value for mode in OutputMode]), default=OutputMode.TEXT.value,
+              show_default=True, envvar="TASKRUNNER_OUTPUT",
+              help="Task output format: plain text, one JSON object per line, or failures only")
 @click.option("--plugin-prefix", help="Prefix for discovering plugins from installed packages")
-def run(file, only, verbose, dry_run, parallel, plugin_prefix):
+def run(file, only, verbose, dry_run, parallel, engine, max_workers, stream, http_pool_size, http_timeout,
+        use_cache, cache_dir, cache_max_entries, retries, backoff, task_timeout, checkpoint, resume, report,
+        type_limits, type_weights, batch_sizes, output, plugin_prefix):
     _setup_logging(verbose)
-    
+    configure_http_session(pool_maxsize=http_pool_size, timeout=http_timeout)
+
+    # Everything the command writes to stdout goes through one writer thread in the selected format,
+    # so --output jsonl stays machine-parseable
+    with output_sink(output):
+        try:
+            selectors = parse_selectors(only)
+            cache = ResultCache(cache_dir, cache_max_entries) if use_cache and not dry_run else None
+            checkpoint_path = None if dry_run else checkpoint or resume
+
+            if stream:
+                if engine != ExecutionEngine.THREAD.value:
+                    raise click.UsageError(TaskRunnerMessages.STREAM_REQUIRES_THREAD_ENGINE.value)
+                # Task types are only known while the file is parsed; each plugin is imported when first used
+                plugins = discover_plugins_lazily(package_prefix=plugin_prefix)
+                tasks = (_apply_task_defaults(task, retries, backoff, task_timeout)
+                         for task in _stream_and_validate_tasks(file, plugins, selectors))
+                if resume:
+                    tasks = _skip_checkpointed_tasks(tasks, resume)
+                if dry_run:
+                    _prepare_dry_run(tasks)
+                else:
+                    _run_tasks(tasks, plugins, verbose, parallel, engine, max_workers, plugin_prefix, cache, report,
+                               checkpoint_path, type_limits, type_weights, batch_sizes)
+                return
+
+            if exact_names(selectors) and is_compiled_task_file(file):
+                tasks = _load_compiled_tasks(file, selectors)
+            else:
+                # Load and validate tasks
+                tasks, index = _load_and_validate_tasks(file)
+
+                # Reject unknown dependencies and cycles before anything runs
+                validate_dependencies(tasks)
+
+                # Select tasks if --only is specified
+                tasks = _filter_tasks(tasks, index, selectors)
+            for task in tasks:
+                _apply_task_defaults(task, retries, backoff, task_timeout)
+
+            # Import only the plugins (local and optionally from installed packages) the selected tasks use
+            plugins = resolve_plugins({task.type for task in tasks}, package_prefix=plugin_prefix)
+
+            # Validate all task types and configs before running
+            _validate_task_types(tasks, plugins)
+            validate_task_configs(tasks, plugins)
+
+            # Skip what an earlier, interrupted run already finished
+            if resume:
+                tasks = _skip_checkpointed_tasks(tasks, resume)
+
+            if dry_run:
+                _prepare_dry_run(tasks)
+                return
+
+            # Run tasks
+            _run_tasks(tasks, plugins, verbose, parallel, engine, max_workers, plugin_prefix, cache, report,
+                       checkpoint_path, type_limits, type_weights, batch_sizes)
+
+        except Exception as e:
+            error_message = f"Error: {e}"
+            emit(error_message, error=True)
+            raise click.ClickException(str(e))
+        finally:
+            close_http_session()
+
+
+@cli.command(name="serve-queue")
+@click.argument("file")
+@click.option("--only", multiple=True, metavar="SELECTOR",
+              help="Serve only matching tasks (same selectors as 'run --only')")
+@click.option("--bind", default=DEFAULT_QUEUE_ADDRESS, show_default=True,
+              help="host:port to listen on for workers (port 0 picks a free port)")
+@click.option("--lease-timeout", type=click.FloatRange(min=0, min_open=True), default=DEFAULT_LEASE_TIMEOUT,
+              show_default=True, help="Seconds without a heartbeat after which a worker's task is reassigned")
+@click.option("--plugin-prefix", help="Prefix for discovering plugins from installed packages")
+def serve_queue_command(file, only, bind, lease_timeout, plugin_prefix):
     try:
-        # Discover plugins (local and optionally from installed packages)
-        plugins = discover_plugins(package_prefix=plugin_prefix)
-        
-        # Load and validate tasks
-        tasks, task_names = _load_and_validate_tasks(file, plugins)
-        
-        # Filter tasks if --only is specified
-        tasks = _filter_tasks(tasks, only)
-        
-        # Validate all task types before running
+        # Same checks as 'run', so workers only receive tasks that can run
+        tasks, index = _load_and_validate_tasks(file)
+        validate_dependencies(tasks)
+        tasks = _filter_tasks(tasks, index, parse_selectors(only))
+        plugins = resolve_plugins({task.type for task in tasks}, package_prefix=plugin_prefix)
         _validate_task_types(tasks, plugins)
+        validate_task_configs(tasks, plugins)
 
-        if dry_run:
-            _prepare_dry_run(tasks)
-            return
+        serve_queue(tasks, bind, lease_timeout)
+
+    except Exception as e:
+        error_message = f"Error: {e}"
+        print(error_message)
+        raise click.ClickException(str(e))
+
+
+@cli.command()
+@click.option("--connect", "address", default=DEFAULT_QUEUE_ADDRESS, show_default=True,
+              help="host:port of the serve-queue coordinator")
+@click.option("--verbose", is_flag=True, help="Show detailed logs")
+@click.option("--plugin-prefix", help="Prefix for discovering plugins from installed packages")
+def worker(address, verbose, plugin_prefix):
+    _setup_logging(verbose)
+    try:
+        run_worker(address, plugin_prefix=plugin_prefix, verbose=verbose)
+    except Exception as e:
+        error_message = f"Error: {e}"
+        print(error_message)
+        raise click.ClickException(str(e))
+    finally:
+        close_http_session()
 
-        # Run tasks
-        if parallel:
-            run_tasks_in_parallel(tasks, plugins, verbose)
-        else:
-            run_tasks_sequentially(tasks, plugins, verbose)
 
+@cli.command(help="Serve run, validate and list-plugins from a warm process. Each invocation runs in its own "
+                  "forked process, alongside the others.")
+@click.option("--socket", "socket_path", default=default_socket_path, show_default="$XDG_RUNTIME_DIR/taskrunner-<uid>.sock",
+              help="Unix socket to listen on; point clients at it with " + DAEMON_SOCKET_ENV)
+@click.option("--plugin-prefix", help="Prefix for discovering plugins from installed packages")
+def daemon(socket_path, plugin_prefix):
+    try:
+        serve_daemon(socket_path, plugin_prefix)
     except Exception as e:
         error_message = f"Error: {e}"
         print(error_message)
@@ -131,24 +400,52 @@ def run(file, only, verbose, dry_run, parallel, plugin_prefix):
 @cli.command()
 @click.option("--plugin-prefix", help="Prefix for discovering plugins from installed packages")
 def list_plugins(plugin_prefix):
-    plugins = discover_plugins(package_prefix=plugin_prefix)
+    # Listing names only needs the source index, so no plugin module is imported
+    plugins = discover_plugins_lazily(package_prefix=plugin_prefix)
     print(TaskRunnerMessages.AVAILABLE_PLUGINS.value)
     for name in plugins:
         print(f"  - {name}")
 
 
+@cli.command(name="compile")
+@click.argument("file")
+@click.option("-o", "--output", type=click.Path(dir_okay=False, writable=True),
+              help="Compiled file to write (default: FILE with a .trc extension)")
+@click.option("--plugin-prefix", help="Prefix for discovering plugins from installed packages")
+def compile_command(file, output, plugin_prefix):
+    try:
+        # Same checks as 'validate'; a compiled file is trusted and not validated again when loaded
+        tasks, _ = _load_and_validate_tasks(file)
+        plugins = resolve_plugins({task.type for task in tasks}, package_prefix=plugin_prefix)
+        _validate_task_types(tasks, plugins)
+        validate_task_configs(tasks, plugins)
+        validate_dependencies(tasks)
+
+        output = output or os.path.splitext(file)[0] + SupportedFormats.COMPILED.value
+        count = write_compiled_tasks(tasks, output)
+        print(CompiledTaskMessages.COMPILED.value.format(count, output))
+
+    except Exception as e:
+        error_message = f"Error: {e}"
+        print(error_message)
+        raise click.ClickException(str(e))
+
+
 @cli.command()
 @click.argument("file")
 @click.option("--plugin-prefix", help="Prefix for discovering plugins from installed packages")
 def validate(file, plugin_prefix):
     try:
-        plugins = discover_plugins(package_prefix=plugin_prefix)
-        
         # Load and validate tasks
-        tasks, task_names = _load_and_validate_tasks(file, plugins)
+        tasks, _ = _load_and_validate_tasks(file)
+        plugins = resolve_plugins({task.type for task in tasks}, package_prefix=plugin_prefix)
         
-        # Validate task types
+        # Validate task types and configs
         _validate_task_types(tasks, plugins)
+        validate_task_configs(tasks, plugins)
+
+        # Validate dependencies
+        validate_dependencies(tasks)
 
         print(f"{VALIDATION_SUCCESS_PREFIX} {len(tasks)} task(s)")
         for task in tasks:
@@ -0,0 +1,200 @@
+import contextlib
+import io
+import json
+import logging
+import os
+import socketserver
+import threading
+from typing import Optional
+from enum import Enum
+
+import click
+
+from .daemon_client import STDERR_STREAM, STDOUT_STREAM, is_daemon_running
+from .utils.http_session import reset_http_session
+from .utils.plugin_discovery import discover_plugins_lazily
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constants
+SOCKET_UMASK = 0o177  # The socket is created owner-only (0o600)
+
+
+class DaemonMessages(Enum):
+    LISTENING = "TaskRunner daemon listening on {} ({} plugins loaded)"
+    SOCKET_IN_USE = "Another daemon is already listening on {}"
+    PLUGIN_PRELOAD_FAILED = "Could not preload plugin '{}': {}"
+    STOPPED = "TaskRunner daemon stopped"
+
+
+class _StreamWriter(io.TextIOBase):
+    # Sends each completed line to the client as soon as it is printed, from any thread
+    def __init__(self, wfile, stream_name):
+        self._wfile = wfile
+        self._stream_name = stream_name
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        with self._lock:
+            self._buffer += text
+            if "\n" in self._buffer:
+                complete, _, self._buffer = self._buffer.rpartition("\n")
+                self._send(complete + "\n")
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            if self._buffer:
+                self._send(self._buffer)
+                self._buffer = ""
+
+    def _send(self, data):
+        try:
+            self._wfile.write((json.dumps({"stream": self._stream_name, "data": data}) + "\n").encode("utf-8"))
+            self._wfile.flush()
+        except OSError:
+            # The client went away; the run itself carries on
+            pass
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+
+        # Tells the client its request was taken; a client that gave up waiting runs it itself
+        try:
+            self.wfile.write((json.dumps({"accepted": True}) + "\n").encode("utf-8"))
+            self.wfile.flush()
+        except OSError:
+            return
+
+        stdout = _StreamWriter(self.wfile, STDOUT_STREAM)
+        stderr = _StreamWriter(self.wfile, STDERR_STREAM)
+        with _client_context(request["cwd"], request["env"]), _log_to(stderr), \
+                contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exit_code = _invoke_cli(request["argv"])
+            stdout.flush()
+            stderr.flush()
+
+        try:
+            self.wfile.write((json.dumps({"exit": exit_code}) + "\n").encode("utf-8"))
+        except OSError:
+            pass
+
+
+@contextlib.contextmanager
+def _client_context(cwd, env):
+    # Each request runs in its own forked process, so the process-wide working directory, environment
+    # and log level can be switched to the client's. They are restored anyway, for callers that run
+    # requests in-process. HTTP settings start from the defaults.
+    reset_http_session()
+    previous_cwd = os.getcwd()
+    previous_env = dict(os.environ)
+    root_logger = logging.getLogger()
+    previous_level = root_logger.level
+    try:
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(env)
+        yield
+    finally:
+        os.chdir(previous_cwd)
+        os.environ.clear()
+        os.environ.update(previous_env)
+        root_logger.setLevel(previous_level)
+
+
+@contextlib.contextmanager
+def _log_to(stream):
+    # Log handlers keep the stream they were created with (the daemon's stderr), which redirect_stderr
+    # doesn't change, so they are pointed at the client's for the duration of its run
+    handlers = [handler for handler in logging.getLogger().handlers
+                if type(handler) is logging.StreamHandler]
+    previous_streams = [handler.setStream(stream) for handler in handlers]
+    try:
+        yield
+    finally:
+        for handler, previous_stream in zip(handlers, previous_streams):
+            handler.setStream(previous_stream)
+
+
+def _invoke_cli(argv) -> int:
+    from .cli import cli
+
+    try:
+        cli.main(args=argv, prog_name="taskrunner", standalone_mode=False)
+        return 0
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.exceptions.Abort:
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        logger.exception(e)
+        print(f"Error: {e}")
+        return 1
+
+
+def _preload_plugins(plugin_prefix):
+    # Import every plugin (and its dependencies, e.g. requests) once so runs never pay for it
+    registry = discover_plugins_lazily(package_prefix=plugin_prefix)
+    loaded = 0
+    for name in registry:
+        try:
+            registry[name]
+            loaded += 1
+        except Exception as e:
+            logger.warning(DaemonMessages.PLUGIN_PRELOAD_FAILED.value.format(name, e))
+    return loaded
+
+
+class _DaemonServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    # One forked child per request: it starts with everything already imported, runs alongside other
+    # clients and has its own stdout, working directory and environment
+
+    def server_bind(self):
+        # Bound under a restrictive umask so other users can't connect before the permissions are set
+        previous_umask = os.umask(SOCKET_UMASK)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous_umask)
+
+
+def serve_daemon(socket_path: str, plugin_prefix: Optional[str] = None, on_ready=None):
+    if os.path.exists(socket_path):
+        if is_daemon_running(socket_path):
+            raise RuntimeError(DaemonMessages.SOCKET_IN_USE.value.format(socket_path))
+        # Stale socket left behind by a daemon that was killed
+        os.remove(socket_path)
+
+    loaded = _preload_plugins(plugin_prefix)
+    from . import cli  # noqa: F401  Import the command tree (click, pydantic, yaml) up front
+
+    with _DaemonServer(socket_path, _DaemonRequestHandler) as server:
+        print(DaemonMessages.LISTENING.value.format(socket_path, loaded))
+        if on_ready is not None:
+            on_ready(server)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+            print(DaemonMessages.STOPPED.value)
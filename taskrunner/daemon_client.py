@@ -0,0 +1,76 @@
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import List, Optional
+
+# Only the standard library is imported here: this runs before click, pydantic or any plugin is loaded
+
+# Constants
+DAEMON_SOCKET_ENV = "TASKRUNNER_DAEMON_SOCKET"
+DAEMON_COMMANDS = ("run", "validate", "list-plugins")
+STDOUT_STREAM = "stdout"
+STDERR_STREAM = "stderr"
+DAEMON_ANSWER_TIMEOUT = 2.0  # Seconds to wait for the daemon to take a request before running in-process
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"taskrunner-{os.getuid()}.sock")
+
+
+def is_daemon_running(socket_path: str) -> bool:
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+
+def run_via_daemon(argv: List[str], socket_path: str) -> Optional[int]:
+    # Returns the command's exit code, or None when no daemon takes the request in time so the caller
+    # runs it in-process
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(DAEMON_ANSWER_TIMEOUT)
+    replies = client.makefile("r", encoding="utf-8")
+    try:
+        client.connect(socket_path)
+        request = {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+        client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        accepted = json.loads(replies.readline() or "{}").get("accepted")
+    except (OSError, ValueError):
+        accepted = False
+    if not accepted:
+        replies.close()
+        client.close()
+        return None
+
+    # The run itself may take as long as it needs
+    client.settimeout(None)
+    with client, replies:
+        for line in replies:
+            reply = json.loads(line)
+            if "exit" in reply:
+                return reply["exit"]
+            stream = sys.stderr if reply.get("stream") == STDERR_STREAM else sys.stdout
+            stream.write(reply["data"])
+            stream.flush()
+    # The daemon went away mid-run
+    return 1
+
+
+def main():
+    socket_path = os.environ.get(DAEMON_SOCKET_ENV)
+    if socket_path and len(sys.argv) > 1 and sys.argv[1] in DAEMON_COMMANDS:
+        exit_code = run_via_daemon(sys.argv[1:], socket_path)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from .cli import cli
+    cli()
@@ -1,8 +1,25 @@
-from pydantic import BaseModel, Field
-from typing import Dict
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Dict, List, Optional
+
+from ..utils.env_substitution import ConfigTemplate, compile_config
 
 
 class TaskModel(BaseModel):
     name: str = Field(..., description="The name of the task")
     type: str = Field(..., description="The type of the task")
     config: Dict = Field(default_factory=dict, description="The configuration of the task")
+    depends_on: List[str] = Field(default_factory=list, description="Names of tasks that must finish before this task")
+    retries: Optional[int] = Field(None, description="How many times to retry a failed run (default: 0)", ge=0)
+    backoff: Optional[float] = Field(None, description="Base delay in seconds between retries, doubled each attempt",
+                                     ge=0)
+    priority: int = Field(0, description="Ready tasks with a higher priority are started first")
+    timeout: Optional[float] = Field(None, description="Seconds a single run may take before it is abandoned", gt=0)
+    tags: List[str] = Field(default_factory=list, description="Labels for selecting tasks, e.g. --only tag:nightly")
+
+    _config_template: Optional[ConfigTemplate] = PrivateAttr(default=None)
+
+    def config_template(self) -> ConfigTemplate:
+        # Compiled on first use (the file loaders do it at load time) and reused for every render
+        if self._config_template is None:
+            self._config_template = compile_config(self.config)
+        return self._config_template
@@ -0,0 +1,120 @@
+import sys
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from ..utils.env_substitution import ConfigTemplate, compile_config
+from .task_model import TaskModel
+
+# Constants
+_DICT_NODE = "d"
+_LIST_NODE = "l"
+
+
+class TaskRecord:
+    # Compact form of a validated TaskModel for large runs: no per-instance __dict__ or pydantic
+    # bookkeeping, interned strings, and a config that may be shared with identical tasks.
+    # Configs are read-only once stored; plugins receive them (or a rendered copy) as-is.
+    __slots__ = ("name", "type", "config", "depends_on", "retries", "backoff", "priority", "timeout",
+                 "tags", "_config_template")
+
+    def __init__(self, name: str, type: str, config: Dict, depends_on: Tuple[str, ...] = (),
+                 retries: Optional[int] = None, backoff: Optional[float] = None, priority: int = 0,
+                 timeout: Optional[float] = None, tags: Tuple[str, ...] = (),
+                 config_template: Optional[ConfigTemplate] = None):
+        self.name = name
+        self.type = type
+        self.config = config
+        self.depends_on = depends_on
+        self.retries = retries
+        self.backoff = backoff
+        self.priority = priority
+        self.timeout = timeout
+        self.tags = tags
+        self._config_template = config_template
+
+    def config_template(self) -> ConfigTemplate:
+        if self._config_template is None:
+            self._config_template = compile_config(self.config)
+        return self._config_template
+
+    def dict(self) -> Dict:
+        # Same shape as TaskModel.dict(), e.g. for sending a task to a remote worker
+        return {
+            "name": self.name,
+            "type": self.type,
+            "config": self.config,
+            "depends_on": list(self.depends_on),
+            "retries": self.retries,
+            "backoff": self.backoff,
+            "priority": self.priority,
+            "timeout": self.timeout,
+            "tags": list(self.tags),
+        }
+
+    def __repr__(self):
+        return f"TaskRecord(name={self.name!r}, type={self.type!r})"
+
+
+class TaskStore:
+    # Turns validated TaskModels into TaskRecords. With share_configs, configs are hash-consed:
+    # every dict or list that is structurally equal to one seen before (a whole config, or a
+    # subtree such as common headers) is replaced by the first copy, and each distinct config
+    # is compiled into a ConfigTemplate once.
+    def __init__(self, share_configs: bool = True):
+        self._share_configs = share_configs
+        self._nodes = {}
+        self._templates = {}
+        self._compiled = {}
+        self._keyed = {}
+
+    def add(self, task: TaskModel, config_key=None) -> TaskRecord:
+        # config_key: an identifier the caller already knows to mean "same config" (e.g. the config
+        # number in a compiled file), which skips hash-consing for configs seen before
+        if config_key is not None and config_key in self._keyed:
+            config, template = self._keyed[config_key]
+        elif self._share_configs:
+            config, _ = self._share(task.config)
+            template = self._templates.get(id(config))
+            if template is None:
+                template = self._templates[id(config)] = compile_config(config, self._compiled)
+        else:
+            config, template = task.config, task.config_template()
+        if config_key is not None:
+            self._keyed[config_key] = (config, template)
+
+        return TaskRecord(task.name, sys.intern(task.type), config,
+                          tuple(sys.intern(name) for name in task.depends_on), task.retries, task.backoff,
+                          task.priority, task.timeout, tuple(sys.intern(tag) for tag in task.tags), template)
+
+    def records(self, tasks: Iterable[TaskModel]) -> Iterator[TaskRecord]:
+        for task in tasks:
+            yield self.add(task)
+
+    def release(self):
+        # Records keep their shared configs; only the lookup tables are dropped
+        self._nodes.clear()
+        self._templates.clear()
+        self._compiled.clear()
+        self._keyed.clear()
+
+    def _share(self, value):
+        # Returns the canonical value and its key. Children are keyed by the id of their canonical
+        # copy, which the table keeps alive, so keys stay small however deep the config is.
+        if isinstance(value, str):
+            value = sys.intern(value)
+            return value, value
+        if isinstance(value, dict):
+            items = [(self._share(key), self._share(item)) for key, item in value.items()]
+            key = (_DICT_NODE,) + tuple((key_key, item_key) for (_, key_key), (_, item_key) in items)
+            node = self._nodes.get(key)
+            if node is None:
+                node = self._nodes[key] = {shared_key: shared_item for (shared_key, _), (shared_item, _) in items}
+            return node, id(node)
+        if isinstance(value, list):
+            items = [self._share(item) for item in value]
+            key = (_LIST_NODE,) + tuple(item_key for _, item_key in items)
+            node = self._nodes.get(key)
+            if node is None:
+                node = self._nodes[key] = [shared_item for shared_item, _ in items]
+            return node, id(node)
+        # 1, 1.0 and True compare equal, so scalars are keyed with their type
+        return value, (type(value), value)
@@ -1,7 +1,13 @@
+import asyncio
 import logging
-from typing import Dict
+from typing import Any, Dict, List, Optional, Type, Union
 from enum import Enum
 
+from pydantic import BaseModel
+
+from .utils.config_validation import validate_plugin_config
+from .utils.output import batch_item
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -10,8 +16,48 @@ class CoreMessages(Enum):
     NOT_IMPLEMENTED_ERROR = "Plugins must implement 'run' method."
 
 
+class PluginExecution(str, Enum):
+    THREAD = "thread"
+    PROCESS = "process"
+
+
 class BaseTaskRunner:
     type_name: str = None  # Must be overridden
+    execution: str = PluginExecution.THREAD.value  # Set to "process" for CPU-bound plugins
+    cacheable: bool = False  # Set for deterministic plugins so --cache may skip tasks whose inputs are unchanged
+    config_model: Optional[Type[BaseModel]] = None  # Validated up front by 'validate' and 'run' when set
+    max_batch_size: int = 1  # Above 1, ready tasks of this type are handed to run_batch together
+    max_batch_latency: float = 0.0  # Seconds a partial batch may wait for more ready tasks before it runs
+    enforces_timeout: bool = False  # Set when run() ends within current_task_timeout(), so timed-out tasks can retry
 
-    def run(self, config: Dict):
+    @classmethod
+    def validate_config(cls, config: Union[Dict, BaseModel]) -> Union[Dict, BaseModel]:
+        # Already-validated models pass straight through; identical configs are validated once
+        if cls.config_model is None:
+            return config
+        return validate_plugin_config(cls.config_model, config)
+
+    def run(self, config: Union[Dict, BaseModel]):
         raise NotImplementedError(CoreMessages.NOT_IMPLEMENTED_ERROR.value)
+
+    def run_batch(self, configs: List[Union[Dict, BaseModel]]) -> List[Optional[Exception]]:
+        # One result per config, in order: None if it succeeded, otherwise the exception it raised.
+        # Override when many configs are cheaper to handle together than one at a time.
+        # Wrap the work for each config in batch_item(position) so its output is attributed to that task.
+        results = []
+        for position, config in enumerate(configs):
+            try:
+                with batch_item(position):
+                    self.run(config)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def cache_inputs(self, config: Dict) -> Any:
+        # State outside the config that should invalidate cached results (e.g. files the task touches)
+        return None
+
+    async def run_async(self, config: Dict):
+        # Used by the asyncio engine; sync plugins are moved to a worker thread so they never block the loop
+        return await asyncio.to_thread(self.run, config)
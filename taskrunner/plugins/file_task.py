@@ -1,9 +1,19 @@
 from ..plugin_base import BaseTaskRunner
+from ..utils.output import batch_item, emit
 from pydantic import BaseModel, Field
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+import contextvars
 import os
+import stat
+import threading
 from enum import Enum
 
+# Constants
+FILE_BATCH_LATENCY = 0.05
+FILE_BATCH_WORKERS = 8
+TEMP_FILE_SUFFIX = ".tmp"
+
 
 class FileAction(str, Enum):
     CREATE = "create"
@@ -18,23 +28,128 @@ class FileTaskConfig(BaseModel):
 
 class FileTask(BaseTaskRunner):
     type_name = "file"
+    config_model = FileTaskConfig
+    cacheable = True  # The result is the file, whose state cache_inputs() tracks
+    # Batching is opt-in with --batch-size file=N; on its own each task runs and reports separately
+    max_batch_latency = FILE_BATCH_LATENCY
+    batch_workers = FILE_BATCH_WORKERS
+
+    def cache_inputs(self, config):
+        # The target's current state, so external edits or deletions invalidate the cached result
+        path = config.get("path")
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError, ValueError):
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
 
     def run(self, config):
         # Validate config using Pydantic model
-        validated_config = FileTaskConfig(**config)
+        validated_config = self.validate_config(config)
 
         if validated_config.action == FileAction.CREATE:
-            print(f"[FileTask] Creating file {validated_config.path}")
+            emit(f"[FileTask] Creating file {validated_config.path}")
             with open(validated_config.path, "w") as f:
                 f.write(validated_config.content or "")
-            print(f"[FileTask] File {validated_config.path} created successfully")
+            emit(f"[FileTask] File {validated_config.path} created successfully")
         elif validated_config.action == FileAction.DELETE:
             if os.path.exists(validated_config.path):
-                print(f"[FileTask] Deleting file {validated_config.path}")
+                emit(f"[FileTask] Deleting file {validated_config.path}")
                 os.remove(validated_config.path)
-                print(f"[FileTask] File {validated_config.path} deleted successfully")
+                emit(f"[FileTask] File {validated_config.path} deleted successfully")
             else:
-                print(f"[FileTask] File {validated_config.path} does not exist")
+                emit(f"[FileTask] File {validated_config.path} does not exist")
         else:
             raise ValueError(
                 f"Unknown action '{validated_config.action}' for file task. Valid actions are '{str(FileAction.CREATE)}' and '{str(FileAction.DELETE)}'")
+
+    def run_batch(self, configs: List[Union[Dict, FileTaskConfig]]) -> List[Optional[Exception]]:
+        # Operations on the same path keep their order on one worker; each worker takes a share of
+        # the paths, so per-file latency on network filesystems overlaps across workers
+        results = [None] * len(configs)
+        by_path = {}
+        for position, config in enumerate(configs):
+            try:
+                config = self.validate_config(config)
+            except Exception as e:
+                results[position] = e
+                continue
+            by_path.setdefault(os.path.abspath(config.path), []).append((position, config))
+
+        groups = list(by_path.values())
+        workers = max(1, min(self.batch_workers, len(groups)))
+        if workers > 1:
+            # Each worker runs in its own copy of the caller's context, so its lines reach the tasks' output
+            shares = [groups[start::workers] for start in range(workers)]
+            contexts = [contextvars.copy_context() for _ in shares]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(lambda context, share: context.run(_apply_file_operations, share),
+                                         contexts, shares))
+        else:
+            outcomes = [_apply_file_operations(groups)]
+
+        for operations in outcomes:
+            for position, error in operations:
+                results[position] = error
+        return results
+
+
+def _apply_file_operations(groups: List[List[Tuple[int, FileTaskConfig]]]) -> List[Tuple[int, Optional[Exception]]]:
+    outcomes = []
+    for position, config in (operation for operations in groups for operation in operations):
+        try:
+            with batch_item(position):
+                _apply_file_operation(config)
+            outcomes.append((position, None))
+        except Exception as e:
+            outcomes.append((position, e))
+    return outcomes
+
+
+def _apply_file_operation(config: FileTaskConfig):
+    # The same lines as run(), so batched tasks report each file
+    if config.action == FileAction.CREATE:
+        emit(f"[FileTask] Creating file {config.path}")
+        _write_atomically(config.path, config.content or "")
+        emit(f"[FileTask] File {config.path} created successfully")
+    elif os.path.exists(config.path):
+        emit(f"[FileTask] Deleting file {config.path}")
+        os.remove(config.path)
+        emit(f"[FileTask] File {config.path} deleted successfully")
+    else:
+        emit(f"[FileTask] File {config.path} does not exist")
+
+
+def _write_atomically(path: str, content: str):
+    # Written next to the target and renamed over it, so readers see the old or the new file, never a partial one.
+    # A symlink is followed, so the file it points to is replaced and the link is kept, as a plain write would
+    target = os.path.realpath(path)
+    temp_path = f"{target}.{os.getpid()}.{threading.get_ident()}{TEMP_FILE_SUFFIX}"
+    try:
+        with open(temp_path, "w") as f:
+            f.write(content)
+        _copy_file_attributes(target, temp_path)
+        os.replace(temp_path, target)
+    except BaseException as e:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        # Report the file the task asked for, not the temporary or resolved name
+        if isinstance(e, OSError) and e.filename in (temp_path, target):
+            e.filename = path
+        raise
+
+
+def _copy_file_attributes(source: str, destination: str):
+    # An overwritten file keeps its mode, and its owner where the process may set it
+    try:
+        source_stat = os.stat(source)
+    except FileNotFoundError:
+        return
+    os.chmod(destination, stat.S_IMODE(source_stat.st_mode))
+    if hasattr(os, "chown"):
+        try:
+            os.chown(destination, source_stat.st_uid, source_stat.st_gid)
+        except OSError:
+            pass
@@ -1,11 +1,16 @@
-import requests
 from ..plugin_base import BaseTaskRunner
+from ..tasks.retry import current_task_timeout
+from ..utils.http_session import get_http_session, get_default_timeout
+from ..utils.output import emit
 from pydantic import BaseModel, Field, validator
+from typing import Optional
 from urllib.parse import urlparse
 
 
 class HttpGetTaskConfig(BaseModel):
     url: str = Field(..., description="The URL to make the GET request to")
+    timeout: Optional[float] = Field(None, description="Request timeout in seconds (defaults to the session timeout)",
+                                     gt=0)
 
     @validator('url')
     def validate_url(cls, v):
@@ -19,10 +24,20 @@ class HttpGetTaskConfig(BaseModel):
 
 class HttpGetTask(BaseTaskRunner):
     type_name = "http_get"
+    config_model = HttpGetTaskConfig
+    cacheable = False  # The remote side can change without the config changing
+    enforces_timeout = True
 
     def run(self, config):
         # Validate config using Pydantic model
-        validated_config = HttpGetTaskConfig(**config)
-        print(f"[HttpGetTask] GET {validated_config.url}")
-        response = requests.get(validated_config.url)
-        print(f"[HttpGetTask] Status: {response.status_code}")
\ No newline at end of file
+        validated_config = self.validate_config(config)
+        timeout = validated_config.timeout or get_default_timeout()
+        # A request never outlives the task's own time limit, so a timed-out attempt is really over
+        task_timeout = current_task_timeout()
+        if task_timeout is not None:
+            timeout = min(timeout, task_timeout)
+        emit(f"[HttpGetTask] GET {validated_config.url}")
+
+        # Connections are pooled per host and reused across tasks for the whole run
+        response = get_http_session().get(validated_config.url, timeout=timeout)
+        emit(f"[HttpGetTask] Status: {response.status_code}")
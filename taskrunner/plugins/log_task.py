@@ -1,4 +1,5 @@
 from ..plugin_base import BaseTaskRunner
+from ..utils.output import emit
 from pydantic import BaseModel, Field
 
 
@@ -8,8 +9,9 @@ class LogTaskConfig(BaseModel):
 
 class LogTask(BaseTaskRunner):
     type_name = "log"
+    config_model = LogTaskConfig
 
     def run(self, config):
         # Validate config using Pydantic model
-        validated_config = LogTaskConfig(**config)
-        print(f"[LogTask] {validated_config.message}")
+        validated_config = self.validate_config(config)
+        emit(f"[LogTask] {validated_config.message}")
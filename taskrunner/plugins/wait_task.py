@@ -1,5 +1,7 @@
+import asyncio
 import time
 from ..plugin_base import BaseTaskRunner
+from ..utils.output import emit
 from pydantic import BaseModel, Field
 
 
@@ -9,10 +11,18 @@ class WaitTaskConfig(BaseModel):
 
 class WaitTask(BaseTaskRunner):
     type_name = "wait"
+    config_model = WaitTaskConfig
 
     def run(self, config):
         # Validate config using Pydantic model
-        validated_config = WaitTaskConfig(**config)
-        print(f"[WaitTask] Waiting {validated_config.seconds} seconds...")
+        validated_config = self.validate_config(config)
+        emit(f"[WaitTask] Waiting {validated_config.seconds} seconds...")
         time.sleep(validated_config.seconds)
-        print("[WaitTask] Done.")
+        emit("[WaitTask] Done.")
+
+    async def run_async(self, config):
+        # Sleep on the event loop instead of holding a worker thread
+        validated_config = self.validate_config(config)
+        emit(f"[WaitTask] Waiting {validated_config.seconds} seconds...")
+        await asyncio.sleep(validated_config.seconds)
+        emit("[WaitTask] Done.")
@@ -0,0 +1,151 @@
+import asyncio
+import contextlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Type
+
+from ..models.task_model import TaskModel
+from ..plugin_base import BaseTaskRunner
+from ..utils.checkpoint import CheckpointJournal
+from ..utils.output import emit, task_output
+from ..utils.result_cache import ResultCache
+from .executor import (
+    TASK_SUCCESS,
+    TASK_ERROR,
+    TASK_CACHED,
+    TASK_TIMED_OUT,
+    ProcessTaskPool,
+    format_task_tag,
+    _ends_on_timeout,
+    _handle_task_result,
+    _is_successful,
+    _log_task_execution,
+    _mark_cached,
+    _mark_finished,
+    _record_checkpoint,
+    _report_skipped_task,
+    _substitute_config,
+    _validate_config
+)
+from .metrics import RunMetrics
+from .retry import RetryMessages, backoff_delay, report_retry, should_retry, task_time_limit
+from .scheduler import validate_type_settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_ASYNC_CONCURRENCY = 256
+_NO_LIMIT = contextlib.nullcontext()
+
+
+def run_tasks_async(tasks: List[TaskModel], plugins: Dict[str, Type[BaseTaskRunner]], verbose: bool = False,
+                    max_concurrency: Optional[int] = None, plugin_prefix: Optional[str] = None,
+                    cache: Optional[ResultCache] = None, metrics: Optional[RunMetrics] = None,
+                    checkpoint: Optional[CheckpointJournal] = None, type_limits: Optional[Dict[str, int]] = None):
+    validate_type_settings(type_limits)
+    task_count = len(tasks)
+    emit(f"Running {task_count} tasks with the asyncio engine")
+
+    if not tasks:
+        return
+    with ProcessTaskPool(plugin_prefix=plugin_prefix) as process_pool:
+        asyncio.run(_run_all_tasks(tasks, plugins, verbose, max_concurrency or DEFAULT_ASYNC_CONCURRENCY,
+                                   process_pool, cache, metrics, checkpoint, type_limits))
+
+
+async def _run_all_tasks(tasks, plugins, verbose, max_concurrency, process_pool, cache, metrics=None,
+                         checkpoint=None, type_limits=None):
+    loop = asyncio.get_running_loop()
+
+    # Sync plugins are offloaded through asyncio.to_thread, so size the default pool to the concurrency limit
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=min(max_concurrency, len(tasks))))
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    type_semaphores = {type_name: asyncio.Semaphore(limit) for type_name, limit in (type_limits or {}).items()}
+    outcomes = {task.name: loop.create_future() for task in tasks}
+
+    # Semaphores wake waiters in FIFO order, so starting higher-priority tasks first lets them win the slots
+    ordered_tasks = sorted(tasks, key=lambda task: -task.priority)
+    await asyncio.gather(*(_run_task_when_ready(task, plugins, verbose, semaphore, outcomes, process_pool, cache,
+                                                metrics, checkpoint, type_semaphores.get(task.type))
+                           for task in ordered_tasks))
+
+
+async def _run_task_when_ready(task, plugins, verbose, semaphore, outcomes, process_pool, cache, metrics=None,
+                               checkpoint=None, type_semaphore=None):
+    # Dependencies outside the selected tasks (e.g. filtered out by --only) are treated as satisfied
+    dependencies = [name for name in task.depends_on if name in outcomes]
+    for dependency in dependencies:
+        if not await outcomes[dependency]:
+            _report_skipped_task(task.name, dependency, metrics)
+            outcomes[task.name].set_result(False)
+            return
+
+    # Queue wait is measured from the moment dependencies are satisfied until a concurrency slot frees up
+    task_metrics = metrics.track(task) if metrics is not None else None
+    attempt = 0
+    while True:
+        # The per-type slot is taken first so tasks held back by their type limit don't occupy a global slot
+        async with type_semaphore or _NO_LIMIT, semaphore:
+            plugin_cls = plugins[task.type]
+            runner = plugin_cls()
+            config = _substitute_config(task, task_metrics)
+            if cache is not None and cache.is_fresh(runner, task.type, config):
+                _mark_cached(task_metrics)
+                result = (TASK_CACHED, None)
+            elif process_pool.handles(plugin_cls):
+                _log_task_execution(task, config, verbose)
+                result = await asyncio.wrap_future(process_pool.submit(task.type, config, task_metrics, task.timeout,
+                                                                      task.name))
+            else:
+                result = await _run_single_task_async(task, runner, config, verbose, task_metrics)
+
+        # Only async plugins are cancelled by their timeout; anything else may still be running unless
+        # the plugin ends its own calls at the timeout
+        abandoned = (result[0] == TASK_TIMED_OUT and not _ends_on_timeout(plugin_cls)
+                     and (process_pool.handles(plugin_cls) or plugin_cls.run_async is BaseTaskRunner.run_async))
+        if _is_successful(result) or not should_retry(task, attempt, abandoned):
+            break
+        # Back off outside the semaphore so other tasks can use the slot meanwhile
+        delay = backoff_delay(task, attempt)
+        attempt += 1
+        report_retry(format_task_tag(task.name), task, attempt, result[1], delay)
+        await asyncio.sleep(delay)
+
+    if cache is not None and result[0] == TASK_SUCCESS:
+        cache.store(runner, task.type, config)
+    _handle_task_result(result, task.name)
+    if _is_successful(result):
+        _record_checkpoint(checkpoint, task)
+    outcomes[task.name].set_result(_is_successful(result))
+
+
+async def _run_single_task_async(task: TaskModel, runner: BaseTaskRunner, config: Dict, verbose: bool,
+                                 task_metrics=None):
+    tag = format_task_tag(task.name)
+    # Each task runs in its own asyncio context (copied into to_thread), so captures don't mix
+    with task_output(task.name):
+        try:
+            if verbose:
+                emit(f"[{tag}] [VERBOSE] Running {task.name} ({task.type}) with config: {config}")
+            else:
+                emit(f"[{tag}] Running task: {task.name}")
+
+            if task_metrics is not None:
+                task_metrics.mark_started()
+            validated_config = _validate_config(runner, config, task_metrics)
+            if task.timeout is None:
+                await runner.run_async(validated_config)
+            else:
+                # Cancelling frees the slot at once; a sync plugin's thread finishes in the background
+                with task_time_limit(task.timeout):
+                    await asyncio.wait_for(runner.run_async(validated_config), task.timeout)
+            _mark_finished(task_metrics, TASK_SUCCESS)
+            return TASK_SUCCESS, None
+        except asyncio.TimeoutError:
+            _mark_finished(task_metrics, TASK_TIMED_OUT)
+            return TASK_TIMED_OUT, RetryMessages.TASK_TIMED_OUT.value.format(task.timeout)
+        except Exception as e:
+            _mark_finished(task_metrics, TASK_ERROR)
+            return TASK_ERROR, str(e)
@@ -1,13 +1,29 @@
 import logging
+import queue
 import re
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Type
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Sized, Type
 from enum import Enum
 import os
 
 from ..models.task_model import TaskModel
-from ..plugin_base import BaseTaskRunner
-from ..utils.env_substitution import substitute_env_vars
+from ..plugin_base import BaseTaskRunner, PluginExecution
+from ..utils.plugin_discovery import LazyPlugin, discover_plugins_lazily
+from ..utils.checkpoint import CheckpointJournal
+from ..utils.output import batch_output, capture_output, emit, emit_records, task_output
+from ..utils.result_cache import ResultCache
+from .metrics import RunMetrics, get_peak_rss_kb
+from .retry import TaskTimeoutError, backoff_delay, call_with_timeout, report_retry, retry_limit, should_retry
+from .scheduler import (
+    DependencyTracker,
+    FairTaskQueue,
+    has_dependencies,
+    has_priorities,
+    topological_order,
+    validate_type_settings
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -15,6 +31,16 @@ logger = logging.getLogger(__name__)
 # Constants
 TASK_SUCCESS = "success"
 TASK_ERROR = "error"
+TASK_TIMED_OUT = "timed_out"
+TASK_CACHED = "cached"
+STREAMED_TASK_COUNT = "streamed"
+IN_FLIGHT_TASKS_PER_WORKER = 2
+
+# Marks the timer event that ends a forming batch's wait for more tasks
+_BATCH_DEADLINE = object()
+
+# Plugins indexed once per worker process by _init_process_worker; each is imported on first use and reused
+_worker_plugins = {}
 
 
 class ExecutionStatus(Enum):
@@ -22,6 +48,17 @@ class ExecutionStatus(Enum):
     ERROR = "error"
 
 
+class ExecutionEngine(str, Enum):
+    THREAD = "thread"
+    ASYNCIO = "asyncio"
+    PROCESS = "process"
+
+
+class ExecutorMessages(Enum):
+    UNKNOWN_WORKER_TASK_TYPE = "Unknown task type '{}' in worker process"
+    BATCH_RESULT_COUNT = "run_batch of plugin '{}' returned {} results for {} tasks"
+
+
 def _get_cpu_count():
     try:
         # Try to get the number of CPUs available to the current process
@@ -44,110 +81,636 @@ def format_task_tag(name):
     return re.sub(r'[^a-zA-Z0-9]+', ' ', name).upper().strip()
 
 
-def run_tasks_sequentially(tasks: List[TaskModel], plugins: Dict[str, Type[BaseTaskRunner]], verbose: bool = False):
-    task_count = len(tasks)
-    print(f"Running {task_count} tasks sequentially")
+def run_tasks_sequentially(tasks: Iterable[TaskModel], plugins: Dict[str, Type[BaseTaskRunner]],
+                           verbose: bool = False, cache: Optional[ResultCache] = None,
+                           metrics: Optional[RunMetrics] = None, checkpoint: Optional[CheckpointJournal] = None,
+                           batch_sizes: Optional[Dict[str, int]] = None):
+    validate_type_settings(batch_sizes=batch_sizes)
+    task_count = _describe_task_count(tasks)
+    emit(f"Running {task_count} tasks sequentially")
+
+    # Respect depends_on and priority while keeping file order for everything else.
+    # Streamed tasks can only depend on earlier entries, so file order already satisfies them.
+    streamed = not isinstance(tasks, list)
+    if not streamed and (has_dependencies(tasks) or has_priorities(tasks)):
+        tasks = topological_order(tasks)
 
+    # Consecutive tasks of a batchable type are collected and run through one run_batch call.
+    # A list is all there up front; streamed tasks are held back at most max_batch_latency.
+    batch, batch_names, batch_deadline = [], set(), None
     for task in tasks:
         # Prepare task execution
         plugin_cls = plugins[task.type]
+        if batch and not _extends_batch(batch, batch_names, batch_deadline, task, plugin_cls, batch_sizes):
+            _run_batch_sequentially(batch, verbose, cache, checkpoint)
+            batch, batch_names = [], set()
         runner = plugin_cls()
+        task_metrics = metrics.track(task) if metrics is not None else None
 
         # Substitute environment variables in config
-        config = substitute_env_vars(task.config)
+        config = _substitute_config(task, task_metrics)
 
-        # Log task execution
-        _log_task_execution(task, config, verbose)
+        # Skip tasks whose inputs are unchanged since their last successful run
+        if cache is not None and cache.is_fresh(runner, task.type, config):
+            _mark_cached(task_metrics)
+            _report_cached_task(task.name)
+            _record_checkpoint(checkpoint, task)
+            continue
+
+        if _is_batchable(plugin_cls, task, batch_sizes):
+            if not batch and streamed:
+                batch_deadline = time.monotonic() + plugin_cls.max_batch_latency
+            batch.append((task, runner, config, task_metrics))
+            batch_names.add(task.name)
+            continue
 
-        # Execute task
-        _execute_single_task(runner, task, config)
+        # Nothing runs alongside, so output is attributed to the task but not held back
+        with task_output(task.name, buffered=False):
+            # Log task execution
+            _log_task_execution(task, config, verbose)
 
+            # Execute task
+            _execute_single_task(runner, task, config, task_metrics)
+        if cache is not None:
+            cache.store(runner, task.type, config)
+        _record_checkpoint(checkpoint, task)
 
-def run_tasks_in_parallel(tasks: List[TaskModel], plugins: Dict[str, Type[BaseTaskRunner]], verbose: bool = False):
-    task_count = len(tasks)
-    print(f"Running {task_count} tasks in parallel")
+    if batch:
+        _run_batch_sequentially(batch, verbose, cache, checkpoint)
 
-    # Submit all tasks to the executor
-    futures = _submit_tasks_for_parallel_execution(tasks, plugins, verbose)
 
-    # Process completed tasks
-    _process_completed_tasks(futures)
+def run_tasks_in_parallel(tasks: Iterable[TaskModel], plugins: Dict[str, Type[BaseTaskRunner]],
+                          verbose: bool = False, max_workers: Optional[int] = None,
+                          plugin_prefix: Optional[str] = None, cache: Optional[ResultCache] = None,
+                          metrics: Optional[RunMetrics] = None, checkpoint: Optional[CheckpointJournal] = None,
+                          type_limits: Optional[Dict[str, int]] = None, type_weights: Optional[Dict[str, float]] = None,
+                          batch_sizes: Optional[Dict[str, int]] = None):
+    validate_type_settings(batch_sizes=batch_sizes)
+    task_count = _describe_task_count(tasks)
+    emit(f"Running {task_count} tasks in parallel")
+
+    _run_dependency_graph(tasks, plugins, verbose, max_workers, plugin_prefix, cache=cache, metrics=metrics,
+                          checkpoint=checkpoint, type_limits=type_limits, type_weights=type_weights,
+                          batch_sizes=batch_sizes)
+
+
+def run_tasks_in_processes(tasks: Iterable[TaskModel], plugins: Dict[str, Type[BaseTaskRunner]],
+                           verbose: bool = False, max_workers: Optional[int] = None,
+                           plugin_prefix: Optional[str] = None, cache: Optional[ResultCache] = None,
+                           metrics: Optional[RunMetrics] = None, checkpoint: Optional[CheckpointJournal] = None,
+                           type_limits: Optional[Dict[str, int]] = None, type_weights: Optional[Dict[str, float]] = None):
+    task_count = _describe_task_count(tasks)
+    emit(f"Running {task_count} tasks in worker processes")
+
+    _run_dependency_graph(tasks, plugins, verbose, max_workers, plugin_prefix, all_in_processes=True, cache=cache,
+                          metrics=metrics, checkpoint=checkpoint, type_limits=type_limits, type_weights=type_weights)
+
+
+def _describe_task_count(tasks):
+    return len(tasks) if isinstance(tasks, Sized) else STREAMED_TASK_COUNT
 
 
 def _log_task_execution(task, config, verbose):
     tag = format_task_tag(task.name)
     if verbose:
-        print(f"[{tag}] [VERBOSE] Running {task.name} ({task.type}) with config: {config}")
+        emit(f"[{tag}] [VERBOSE] Running {task.name} ({task.type}) with config: {config}", task.name)
     else:
-        print(f"[{tag}] Running task: {task.name}")
+        emit(f"[{tag}] Running task: {task.name}", task.name)
 
 
-def _execute_single_task(runner, task, config):
+def _execute_single_task(runner, task, config, task_metrics=None):
     tag = format_task_tag(task.name)
-    try:
-        runner.run(config)
-        print(f"[{tag}] Task '{task.name}' completed successfully")
-    except Exception as e:
-        print(f"[{tag}] Task '{task.name}' failed: {e}")
-        raise
+    attempt = 0
+    while True:
+        try:
+            if task_metrics is not None:
+                task_metrics.mark_started()
+            validated_config = _validate_config(runner, config, task_metrics)
+            call_with_timeout(runner.run, task.timeout, validated_config)
+            _mark_finished(task_metrics, TASK_SUCCESS)
+            emit(f"[{tag}] Task '{task.name}' completed successfully", task.name)
+            return
+        except Exception as e:
+            timed_out = isinstance(e, TaskTimeoutError)
+            if should_retry(task, attempt, timed_out and not _ends_on_timeout(type(runner))):
+                delay = backoff_delay(task, attempt)
+                attempt += 1
+                report_retry(tag, task, attempt, e, delay)
+                time.sleep(delay)
+                continue
+            _mark_finished(task_metrics, TASK_TIMED_OUT if timed_out else TASK_ERROR)
+            emit(f"[{tag}] Task '{task.name}' failed: {e}", task.name, error=True)
+            raise
+
+
+def _ends_on_timeout(plugin_cls):
+    # Such plugins stop their own calls at the task's timeout, so nothing keeps running once it expires
+    return isinstance(plugin_cls, type) and issubclass(plugin_cls, BaseTaskRunner) and plugin_cls.enforces_timeout
+
+
+def _batch_size(plugin_cls, type_name, batch_sizes=None):
+    # --batch-size overrides the plugin's own max_batch_size for the run
+    if not (isinstance(plugin_cls, type) and issubclass(plugin_cls, BaseTaskRunner)):
+        return 1
+    return (batch_sizes or {}).get(type_name, plugin_cls.max_batch_size)
+
+
+def _is_batchable(plugin_cls, task, batch_sizes=None):
+    # Tasks with their own retries or time limit keep the one-at-a-time path that enforces them
+    return _batch_size(plugin_cls, task.type, batch_sizes) > 1 and not retry_limit(task) and task.timeout is None
+
+
+def _extends_batch(batch, batch_names, deadline, task, plugin_cls, batch_sizes=None):
+    # A batch holds consecutive tasks of one type, none of which depends on another in the same batch
+    return (task.type == batch[0][0].type and len(batch) < _batch_size(plugin_cls, task.type, batch_sizes)
+            and _is_batchable(plugin_cls, task, batch_sizes) and batch_names.isdisjoint(task.depends_on)
+            and (deadline is None or time.monotonic() < deadline))
+
+
+def _run_task_batch(batch, verbose, buffered=True):
+    # Every task is still announced, validated and timed on its own; only the plugin call is shared.
+    # Returns one error per task (None on success), in batch order.
+    runner = batch[0][1]
+    errors = [None] * len(batch)
+    positions, configs, names = [], [], []
+    with batch_output(names, buffered):
+        for position, (task, _, config, task_metrics) in enumerate(batch):
+            _log_task_execution(task, config, verbose)
+            if task_metrics is not None:
+                task_metrics.mark_started()
+            try:
+                configs.append(_validate_config(runner, config, task_metrics))
+                positions.append(position)
+                names.append(task.name)
+            except Exception as e:
+                errors[position] = e
+
+        try:
+            batch_errors = runner.run_batch(configs) if configs else []
+            if len(batch_errors) != len(configs):
+                raise RuntimeError(ExecutorMessages.BATCH_RESULT_COUNT.value.format(
+                    runner.type_name, len(batch_errors), len(configs)))
+        except Exception as e:
+            batch_errors = [e] * len(configs)
+    for position, error in zip(positions, batch_errors):
+        errors[position] = error
+
+    for (_, _, _, task_metrics), error in zip(batch, errors):
+        _mark_finished(task_metrics, TASK_SUCCESS if error is None else TASK_ERROR)
+    return errors
+
+
+def _run_batch_sequentially(batch, verbose, cache=None, checkpoint=None):
+    # The whole batch has run by the time a failure is known, so the run stops after reporting it
+    failure = None
+    # Nothing runs alongside, so output is attributed to each task but not held back
+    for (task, runner, config, _), error in zip(batch, _run_task_batch(batch, verbose, buffered=False)):
+        tag = format_task_tag(task.name)
+        if error is not None:
+            emit(f"[{tag}] Task '{task.name}' failed: {error}", task.name, error=True)
+            failure = failure or error
+            continue
+        emit(f"[{tag}] Task '{task.name}' completed successfully", task.name)
+        if cache is not None:
+            cache.store(runner, task.type, config)
+        _record_checkpoint(checkpoint, task)
+    if failure is not None:
+        raise failure
+
+
+def _run_batch_in_worker(batch, verbose, cache=None):
+    # Parallel engines: cached tasks are answered without running, the rest share one run_batch call.
+    # Returns one (status, message) per task, reported by the scheduler like single-task results.
+    results = [(TASK_CACHED, None)] * len(batch)
+    pending = [position for position, (task, runner, config, task_metrics) in enumerate(batch)
+               if cache is None or not cache.is_fresh(runner, task.type, config)]
+    for position in set(range(len(batch))).difference(pending):
+        _mark_cached(batch[position][3])
+
+    errors = _run_task_batch([batch[position] for position in pending], verbose) if pending else []
+    for position, error in zip(pending, errors):
+        task, runner, config, _ = batch[position]
+        if error is None:
+            results[position] = (TASK_SUCCESS, None)
+            if cache is not None:
+                cache.store(runner, task.type, config)
+        else:
+            results[position] = (TASK_ERROR, str(error))
+    return results
 
 
-def _submit_tasks_for_parallel_execution(tasks, plugins, verbose):
-    futures = []
-    # Use dynamic CPU count instead of hardcoded MAX_PARALLEL_WORKERS
-    cpu_count = _get_cpu_count()
-    worker_count = min(cpu_count, len(tasks))
+def _substitute_config(task, task_metrics=None):
+    if task_metrics is None:
+        return task.config_template().render()
+    started = time.perf_counter()
+    config = task.config_template().render()
+    task_metrics.substitution_seconds = time.perf_counter() - started
+    return config
 
-    with ThreadPoolExecutor(max_workers=worker_count) as executor:
-        for task in tasks:
-            plugin_cls = plugins[task.type]
-            runner = plugin_cls()
 
-            # Substitute environment variables in config
-            config = substitute_env_vars(task.config)
+def _validate_config(runner, config, task_metrics=None):
+    # Duck-typed runners that don't derive from BaseTaskRunner keep receiving the plain dict
+    if not isinstance(runner, BaseTaskRunner):
+        return config
+    if task_metrics is None:
+        return runner.validate_config(config)
+    started = time.perf_counter()
+    validated_config = runner.validate_config(config)
+    task_metrics.validation_seconds = time.perf_counter() - started
+    return validated_config
+
 
-            tag = format_task_tag(task.name)
+def _mark_finished(task_metrics, status):
+    if task_metrics is not None:
+        task_metrics.mark_finished(status)
+
+
+def _mark_cached(task_metrics):
+    if task_metrics is not None:
+        task_metrics.mark_started()
+        task_metrics.mark_finished(TASK_CACHED)
+
+
+def _get_worker_count(task_count, max_workers=None):
+    # Use dynamic CPU count instead of hardcoded MAX_PARALLEL_WORKERS unless explicitly overridden
+    limit = max_workers or _get_cpu_count()
+    if task_count is None:
+        return limit
+    return max(1, min(limit, task_count))
+
+
+def _submit_task(executor, process_pool, task, plugin_cls, config, verbose, cache=None, task_metrics=None):
+    runner = plugin_cls()
+    if cache is not None and cache.is_fresh(runner, task.type, config):
+        _mark_cached(task_metrics)
+        return _completed_future((TASK_CACHED, None))
+
+    if process_pool.handles(plugin_cls):
+        # The worker only receives the type name and config, so the task is announced from here
+        _log_task_execution(task, config, verbose)
+        future = process_pool.submit(task.type, config, task_metrics, task.timeout, task.name)
+    else:
+        future = executor.submit(_run_single_task, task, runner, config, verbose, task_metrics)
+
+    if cache is not None:
+        future.add_done_callback(lambda finished: _store_cached_result(cache, runner, task.type, config, finished))
+    return future
+
+
+def _completed_future(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def _store_cached_result(cache, runner, type_name, config, future):
+    if not future.cancelled() and future.exception() is None and _is_successful(future.result()):
+        cache.store(runner, type_name, config)
+
+
+def _is_successful(result):
+    return result is None or result[0] in (TASK_SUCCESS, TASK_CACHED)
+
+
+def _run_dependency_graph(tasks, plugins, verbose, max_workers=None, plugin_prefix=None, all_in_processes=False,
+                          cache=None, metrics=None, checkpoint=None, type_limits=None, type_weights=None,
+                          batch_sizes=None):
+    # Streamed tasks are read one by one as slots free up; every ready task of a list goes into the
+    # ready queue up front, so priorities and fair shares apply across the whole list
+    incremental = not isinstance(tasks, list)
+    tracker = DependencyTracker([] if incremental else tasks)
+    worker_count = _get_worker_count(len(tasks) if isinstance(tasks, Sized) else None, max_workers)
+
+    # At most max_in_flight tasks hold a runner, a config and a future at any time; ready tasks beyond
+    # that wait in the ready queue (by priority and fair share per type) and streamed input is not
+    # read further until a slot frees up. A batch of tasks run by one run_batch call takes one slot.
+    max_in_flight = worker_count * IN_FLIGHT_TASKS_PER_WORKER
+    ready_queue = FairTaskQueue(type_limits, type_weights)
+
+    # Futures report back through a queue so completions are handled in O(1) as they happen
+    completed = queue.SimpleQueue()
+    in_flight = 0
+
+    # Failed tasks with retries left wait on a timer instead of a worker, then re-enter through the queue
+    retrying = 0
+    attempts = {}
+    retry_metrics = {}
+
+    # Partial batches per task type, already holding their slot, that take in newly ready tasks of
+    # their type until they are full, their plugin's max_batch_latency is up, or nothing else can
+    # make more tasks ready
+    forming = {}
+    input_done = not incremental
+
+    with ThreadPoolExecutor(max_workers=worker_count) as executor, \
+            ProcessTaskPool(max_workers, plugin_prefix, run_all=all_in_processes) as process_pool:
+
+        def batchable(task):
+            plugin_cls = plugins[task.type]
+            return _is_batchable(plugin_cls, task, batch_sizes) and not process_pool.handles(plugin_cls)
+
+        def make_ready(task):
+            batch = forming.get(task.type)
+            if batch is not None and batchable(task):
+                batch[0].append(task)
+                if len(batch[0]) >= _batch_size(plugins[task.type], task.type, batch_sizes):
+                    del forming[task.type]
+                    submit_batch(batch[0])
+                return
+            ready_queue.push(task)
+
+        def dispatch():
+            nonlocal in_flight
+            while in_flight < max_in_flight:
+                task = ready_queue.pop()
+                if task is None:
+                    return
+                if not batchable(task):
+                    submit(task)
+                    continue
+                if task.type in forming:
+                    # The forming batch already holds the slot of its type; the task joins it
+                    ready_queue.release(task.type)
+                    make_ready(task)
+                    continue
+
+                plugin_cls = plugins[task.type]
+                size = _batch_size(plugin_cls, task.type, batch_sizes)
+                batch = [task] + ready_queue.pop_more(task.type, size - 1, batchable)
+                in_flight += 1
+                if len(batch) < size and plugin_cls.max_batch_latency > 0:
+                    token = object()
+                    forming[task.type] = (batch, token)
+                    timer = threading.Timer(plugin_cls.max_batch_latency, completed.put,
+                                            args=((_BATCH_DEADLINE, task.type, token),))
+                    timer.daemon = True
+                    timer.start()
+                    flush_stalled()
+                else:
+                    submit_batch(batch)
+
+        def flush_stalled():
+            # Only running tasks, retries and unread input can make more tasks ready; without them
+            # waiting for a batch to fill up is pointless
+            if forming and input_done and not retrying and in_flight == len(forming):
+                for type_name in list(forming):
+                    submit_batch(forming.pop(type_name)[0])
+
+        def submit(task):
+            nonlocal in_flight
+            task_metrics = retry_metrics.pop(task.name, None)
+            if task_metrics is None and metrics is not None:
+                task_metrics = metrics.track(task)
+            config = _substitute_config(task, task_metrics)
+            if verbose:
+                tag = format_task_tag(task.name)
+                emit(f"[{tag}] [VERBOSE] Submitting {task.name} ({task.type}) for parallel execution", task.name)
+            future = _submit_task(executor, process_pool, task, plugins[task.type], config, verbose, cache,
+                                  task_metrics)
+            in_flight += 1
+            future.add_done_callback(
+                lambda finished, task=task, task_metrics=task_metrics: completed.put((finished, task, task_metrics)))
+
+        def submit_batch(batch):
+            # The batch already holds its slot; the runner of its first task runs the whole batch
+            plugin_cls = plugins[batch[0].type]
+            entries = []
+            for task in batch:
+                task_metrics = metrics.track(task) if metrics is not None else None
+                entries.append((task, plugin_cls(), _substitute_config(task, task_metrics), task_metrics))
             if verbose:
-                print(f"[{tag}] [VERBOSE] Submitting {task.name} ({task.type}) for parallel execution")
+                emit(f"[VERBOSE] Submitting a batch of {len(entries)} {plugin_cls.type_name} tasks")
+            future = executor.submit(_run_batch_in_worker, entries, verbose, cache)
+            future.add_done_callback(lambda finished, entries=entries: completed.put((finished, entries, None)))
+
+        def retry_later(task, task_metrics, result):
+            nonlocal retrying
+            attempt = attempts.get(task.name, 0)
+            abandoned = result[0] == TASK_TIMED_OUT and not _ends_on_timeout(plugins[task.type])
+            if not should_retry(task, attempt, abandoned):
+                return False
+            attempts[task.name] = attempt + 1
+            delay = backoff_delay(task, attempt)
+            report_retry(format_task_tag(task.name), task, attempt + 1, result[1], delay)
+            if task_metrics is not None:
+                retry_metrics[task.name] = task_metrics
+            retrying += 1
+            timer = threading.Timer(delay, completed.put, args=((None, task, None),))
+            timer.daemon = True
+            timer.start()
+            return True
+
+        def finish(task, task_metrics, result):
+            if _is_successful(result):
+                _handle_task_result(result, task.name)
+                _record_checkpoint(checkpoint, task)
+                for ready_task in tracker.mark_done(task.name):
+                    make_ready(ready_task)
+            elif not retry_later(task, task_metrics, result):
+                _handle_task_result(result, task.name)
+                for skipped_name in tracker.mark_failed(task.name):
+                    _report_skipped_task(skipped_name, task.name, metrics)
+
+        def collect(block):
+            nonlocal in_flight, retrying
+            while in_flight or retrying:
+                try:
+                    future, task, task_metrics = completed.get(block=block)
+                except queue.Empty:
+                    return
+                block = False
+                if future is None:
+                    # Backoff elapsed for a retried task
+                    retrying -= 1
+                    make_ready(task)
+                elif future is _BATCH_DEADLINE:
+                    # task is the type name and task_metrics the token of the batch the timer was set for
+                    batch = forming.get(task)
+                    if batch is not None and batch[1] is task_metrics:
+                        del forming[task]
+                        submit_batch(batch[0])
+                elif isinstance(task, list):
+                    # A batch: one slot is freed, and each task's result is handled on its own
+                    in_flight -= 1
+                    ready_queue.release(task[0][0].type)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        results = [(TASK_ERROR, str(e))] * len(task)
+                    for (batch_task, _, _, batch_metrics), result in zip(task, results):
+                        finish(batch_task, batch_metrics, result)
+                else:
+                    in_flight -= 1
+                    ready_queue.release(task.type)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = (TASK_ERROR, str(e))
+                    finish(task, task_metrics, result)
+
+                dispatch()
+                flush_stalled()
+
+        if incremental:
+            for task in tasks:
+                ready, failed_dependency = tracker.add(task)
+                if ready:
+                    make_ready(task)
+                    dispatch()
+                elif failed_dependency:
+                    _report_skipped_task(task.name, failed_dependency, metrics)
+                collect(block=False)
+
+                # Backpressure: stop pulling tasks while the window is full or enough tasks are waiting.
+                # Waiting tasks can only be held back by a type limit, so something of that type is in flight.
+                while in_flight >= max_in_flight or len(ready_queue) >= max_in_flight:
+                    collect(block=True)
+            input_done = True
+            dispatch()
+        else:
+            # Every task whose dependencies are met is scheduled immediately so workers never idle
+            for task in tracker.ready():
+                make_ready(task)
+            dispatch()
 
-            # Submit task to executor
-            future = executor.submit(_run_single_task, task, runner, config, verbose)
-            futures.append((future, task.name))
+        flush_stalled()
+        while in_flight or retrying:
+            collect(block=True)
 
-    return futures
 
+def _record_checkpoint(checkpoint, task):
+    if checkpoint is not None:
+        checkpoint.record(task)
+
+
+def _report_cached_task(task_name):
+    tag = format_task_tag(task_name)
+    emit(f"[{tag}] Task '{task_name}' is up to date, skipping", task_name)
 
-def _process_completed_tasks(futures):
-    for future, task_name in futures:
-        try:
-            result = future.result()
-            _handle_task_result(result, task_name)
-        except Exception as e:
-            tag = format_task_tag(task_name)
-            print(f"[{tag}] Task '{task_name}' failed with exception: {e}")
+
+def _report_skipped_task(task_name, failed_dependency, metrics=None):
+    if metrics is not None:
+        metrics.record_skipped()
+    tag = format_task_tag(task_name)
+    emit(f"[{tag}] Task '{task_name}' skipped: dependency '{failed_dependency}' failed", task_name, error=True)
 
 
 def _handle_task_result(result, task_name):
     tag = format_task_tag(task_name)
     if result is not None:
         status, message = result
-        if status == TASK_SUCCESS:
-            print(f"[{tag}] Task '{task_name}' completed successfully")
+        if status == TASK_CACHED:
+            _report_cached_task(task_name)
+        elif status == TASK_SUCCESS:
+            emit(f"[{tag}] Task '{task_name}' completed successfully", task_name)
         else:
-            print(f"[{tag}] Task '{task_name}' failed: {message}")
+            emit(f"[{tag}] Task '{task_name}' failed: {message}", task_name, error=True)
     else:
-        print(f"[{tag}] Task '{task_name}' completed")
+        emit(f"[{tag}] Task '{task_name}' completed", task_name)
 
 
-def _run_single_task(task: TaskModel, runner: BaseTaskRunner, config: Dict, verbose: bool):
+def _run_single_task(task: TaskModel, runner: BaseTaskRunner, config: Dict, verbose: bool, task_metrics=None):
     tag = format_task_tag(task.name)
-    try:
-        if verbose:
-            print(f"[{tag}] [VERBOSE] Running {task.name} ({task.type}) with config: {config}")
+    with task_output(task.name):
+        try:
+            if verbose:
+                emit(f"[{tag}] [VERBOSE] Running {task.name} ({task.type}) with config: {config}")
+            else:
+                emit(f"[{tag}] Running task: {task.name}")
+
+            if task_metrics is not None:
+                task_metrics.mark_started()
+            validated_config = _validate_config(runner, config, task_metrics)
+            call_with_timeout(runner.run, task.timeout, validated_config)
+            _mark_finished(task_metrics, TASK_SUCCESS)
+            return TASK_SUCCESS, None
+        except TaskTimeoutError as e:
+            _mark_finished(task_metrics, TASK_TIMED_OUT)
+            return TASK_TIMED_OUT, str(e)
+        except Exception as e:
+            _mark_finished(task_metrics, TASK_ERROR)
+            return TASK_ERROR, str(e)
+
+
+class ProcessTaskPool:
+    # Lazily started so runs without process-bound plugins never fork
+    def __init__(self, max_workers: Optional[int] = None, plugin_prefix: Optional[str] = None,
+                 run_all: bool = False):
+        self._max_workers = max_workers
+        self._plugin_prefix = plugin_prefix
+        self._run_all = run_all
+        self._executor = None
+
+    def handles(self, plugin_cls) -> bool:
+        return self._run_all or getattr(plugin_cls, "execution", None) == PluginExecution.PROCESS.value
+
+    def submit(self, type_name: str, config: Dict, task_metrics=None, timeout: Optional[float] = None,
+               task_name: Optional[str] = None):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers,
+                                                 initializer=_init_process_worker,
+                                                 initargs=(self._plugin_prefix,))
+        # Only the type name and the substituted config are pickled
+        worker_future = self._executor.submit(_run_in_process_worker, type_name, config, timeout)
+
+        # Workers also report their timings and output; callers only see the usual (status, message) result
+        future = Future()
+        worker_future.add_done_callback(
+            lambda finished: _resolve_worker_result(finished, future, task_metrics, task_name))
+        return future
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+
+def _init_process_worker(plugin_prefix):
+    _worker_plugins.clear()
+    _worker_plugins.update(discover_plugins_lazily(package_prefix=plugin_prefix).entries())
+
+
+def _run_in_process_worker(type_name, config, timeout=None):
+    timings = {"started_at": time.time()}
+    started = time.perf_counter()
+    plugin = _worker_plugins.get(type_name)
+    # Output goes back to the parent, which writes it through its own sink in one piece
+    with capture_output() as output:
+        if plugin is None:
+            status, message = TASK_ERROR, ExecutorMessages.UNKNOWN_WORKER_TASK_TYPE.value.format(type_name)
         else:
-            print(f"[{tag}] Running task: {task.name}")
-
-        runner.run(config)
-        return TASK_SUCCESS, None
+            try:
+                plugin_cls = plugin.load() if isinstance(plugin, LazyPlugin) else plugin
+                runner = plugin_cls()
+                validated_config = _validate_config(runner, config)
+                timings["validation_seconds"] = time.perf_counter() - started
+                started = time.perf_counter()
+                call_with_timeout(runner.run, timeout, validated_config)
+                status, message = TASK_SUCCESS, None
+            except TaskTimeoutError as e:
+                status, message = TASK_TIMED_OUT, str(e)
+            except Exception as e:
+                status, message = TASK_ERROR, str(e)
+
+    timings["run_seconds"] = time.perf_counter() - started
+    timings["peak_rss_kb"] = get_peak_rss_kb()
+    timings["output"] = output
+    return status, message, timings
+
+
+def _resolve_worker_result(worker_future, future, task_metrics, task_name=None):
+    try:
+        status, message, timings = worker_future.result()
     except Exception as e:
-        return TASK_ERROR, str(e)
\ No newline at end of file
+        future.set_exception(e)
+        return
+    emit_records([(timestamp, task_name, line, error) for timestamp, _, line, error in timings.pop("output", [])])
+    if task_metrics is not None:
+        task_metrics.apply_worker_timings(status, timings)
+    future.set_result((status, message))
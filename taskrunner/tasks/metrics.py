@@ -0,0 +1,206 @@
+import json
+import math
+import sys
+import threading
+import time
+from enum import Enum
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Constants
+REPORT_PERCENTILES = (50, 95, 99)
+REPORT_PRECISION = 6
+
+
+class MetricsMessages(Enum):
+    REPORT_WRITTEN = "Run report written to {}"
+
+
+class TaskMetrics:
+    __slots__ = ("name", "type", "depends_on", "status", "queued_at", "started_at", "finished_at",
+                 "substitution_seconds", "validation_seconds", "run_seconds", "peak_rss_kb", "_run_started")
+
+    def __init__(self, name: str, type_name: str, depends_on: List[str]):
+        self.name = name
+        self.type = type_name
+        self.depends_on = depends_on
+        self.status = None
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.substitution_seconds = 0.0
+        self.validation_seconds = None
+        self.run_seconds = 0.0
+        self.peak_rss_kb = None
+        self._run_started = None
+
+    def mark_started(self):
+        self.started_at = time.time()
+        self._run_started = time.perf_counter()
+
+    def mark_finished(self, status: str):
+        if self._run_started is not None:
+            # Validation happens in the worker right before the run and is reported separately
+            self.run_seconds = time.perf_counter() - self._run_started - (self.validation_seconds or 0.0)
+        self.finished_at = time.time()
+        self.status = status
+        self.peak_rss_kb = get_peak_rss_kb()
+
+    def apply_worker_timings(self, status: str, timings: Dict):
+        # Timings measured inside a worker process; wall-clock stamps are comparable on the same host
+        self.started_at = timings.get("started_at", self.queued_at)
+        self.run_seconds = timings.get("run_seconds", 0.0)
+        self.validation_seconds = timings.get("validation_seconds")
+        self.peak_rss_kb = timings.get("peak_rss_kb")
+        self.finished_at = time.time()
+        self.status = status
+
+    @property
+    def queue_wait_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return max(0.0, self.started_at - self.queued_at)
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.substitution_seconds + (self.validation_seconds or 0.0) + self.run_seconds
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "status": self.status,
+            "queue_wait_seconds": _round(self.queue_wait_seconds),
+            "substitution_seconds": _round(self.substitution_seconds),
+            "validation_seconds": _round(self.validation_seconds),
+            "run_seconds": _round(self.run_seconds),
+            "peak_rss_kb": self.peak_rss_kb,
+        }
+
+
+class RunMetrics:
+    def __init__(self, engine: str):
+        self.engine = engine
+        self.started_at = time.time()
+        self.finished_at = None
+        self._tasks: List[TaskMetrics] = []
+        self._skipped = 0
+        self._lock = threading.Lock()
+
+    def track(self, task) -> TaskMetrics:
+        task_metrics = TaskMetrics(task.name, task.type, list(task.depends_on))
+        with self._lock:
+            self._tasks.append(task_metrics)
+        return task_metrics
+
+    def record_skipped(self):
+        with self._lock:
+            self._skipped += 1
+
+    def finish(self):
+        self.finished_at = time.time()
+
+    def build_report(self) -> Dict:
+        finished_at = self.finished_at or time.time()
+        tasks = [task for task in self._tasks if task.finished_at is not None]
+        critical_path, critical_path_seconds = _find_critical_path(tasks)
+
+        statuses = {}
+        for task in tasks:
+            statuses[task.status] = statuses.get(task.status, 0) + 1
+
+        by_type = {}
+        for task in tasks:
+            by_type.setdefault(task.type, []).append(task)
+
+        return {
+            "engine": self.engine,
+            "wall_seconds": _round(finished_at - self.started_at),
+            "total_tasks": len(tasks) + self._skipped,
+            "statuses": dict(statuses, skipped=self._skipped) if self._skipped else statuses,
+            "peak_rss_kb": get_peak_rss_kb(),
+            "critical_path_seconds": _round(critical_path_seconds),
+            "critical_path": critical_path,
+            "plugins": {type_name: _summarize_plugin(type_tasks) for type_name, type_tasks in sorted(by_type.items())},
+            "tasks": [task.to_dict() for task in tasks],
+        }
+
+    def write_report(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.build_report(), f, indent=2)
+        return MetricsMessages.REPORT_WRITTEN.value.format(path)
+
+
+def get_peak_rss_kb() -> Optional[int]:
+    # Peak resident set size of this process so far; ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    # Linear interpolation between closest ranks
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _summarize_plugin(tasks):
+    summary = {
+        "count": len(tasks),
+        "run_seconds": _distribution([task.run_seconds for task in tasks]),
+        "queue_wait_seconds": _distribution([task.queue_wait_seconds for task in tasks]),
+        "substitution_seconds": _distribution([task.substitution_seconds for task in tasks]),
+    }
+    validation = [task.validation_seconds for task in tasks if task.validation_seconds is not None]
+    if validation:
+        summary["validation_seconds"] = _distribution(validation)
+    return summary
+
+
+def _distribution(values):
+    summary = {f"p{pct}": _round(percentile(values, pct)) for pct in REPORT_PERCENTILES}
+    summary["max"] = _round(max(values)) if values else None
+    summary["total"] = _round(sum(values))
+    return summary
+
+
+def _find_critical_path(tasks):
+    # Longest chain of task durations through depends_on; a dependency always finishes before
+    # its dependents start, so completion order is a valid topological order
+    longest = {}
+    previous = {}
+    for task in sorted(tasks, key=lambda t: t.finished_at):
+        best_dependency = None
+        best_length = 0.0
+        for dependency in task.depends_on:
+            if dependency in longest and longest[dependency] > best_length:
+                best_dependency, best_length = dependency, longest[dependency]
+        longest[task.name] = best_length + task.duration_seconds
+        previous[task.name] = best_dependency
+
+    if not longest:
+        return [], 0.0
+
+    end = max(longest, key=longest.get)
+    path = []
+    current = end
+    while current is not None:
+        path.append(current)
+        current = previous[current]
+    return list(reversed(path)), longest[end]
+
+
+def _round(value):
+    return None if value is None else round(value, REPORT_PRECISION)
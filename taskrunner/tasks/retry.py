@@ -0,0 +1,87 @@
+import contextlib
+import contextvars
+import random
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Optional
+from enum import Enum
+
+from ..utils.output import emit
+
+# Constants
+DEFAULT_RETRIES = 0
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+
+class RetryMessages(Enum):
+    TASK_TIMED_OUT = "Timed out after {}s"
+    RETRYING = "[{}] Task '{}' failed (attempt {}/{}): {}; retrying in {:.2f}s"
+
+
+class TaskTimeoutError(Exception):
+    pass
+
+
+# Time limit of the task running in the current thread or asyncio task
+_task_timeout = contextvars.ContextVar("taskrunner_task_timeout", default=None)
+
+
+def current_task_timeout() -> Optional[float]:
+    # For plugins that bound their own calls by the task's timeout (BaseTaskRunner.enforces_timeout)
+    return _task_timeout.get()
+
+
+@contextlib.contextmanager
+def task_time_limit(timeout: Optional[float]):
+    token = _task_timeout.set(timeout)
+    try:
+        yield
+    finally:
+        _task_timeout.reset(token)
+
+
+def retry_limit(task) -> int:
+    return task.retries if task.retries is not None else DEFAULT_RETRIES
+
+
+def should_retry(task, attempt: int, abandoned: bool = False) -> bool:
+    # An attempt abandoned by its timeout may still be running, and a retry would run alongside it.
+    # Attempts of plugins that enforce the timeout themselves end on their own and are not abandoned.
+    return attempt < retry_limit(task) and not abandoned
+
+
+def backoff_delay(task, attempt: int) -> float:
+    # Exponential backoff with full jitter so retries of many failed tasks don't arrive in lockstep
+    base = task.backoff if task.backoff is not None else DEFAULT_BACKOFF
+    return random.uniform(0, min(MAX_BACKOFF, base * (2 ** attempt)))
+
+
+def call_with_timeout(func, timeout: Optional[float], *args):
+    if timeout is None:
+        return func(*args)
+
+    # Threads cannot be killed, so the call runs on a helper thread and the caller stops waiting
+    # when the timeout expires; the worker slot is freed even if the plugin never returns, but the
+    # call itself carries on in the background, which is why such attempts are not retried
+    outcome = Future()
+    # The helper thread sees the caller's context, so the task's output capture follows the call
+    context = contextvars.copy_context()
+    context.run(_task_timeout.set, timeout)
+
+    def target():
+        try:
+            outcome.set_result(context.run(func, *args))
+        except BaseException as e:
+            outcome.set_exception(e)
+
+    threading.Thread(target=target, daemon=True, name="taskrunner-timeout").start()
+    try:
+        return outcome.result(timeout=timeout)
+    except FutureTimeoutError:
+        raise TaskTimeoutError(RetryMessages.TASK_TIMED_OUT.value.format(timeout)) from None
+
+
+def report_retry(tag: str, task, attempt: int, message, delay: float):
+    emit(RetryMessages.RETRYING.value.format(tag, task.name, attempt, retry_limit(task) + 1, message, delay),
+         task.name)
@@ -0,0 +1,254 @@
+import heapq
+import itertools
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from enum import Enum
+
+from ..models.task_model import TaskModel
+
+
+class SchedulerMessages(Enum):
+    UNKNOWN_DEPENDENCY = "Task '{}' depends on unknown task '{}'"
+    SELF_DEPENDENCY = "Task '{}' cannot depend on itself"
+    DEPENDENCY_CYCLE = "Dependency cycle detected: {}"
+    INVALID_TYPE_LIMIT = "Concurrency limit for '{}' must be at least 1"
+    INVALID_TYPE_WEIGHT = "Weight for '{}' must be greater than 0"
+    INVALID_BATCH_SIZE = "Batch size for '{}' must be at least 1"
+
+# Constants
+DEFAULT_TYPE_WEIGHT = 1.0
+
+
+def validate_dependencies(tasks: List[TaskModel]):
+    task_names = {task.name for task in tasks}
+    for task in tasks:
+        for dependency in task.depends_on:
+            if dependency == task.name:
+                raise ValueError(SchedulerMessages.SELF_DEPENDENCY.value.format(task.name))
+            if dependency not in task_names:
+                raise ValueError(SchedulerMessages.UNKNOWN_DEPENDENCY.value.format(task.name, dependency))
+
+    cycle = find_dependency_cycle(tasks)
+    if cycle:
+        raise ValueError(SchedulerMessages.DEPENDENCY_CYCLE.value.format(" -> ".join(cycle)))
+
+
+def find_dependency_cycle(tasks: List[TaskModel]) -> Optional[List[str]]:
+    dependencies = _build_dependency_map(tasks)
+
+    # Iterative depth-first search so deep chains don't hit the recursion limit
+    visiting, visited = set(), set()
+    for root in dependencies:
+        if root in visited:
+            continue
+        path = [root]
+        stack = [iter(dependencies[root])]
+        visiting.add(root)
+        while stack:
+            dependency = next(stack[-1], None)
+            if dependency is None:
+                stack.pop()
+                finished = path.pop()
+                visiting.discard(finished)
+                visited.add(finished)
+            elif dependency in visiting:
+                return path[path.index(dependency):] + [dependency]
+            elif dependency not in visited:
+                path.append(dependency)
+                stack.append(iter(dependencies[dependency]))
+                visiting.add(dependency)
+    return None
+
+
+def topological_order(tasks: List[TaskModel]) -> List[TaskModel]:
+    # Among ready tasks the highest priority goes first, then the one that became ready first
+    tracker = DependencyTracker(tasks)
+    ordered = []
+    sequence = itertools.count()
+    ready = [(-task.priority, next(sequence), task) for task in tracker.ready()]
+    heapq.heapify(ready)
+    while ready:
+        task = heapq.heappop(ready)[2]
+        ordered.append(task)
+        for ready_task in tracker.mark_done(task.name):
+            heapq.heappush(ready, (-ready_task.priority, next(sequence), ready_task))
+
+    if len(ordered) != len(tasks):
+        cycle = find_dependency_cycle(tasks)
+        raise ValueError(SchedulerMessages.DEPENDENCY_CYCLE.value.format(" -> ".join(cycle or [])))
+    return ordered
+
+
+class DependencyTracker:
+    # Dependencies on tasks outside the given list (e.g. filtered out by --only) are treated as satisfied
+    def __init__(self, tasks: Iterable[TaskModel] = ()):
+        self._waiting: Dict[str, TaskModel] = {}
+        self._remaining: Dict[str, Dict[str, None]] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        self._pending = set()
+        self._failed = set()
+
+        tasks = list(tasks)
+        task_names = {task.name for task in tasks}
+        for task in tasks:
+            self._pending.add(task.name)
+            self._register(task, [dependency for dependency in task.depends_on if dependency in task_names])
+
+    def ready(self) -> List[TaskModel]:
+        ready_names = [name for name, remaining in self._remaining.items() if not remaining]
+        return [self._release(name) for name in ready_names]
+
+    def add(self, task: TaskModel) -> Tuple[bool, Optional[str]]:
+        # Streaming counterpart of the constructor; returns (ready, failed dependency).
+        # Dependencies that are neither pending nor failed have already finished (or were never selected).
+        for dependency in task.depends_on:
+            if dependency in self._failed:
+                self._failed.add(task.name)
+                return False, dependency
+
+        self._pending.add(task.name)
+        self._register(task, [dependency for dependency in task.depends_on if dependency in self._pending])
+        if self._remaining[task.name]:
+            return False, None
+        self._release(task.name)
+        return True, None
+
+    def mark_done(self, name: str) -> List[TaskModel]:
+        self._pending.discard(name)
+        newly_ready = []
+        for dependent in self._dependents.pop(name, []):
+            remaining = self._remaining.get(dependent)
+            if remaining is None:
+                continue
+            remaining.pop(name, None)
+            if not remaining:
+                newly_ready.append(self._release(dependent))
+        return newly_ready
+
+    def mark_failed(self, name: str) -> List[str]:
+        # Returns every transitive dependent of the failed task, in discovery order
+        self._pending.discard(name)
+        self._failed.add(name)
+        skipped = []
+        dependents = deque(self._dependents.pop(name, []))
+        while dependents:
+            dependent = dependents.popleft()
+            if dependent not in self._waiting:
+                continue
+            del self._waiting[dependent]
+            del self._remaining[dependent]
+            self._pending.discard(dependent)
+            self._failed.add(dependent)
+            skipped.append(dependent)
+            dependents.extend(self._dependents.pop(dependent, []))
+        return skipped
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def _register(self, task, dependencies):
+        self._waiting[task.name] = task
+        self._remaining[task.name] = dict.fromkeys(dependencies)
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, []).append(task.name)
+
+    def _release(self, name):
+        # Released tasks stay pending until they are marked done or failed
+        del self._remaining[name]
+        return self._waiting.pop(name)
+
+
+def has_dependencies(tasks: List[TaskModel]) -> bool:
+    return any(task.depends_on for task in tasks)
+
+
+def has_priorities(tasks: List[TaskModel]) -> bool:
+    return any(task.priority for task in tasks)
+
+
+def validate_type_settings(type_limits: Optional[Dict[str, int]] = None,
+                           type_weights: Optional[Dict[str, float]] = None,
+                           batch_sizes: Optional[Dict[str, int]] = None):
+    for type_name, limit in (type_limits or {}).items():
+        if limit < 1:
+            raise ValueError(SchedulerMessages.INVALID_TYPE_LIMIT.value.format(type_name))
+    for type_name, weight in (type_weights or {}).items():
+        if weight <= 0:
+            raise ValueError(SchedulerMessages.INVALID_TYPE_WEIGHT.value.format(type_name))
+    for type_name, size in (batch_sizes or {}).items():
+        if size < 1:
+            raise ValueError(SchedulerMessages.INVALID_BATCH_SIZE.value.format(type_name))
+
+
+class FairTaskQueue:
+    # Ready tasks waiting for a worker. The highest priority goes first; among equal priorities the
+    # type with the fewest in-flight tasks relative to its weight goes next, so one large batch of a
+    # single type cannot starve the others. Types at their concurrency limit are passed over.
+    def __init__(self, type_limits: Optional[Dict[str, int]] = None,
+                 type_weights: Optional[Dict[str, float]] = None):
+        validate_type_settings(type_limits, type_weights)
+        self._limits = dict(type_limits or {})
+        self._weights = dict(type_weights or {})
+        self._queues: Dict[str, list] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, task: TaskModel):
+        heapq.heappush(self._queues.setdefault(task.type, []), (-task.priority, next(self._sequence), task))
+        self._size += 1
+
+    def pop(self) -> Optional[TaskModel]:
+        # Linear in the number of task types with waiting tasks, which stays small
+        best_type, best_key = None, None
+        for type_name, waiting in self._queues.items():
+            in_flight = self._in_flight.get(type_name, 0)
+            limit = self._limits.get(type_name)
+            if limit is not None and in_flight >= limit:
+                continue
+            negative_priority, sequence, _ = waiting[0]
+            key = (negative_priority, in_flight / self._weights.get(type_name, DEFAULT_TYPE_WEIGHT), sequence)
+            if best_key is None or key < best_key:
+                best_type, best_key = type_name, key
+
+        if best_type is None:
+            return None
+        waiting = self._queues[best_type]
+        task = heapq.heappop(waiting)[2]
+        if not waiting:
+            del self._queues[best_type]
+        self._in_flight[best_type] = self._in_flight.get(best_type, 0) + 1
+        self._size -= 1
+        return task
+
+    def pop_more(self, type_name: str, count: int, accept: Callable[[TaskModel], bool]) -> List[TaskModel]:
+        # Up to count more waiting tasks of a type, to run together with one just popped (e.g. in one
+        # plugin batch) and share its in-flight slot. Tasks accept() turns down keep their place.
+        waiting = self._queues.get(type_name)
+        tasks, passed_over = [], []
+        while waiting and len(tasks) < count:
+            entry = heapq.heappop(waiting)
+            if accept(entry[2]):
+                tasks.append(entry[2])
+            else:
+                passed_over.append(entry)
+        for entry in passed_over:
+            heapq.heappush(waiting, entry)
+        if waiting is not None and not waiting:
+            del self._queues[type_name]
+        self._size -= len(tasks)
+        return tasks
+
+    def release(self, type_name: str):
+        self._in_flight[type_name] -= 1
+
+
+def _build_dependency_map(tasks):
+    task_names = {task.name for task in tasks}
+    # Dicts double as insertion-ordered sets so traversal order follows the task file
+    return {task.name: dict.fromkeys(dependency for dependency in task.depends_on if dependency in task_names)
+            for task in tasks}
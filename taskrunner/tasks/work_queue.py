@@ -0,0 +1,396 @@
+import itertools
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Tuple
+from enum import Enum
+
+from ..models.task_model import TaskModel
+from ..utils.plugin_discovery import discover_plugins_lazily
+from .executor import (
+    TASK_SUCCESS,
+    TASK_ERROR,
+    format_task_tag,
+    _execute_single_task,
+    _log_task_execution,
+    _report_skipped_task
+)
+from .scheduler import DependencyTracker
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_QUEUE_ADDRESS = "127.0.0.1:8765"
+DEFAULT_LEASE_TIMEOUT = 30.0
+DEFAULT_MAX_LEASE_ATTEMPTS = 3
+DEFAULT_CONNECT_TIMEOUT = 10.0
+HEARTBEATS_PER_LEASE = 3
+IDLE_POLL_SECONDS = 0.2
+CONNECT_RETRY_SECONDS = 0.1
+
+
+class QueueOps(str, Enum):
+    HELLO = "hello"
+    WELCOME = "welcome"
+    LEASE = "lease"
+    TASK = "task"
+    WAIT = "wait"
+    DONE = "done"
+    HEARTBEAT = "heartbeat"
+    RESULT = "result"
+    OK = "ok"
+    ERROR = "error"
+
+
+class WorkQueueMessages(Enum):
+    SERVING = "Serving {} tasks on {}:{}"
+    LEASED = "[{}] Task '{}' leased to worker {}"
+    COMPLETED = "[{}] Task '{}' completed successfully on worker {}"
+    FAILED = "[{}] Task '{}' failed on worker {}: {}"
+    LEASE_EXPIRED = "[{}] Lease on task '{}' expired (worker {}); requeueing"
+    WORKER_LOST = "[{}] Worker {} disconnected while running task '{}'; requeueing"
+    TOO_MANY_LEASES = "Task was leased {} times without a result"
+    SUMMARY = "Finished {} tasks: {} succeeded, {} failed"
+    WORKER_CONNECTED = "Worker connected to {} as {}"
+    WORKER_FINISHED = "Worker {} finished after running {} task(s)"
+    COORDINATOR_GONE = "Coordinator at {} closed the connection"
+    CONNECT_FAILED = "Could not connect to coordinator at {}: {}"
+    INVALID_ADDRESS = "Invalid address '{}', expected host:port"
+    UNKNOWN_OP = "Unknown operation '{}'"
+    INVALID_REQUEST = "Invalid request: {}"
+    INVALID_FIELD = "Invalid request: '{}' needs '{}' to be {}"
+    CONNECTION_ENDED = "Connection from {} ended: {}"
+    UNKNOWN_WORKER_TASK_TYPE = "Unknown task type '{}' on this worker"
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, separator, port = address.rpartition(":")
+    if not separator or not host or not port.isdigit():
+        raise ValueError(WorkQueueMessages.INVALID_ADDRESS.value.format(address))
+    return host, int(port)
+
+
+class _Lease:
+    __slots__ = ("task", "worker", "expires_at")
+
+    def __init__(self, task, worker, expires_at):
+        self.task = task
+        self.worker = worker
+        self.expires_at = expires_at
+
+
+class WorkQueue:
+    # Coordinator state; every method is called from connection threads and takes the lock
+    def __init__(self, tasks: List[TaskModel], lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+                 max_attempts: int = DEFAULT_MAX_LEASE_ATTEMPTS):
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.succeeded = []
+        self.failed = []
+        self._tracker = DependencyTracker(tasks)
+        self._ready = deque(self._tracker.ready())
+        self._leases: Dict[int, _Lease] = {}
+        self._attempts: Dict[str, int] = {}
+        self._lease_ids = itertools.count(1)
+        self._worker_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._check_finished()
+
+    @property
+    def heartbeat_interval(self) -> float:
+        return self.lease_timeout / HEARTBEATS_PER_LEASE
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def register_worker(self, name: str) -> str:
+        # Names are only hints (several workers may share a host and pid), so each gets a unique suffix
+        return f"{name}#{next(self._worker_ids)}"
+
+    def lease(self, worker: str) -> Optional[Tuple[int, TaskModel]]:
+        with self._lock:
+            self._expire_leases()
+            if not self._ready:
+                return None
+            task = self._ready.popleft()
+            lease_id = next(self._lease_ids)
+            self._leases[lease_id] = _Lease(task, worker, time.monotonic() + self.lease_timeout)
+            self._attempts[task.name] = self._attempts.get(task.name, 0) + 1
+            print(WorkQueueMessages.LEASED.value.format(format_task_tag(task.name), task.name, worker))
+            return lease_id, task
+
+    def heartbeat(self, lease_id: int) -> bool:
+        with self._lock:
+            lease = self._leases.get(lease_id)
+            if lease is None:
+                return False
+            lease.expires_at = time.monotonic() + self.lease_timeout
+            return True
+
+    def complete(self, lease_id: int, status: str, message: Optional[str] = None) -> bool:
+        # Results for leases that already expired are dropped; the task was handed to another worker
+        with self._lock:
+            lease = self._leases.pop(lease_id, None)
+            if lease is None:
+                return False
+            task = lease.task
+            tag = format_task_tag(task.name)
+            if status == TASK_SUCCESS:
+                print(WorkQueueMessages.COMPLETED.value.format(tag, task.name, lease.worker))
+                self.succeeded.append(task.name)
+                self._ready.extend(self._tracker.mark_done(task.name))
+            else:
+                print(WorkQueueMessages.FAILED.value.format(tag, task.name, lease.worker, message))
+                self._fail(task.name)
+            self._check_finished()
+            return True
+
+    def release_worker(self, worker: str):
+        # A dropped connection means the worker is gone; its tasks are requeued without waiting for expiry
+        with self._lock:
+            for lease_id, lease in list(self._leases.items()):
+                if lease.worker == worker:
+                    del self._leases[lease_id]
+                    print(WorkQueueMessages.WORKER_LOST.value.format(format_task_tag(lease.task.name), worker,
+                                                                     lease.task.name))
+                    self._requeue(lease.task)
+            self._check_finished()
+
+    def expire_leases(self):
+        with self._lock:
+            self._expire_leases()
+            self._check_finished()
+
+    def summary(self) -> str:
+        total = len(self.succeeded) + len(self.failed)
+        return WorkQueueMessages.SUMMARY.value.format(total, len(self.succeeded), len(self.failed))
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        for lease_id, lease in list(self._leases.items()):
+            if lease.expires_at <= now:
+                del self._leases[lease_id]
+                print(WorkQueueMessages.LEASE_EXPIRED.value.format(format_task_tag(lease.task.name),
+                                                                   lease.task.name, lease.worker))
+                self._requeue(lease.task)
+
+    def _requeue(self, task):
+        if self._attempts.get(task.name, 0) >= self.max_attempts:
+            message = WorkQueueMessages.TOO_MANY_LEASES.value.format(self._attempts[task.name])
+            print(WorkQueueMessages.FAILED.value.format(format_task_tag(task.name), task.name, "-", message))
+            self._fail(task.name)
+        else:
+            self._ready.appendleft(task)
+
+    def _fail(self, name):
+        self.failed.append(name)
+        for skipped_name in self._tracker.mark_failed(name):
+            _report_skipped_task(skipped_name, name)
+
+    def _check_finished(self):
+        if not self._tracker.has_pending:
+            self._finished.set()
+
+
+class _QueueRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        work_queue = self.server.work_queue
+        worker = None
+        try:
+            for line in self.rfile:
+                request, error = _parse_request(line)
+                op = request.get("op")
+                if error is not None:
+                    reply = {"op": QueueOps.ERROR.value, "message": error}
+                elif op == QueueOps.HELLO.value:
+                    worker = work_queue.register_worker(f"{request.get('worker', 'worker')}@{self.client_address[0]}")
+                    reply = {"op": QueueOps.WELCOME.value, "worker": worker,
+                             "heartbeat_interval": work_queue.heartbeat_interval}
+                elif op == QueueOps.LEASE.value:
+                    reply = self._lease(work_queue, worker)
+                elif op == QueueOps.HEARTBEAT.value:
+                    reply = {"op": QueueOps.OK.value, "valid": work_queue.heartbeat(request["lease"])}
+                elif op == QueueOps.RESULT.value:
+                    accepted = work_queue.complete(request["lease"], request["status"], request.get("message"))
+                    reply = {"op": QueueOps.OK.value, "valid": accepted}
+                else:
+                    reply = {"op": QueueOps.ERROR.value, "message": WorkQueueMessages.UNKNOWN_OP.value.format(op)}
+                self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+        except (ConnectionError, OSError, ValueError) as e:
+            logger.debug(WorkQueueMessages.CONNECTION_ENDED.value.format(self.client_address, e))
+        finally:
+            if worker is not None:
+                work_queue.release_worker(worker)
+
+    @staticmethod
+    def _lease(work_queue, worker):
+        leased = work_queue.lease(worker)
+        if leased is not None:
+            lease_id, task = leased
+            return {"op": QueueOps.TASK.value, "lease": lease_id, "task": task.dict()}
+        if work_queue.finished:
+            return {"op": QueueOps.DONE.value}
+        return {"op": QueueOps.WAIT.value, "seconds": IDLE_POLL_SECONDS}
+
+
+# Fields each operation reads, checked before the request is handled
+_REQUIRED_FIELDS = {
+    QueueOps.HEARTBEAT.value: (("lease", int, "an integer"),),
+    QueueOps.RESULT.value: (("lease", int, "an integer"), ("status", str, "a string")),
+}
+
+
+def _parse_request(line) -> Tuple[Dict, Optional[str]]:
+    # A malformed request gets an error reply; the connection stays open for the next one
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        return {}, WorkQueueMessages.INVALID_REQUEST.value.format(e)
+    if not isinstance(request, dict):
+        return {}, WorkQueueMessages.INVALID_REQUEST.value.format("expected a JSON object")
+    for field, kind, description in _REQUIRED_FIELDS.get(request.get("op"), ()):
+        value = request.get(field)
+        if not isinstance(value, kind) or isinstance(value, bool):
+            return request, WorkQueueMessages.INVALID_FIELD.value.format(request["op"], field, description)
+    return request, None
+
+
+class _QueueServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, server_address, work_queue):
+        self.work_queue = work_queue
+        super().__init__(server_address, _QueueRequestHandler)
+
+
+def serve_queue(tasks: List[TaskModel], address: str = DEFAULT_QUEUE_ADDRESS,
+                lease_timeout: float = DEFAULT_LEASE_TIMEOUT, max_attempts: int = DEFAULT_MAX_LEASE_ATTEMPTS,
+                on_ready=None) -> WorkQueue:
+    work_queue = WorkQueue(tasks, lease_timeout, max_attempts)
+    with _QueueServer(parse_address(address), work_queue) as server:
+        host, port = server.server_address[:2]
+        print(WorkQueueMessages.SERVING.value.format(len(tasks), host, port))
+        if on_ready is not None:
+            on_ready((host, port))
+
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True, name="taskrunner-queue")
+        server_thread.start()
+        try:
+            # Leases are also checked on every request; this catches hung workers while everyone else is idle
+            while not work_queue.wait(min(work_queue.heartbeat_interval, 1.0)):
+                work_queue.expire_leases()
+            # Give idle workers one poll interval to hear that the queue is done
+            time.sleep(IDLE_POLL_SECONDS)
+        finally:
+            server.shutdown()
+            server_thread.join()
+
+    print(work_queue.summary())
+    return work_queue
+
+
+class _QueueConnection:
+    def __init__(self, address: str, connect_timeout: float):
+        self.address = address
+        host, port = parse_address(address)
+        deadline = time.monotonic() + connect_timeout
+        while True:
+            try:
+                self._socket = socket.create_connection((host, port), timeout=connect_timeout)
+                break
+            except OSError as e:
+                # The coordinator may still be starting up
+                if time.monotonic() >= deadline:
+                    raise ConnectionError(WorkQueueMessages.CONNECT_FAILED.value.format(address, e)) from None
+                time.sleep(CONNECT_RETRY_SECONDS)
+        self._socket.settimeout(None)
+        self._reader = self._socket.makefile("r", encoding="utf-8")
+
+    def request(self, message: Dict) -> Dict:
+        self._socket.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError(WorkQueueMessages.COORDINATOR_GONE.value.format(self.address))
+        return json.loads(line)
+
+    def close(self):
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def run_worker(address: str = DEFAULT_QUEUE_ADDRESS, plugins=None, plugin_prefix: Optional[str] = None,
+               verbose: bool = False, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT) -> int:
+    if plugins is None:
+        plugins = discover_plugins_lazily(package_prefix=plugin_prefix)
+
+    tasks_run = 0
+    with _QueueConnection(address, connect_timeout) as connection, \
+            ThreadPoolExecutor(max_workers=1) as executor:
+        welcome = connection.request({"op": QueueOps.HELLO.value, "worker": f"{socket.gethostname()}-{os.getpid()}"})
+        worker = welcome["worker"]
+        heartbeat_interval = welcome["heartbeat_interval"]
+        print(WorkQueueMessages.WORKER_CONNECTED.value.format(address, worker))
+
+        try:
+            while True:
+                reply = connection.request({"op": QueueOps.LEASE.value})
+                if reply["op"] == QueueOps.DONE.value:
+                    break
+                if reply["op"] == QueueOps.WAIT.value:
+                    time.sleep(reply["seconds"])
+                    continue
+
+                # The task runs on a helper thread so this thread can keep the lease alive
+                lease_id = reply["lease"]
+                future = executor.submit(_run_leased_task, TaskModel(**reply["task"]), plugins, verbose)
+                while True:
+                    try:
+                        status, message = future.result(timeout=heartbeat_interval)
+                        break
+                    except FutureTimeoutError:
+                        connection.request({"op": QueueOps.HEARTBEAT.value, "lease": lease_id})
+
+                connection.request({"op": QueueOps.RESULT.value, "lease": lease_id, "status": status,
+                                    "message": message})
+                tasks_run += 1
+        except ConnectionError as e:
+            # The coordinator shuts down once every task has finished
+            logger.debug(str(e))
+
+    print(WorkQueueMessages.WORKER_FINISHED.value.format(worker, tasks_run))
+    return tasks_run
+
+
+def _run_leased_task(task, plugins, verbose):
+    if task.type not in plugins:
+        return TASK_ERROR, WorkQueueMessages.UNKNOWN_WORKER_TASK_TYPE.value.format(task.type)
+
+    try:
+        runner = plugins[task.type]()
+        # Env placeholders are substituted with the worker's environment
+        config = task.config_template().render()
+        _log_task_execution(task, config, verbose)
+        # Retries and timeouts from the task file are applied here, on the worker
+        _execute_single_task(runner, task, config)
+        return TASK_SUCCESS, None
+    except Exception as e:
+        return TASK_ERROR, str(e)
@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict
+from enum import Enum
+
+from .result_cache import compute_task_hash
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_FLUSH_BATCH_SIZE = 512
+
+
+class CheckpointMessages(Enum):
+    RESUMING = "Resuming from {}: skipping {} task(s) that already succeeded"
+    CORRUPT_ENTRY = "Ignoring unreadable checkpoint entry on line {} of {}"
+
+
+def checkpoint_hash(task) -> str:
+    # Same identity as the result cache: type plus the config after env substitution
+    return compute_task_hash(task.type, task.config_template().render())
+
+
+def load_checkpoint(path: str) -> Dict[str, str]:
+    completed = {}
+    if not os.path.exists(path):
+        return completed
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                completed[entry["name"]] = entry["hash"]
+            except (ValueError, KeyError, TypeError):
+                # A run killed mid-write can leave a truncated last line
+                logger.warning(CheckpointMessages.CORRUPT_ENTRY.value.format(line_number, path))
+    return completed
+
+
+def is_checkpointed(task, completed: Dict[str, str]) -> bool:
+    expected = completed.get(task.name)
+    return expected is not None and expected == checkpoint_hash(task)
+
+
+class CheckpointJournal:
+    # Append-only; a background thread writes and fsyncs entries in batches so recording a
+    # completed task never waits on the disk
+    def __init__(self, path: str, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 batch_size: int = DEFAULT_FLUSH_BATCH_SIZE):
+        self.path = path
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._file = open(path, "a", encoding="utf-8")
+        self._pending = []
+        self._closed = False
+        self._condition = threading.Condition()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="taskrunner-checkpoint")
+        self._flusher.start()
+
+    def record(self, task):
+        line = json.dumps({"name": task.name, "hash": checkpoint_hash(task)}) + "\n"
+        with self._condition:
+            self._pending.append(line)
+            if len(self._pending) >= self._batch_size:
+                self._condition.notify()
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._flusher.join()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _flush_loop(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed or len(self._pending) >= self._batch_size,
+                                         timeout=self._flush_interval)
+                lines, self._pending = self._pending, []
+                closed = self._closed
+
+            if lines:
+                self._file.writelines(lines)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            if closed:
+                return
@@ -0,0 +1,195 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from enum import Enum
+
+from ..models.task_model import TaskModel
+from ..models.task_record import TaskRecord, TaskStore
+
+# Layout of a .trc file (all integers little-endian):
+#   header   magic, version, task and config counts, and the offsets of the three tables
+#   records  one compact JSON object per task without its config, in file order
+#   configs  each distinct config once, as compact JSON
+#   names    the UTF-8 task names, in file order
+#   index    per task: record offset and length, name offset and length, config number
+#   configs  per config: offset and length
+#   order    task numbers sorted by name, for binary search by name
+COMPILED_MAGIC = b"TRC1"
+COMPILED_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIQQQ")
+_INDEX_ENTRY = struct.Struct("<QIQII")
+_CONFIG_ENTRY = struct.Struct("<QI")
+_ORDER_ENTRY = struct.Struct("<I")
+_JSON_SEPARATORS = (",", ":")
+_DEFAULT_EMPTY_FIELDS = ("depends_on", "priority", "tags")
+
+
+class CompiledTaskMessages(Enum):
+    NOT_COMPILED = "{} is not a compiled task file"
+    UNSUPPORTED_VERSION = "{} was compiled by an incompatible version (format {}); recompile it"
+    COMPILED = "Compiled {} task(s) into {}"
+
+
+def write_compiled_tasks(tasks: Iterable, output_path: str) -> int:
+    # Tasks must already be validated: the loader trusts compiled files and skips validation
+    records, names, index = bytearray(), bytearray(), []
+    config_numbers, config_blobs = {}, []
+    for task in tasks:
+        entry = _compact_entry(task.dict())
+        config = json.dumps(entry.pop("config"), separators=_JSON_SEPARATORS).encode("utf-8")
+        config_number = config_numbers.setdefault(config, len(config_numbers))
+        if config_number == len(config_blobs):
+            config_blobs.append(config)
+
+        record = json.dumps(entry, separators=_JSON_SEPARATORS).encode("utf-8")
+        name = task.name.encode("utf-8")
+        index.append((name, len(records), len(record), len(names), len(name), config_number))
+        records += record
+        names += name
+
+    configs_offset = _HEADER.size + len(records)
+    names_offset = configs_offset + sum(len(config) for config in config_blobs)
+    index_offset = names_offset + len(names)
+    config_index_offset = index_offset + len(index) * _INDEX_ENTRY.size
+    order_offset = config_index_offset + len(config_blobs) * _CONFIG_ENTRY.size
+    order = sorted(range(len(index)), key=lambda position: index[position][0])
+
+    temp_path = output_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, 0, len(index), len(config_blobs), index_offset,
+                             config_index_offset, order_offset))
+        f.write(records)
+        f.writelines(config_blobs)
+        f.write(names)
+        for _, record_offset, record_length, name_offset, name_length, config_number in index:
+            f.write(_INDEX_ENTRY.pack(_HEADER.size + record_offset, record_length, names_offset + name_offset,
+                                      name_length, config_number))
+        config_offset = configs_offset
+        for config in config_blobs:
+            f.write(_CONFIG_ENTRY.pack(config_offset, len(config)))
+            config_offset += len(config)
+        for position in order:
+            f.write(_ORDER_ENTRY.pack(position))
+    # Replaced in one step so a running loader never sees a half-written file
+    os.replace(temp_path, output_path)
+    return len(index)
+
+
+def _compact_entry(entry: Dict) -> Dict:
+    # Leave out what TaskModel fills in by default anyway
+    return {key: value for key, value in entry.items()
+            if value is not None and not (key in _DEFAULT_EMPTY_FIELDS and not value)}
+
+
+class CompiledTaskFile:
+    # Memory-mapped .trc file; tasks are decoded only when asked for
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(CompiledTaskMessages.NOT_COMPILED.value.format(path))
+        (magic, version, _, self._count, self._config_count, self._index_offset, self._config_index_offset,
+         self._order_offset) = _HEADER.unpack_from(self._map)
+        if magic != COMPILED_MAGIC:
+            self.close()
+            raise ValueError(CompiledTaskMessages.NOT_COMPILED.value.format(path))
+        if version != COMPILED_VERSION:
+            self.close()
+            raise ValueError(CompiledTaskMessages.UNSUPPORTED_VERSION.value.format(path, version))
+        # Each distinct config is decoded once and shared by every task that uses it
+        self._configs = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[TaskModel]:
+        for position in range(self._count):
+            yield self.task(position)
+
+    def task(self, position: int) -> TaskModel:
+        return self.task_with_config_number(position)[0]
+
+    def task_with_config_number(self, position: int) -> Tuple[TaskModel, int]:
+        record_offset, record_length, _, _, config_number = self._index_entry(position)
+        entry = json.loads(self._map[record_offset:record_offset + record_length])
+        entry["config"] = self._config(config_number)
+        # Validated when the file was compiled
+        return TaskModel.construct(**entry), config_number
+
+    def name(self, position: int) -> str:
+        return self._raw_name(position).decode("utf-8")
+
+    def names(self) -> List[str]:
+        return [self.name(position) for position in range(self._count)]
+
+    def find(self, name: str) -> Optional[TaskModel]:
+        # Binary search over the name order; only the matching record is decoded
+        target = name.encode("utf-8")
+        order = _SortedNames(self)
+        position = bisect.bisect_left(order, target)
+        if position < self._count and order[position] == target:
+            return self.task(self._order(position))
+        return None
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _index_entry(self, position: int):
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        return _INDEX_ENTRY.unpack_from(self._map, self._index_offset + position * _INDEX_ENTRY.size)
+
+    def _config(self, config_number: int) -> Dict:
+        config = self._configs.get(config_number)
+        if config is None:
+            offset, length = _CONFIG_ENTRY.unpack_from(self._map, self._config_index_offset +
+                                                       config_number * _CONFIG_ENTRY.size)
+            config = self._configs[config_number] = json.loads(self._map[offset:offset + length])
+        return config
+
+    def _order(self, position: int) -> int:
+        return _ORDER_ENTRY.unpack_from(self._map, self._order_offset + position * _ORDER_ENTRY.size)[0]
+
+    def _raw_name(self, position: int) -> bytes:
+        _, _, name_offset, name_length, _ = self._index_entry(position)
+        return self._map[name_offset:name_offset + name_length]
+
+
+class _SortedNames:
+    # Sequence view of the names in sorted order, so bisect can search the file in place
+    def __init__(self, compiled: CompiledTaskFile):
+        self._compiled = compiled
+
+    def __len__(self):
+        return len(self._compiled)
+
+    def __getitem__(self, position):
+        return self._compiled._raw_name(self._compiled._order(position))
+
+
+def iter_compiled_tasks(path: str) -> Iterator[TaskModel]:
+    with CompiledTaskFile(path) as compiled:
+        yield from compiled
+
+
+def load_compiled_records(path: str, store: TaskStore) -> List[TaskRecord]:
+    # Tasks sharing a config in the file share one config and template as records, without
+    # hash-consing every task again
+    with CompiledTaskFile(path) as compiled:
+        return [store.add(*compiled.task_with_config_number(position)) for position in range(len(compiled))]
+
+
+def find_compiled_task(path: str, name: str) -> Optional[TaskModel]:
+    with CompiledTaskFile(path) as compiled:
+        return compiled.find(name)
@@ -0,0 +1,80 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Type
+from enum import Enum
+
+from pydantic import BaseModel
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_MAX_CACHED_CONFIGS = 4096
+
+
+class ConfigValidationMessages(Enum):
+    INVALID_TASK_CONFIG = "Invalid config for task '{}': {}"
+    INVALID_TASK_CONFIGS = "Invalid task configs:\n{}"
+
+
+class ValidatedConfigCache:
+    # Identical configs (by content) share one validated model, so each distinct config is validated once
+    def __init__(self, max_entries: int = DEFAULT_MAX_CACHED_CONFIGS):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def validate(self, config_model: Type[BaseModel], config: Dict) -> BaseModel:
+        if isinstance(config, config_model):
+            return config
+
+        key = _config_key(config_model, config)
+        if key is not None:
+            with self._lock:
+                validated = self._entries.get(key)
+                if validated is not None:
+                    self._entries.move_to_end(key)
+                    return validated
+
+        validated = config_model(**config)
+        if key is not None:
+            with self._lock:
+                self._entries[key] = validated
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return validated
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _config_key(config_model, config) -> Optional[tuple]:
+    try:
+        return config_model, json.dumps(config, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        # Configs that cannot be serialised are simply validated every time
+        return None
+
+
+_validated_configs = ValidatedConfigCache()
+
+
+def validate_plugin_config(config_model: Type[BaseModel], config: Dict) -> BaseModel:
+    return _validated_configs.validate(config_model, config)
+
+
+def validate_task_configs(tasks, plugins):
+    # Renders and validates every config before anything runs; all errors are reported together
+    errors = []
+    for task in tasks:
+        plugin_cls = plugins[task.type]
+        try:
+            plugin_cls.validate_config(task.config_template().render())
+        except Exception as e:
+            errors.append(ConfigValidationMessages.INVALID_TASK_CONFIG.value.format(task.name, e))
+
+    if errors:
+        raise ValueError(ConfigValidationMessages.INVALID_TASK_CONFIGS.value.format("\n".join(errors)))
@@ -1,6 +1,6 @@
 import os
 import re
-from typing import Dict
+from typing import Dict, Optional
 from enum import Enum
 
 
@@ -12,22 +12,91 @@ class EnvSubstitutionMessages(Enum):
     ENV_VAR_NOT_FOUND = "Environment variable '{}' not found"
 
 
+# Constants
+PLACEHOLDER_MARKER = "${"
+_ENV_VAR_REGEX = re.compile(EnvSubstitutionPatterns.ENV_VAR_PATTERN.value)
+
+
+class ConfigTemplate:
+    # A config compiled once: only the branches leading to placeholders are kept, so rendering
+    # copies just those containers and shares every other subtree with the original config
+    __slots__ = ("_config", "_placeholders")
+
+    def __init__(self, config: Dict, memo: Optional[Dict] = None):
+        self._config = config
+        self._placeholders = _compile_value(config, memo)
+
+    @property
+    def has_placeholders(self) -> bool:
+        return self._placeholders is not None
+
+    def render(self) -> Dict:
+        if self._placeholders is None:
+            return self._config
+        return _render_value(self._config, self._placeholders)
+
+
+def compile_config(config: Dict, memo: Optional[Dict] = None) -> ConfigTemplate:
+    # memo maps id() of strings and containers shared between configs (and kept alive by the
+    # caller, see TaskStore) to their compiled form, so shared subtrees are compiled once
+    return ConfigTemplate(config, memo)
+
+
 def substitute_env_vars(config: Dict) -> Dict:
-    def substitute_value(value):
-        if isinstance(value, str):
-            # Find all ${VAR_NAME} patterns and substitute them
-            pattern = EnvSubstitutionPatterns.ENV_VAR_PATTERN.value
-
-            def replacer(match):
-                var_name = match.group(1)
-                return os.environ.get(var_name, match.group(0))  # Return original if not found
-
-            return re.sub(pattern, replacer, value)
-        elif isinstance(value, dict):
-            return {k: substitute_value(v) for k, v in value.items()}
-        elif isinstance(value, list):
-            return [substitute_value(item) for item in value]
-        else:
-            return value
-
-    return substitute_value(config)
+    return compile_config(config).render()
+
+
+def _compile_value(value, memo=None):
+    # Returns None for values without placeholders, the parsed parts for strings, and a
+    # {key_or_index: compiled child} map for containers with placeholders somewhere below
+    if isinstance(value, str):
+        compile_item = _compile_string
+    elif isinstance(value, (dict, list)):
+        compile_item = _compile_container
+    else:
+        return None
+
+    if memo is None:
+        return compile_item(value, memo)
+    key = id(value)
+    if key not in memo:
+        memo[key] = compile_item(value, memo)
+    return memo[key]
+
+
+def _compile_container(value, memo=None):
+    items = value.items() if isinstance(value, dict) else enumerate(value)
+    placeholders = {}
+    for key, item in items:
+        compiled = _compile_value(item, memo)
+        if compiled is not None:
+            placeholders[key] = compiled
+    return placeholders or None
+
+
+def _compile_string(value, memo=None):
+    if PLACEHOLDER_MARKER not in value:
+        return None
+
+    # Alternating literal text and variable names; the literal "${NAME}" is kept for unset variables
+    parts = []
+    position = 0
+    for match in _ENV_VAR_REGEX.finditer(value):
+        parts.append((value[position:match.start()], None))
+        parts.append((match.group(0), match.group(1)))
+        position = match.end()
+    if not parts:
+        return None
+    parts.append((value[position:], None))
+    return tuple(part for part in parts if part[0])
+
+
+def _render_value(value, placeholders):
+    if isinstance(placeholders, tuple):
+        return "".join(text if var_name is None else os.environ.get(var_name, text)
+                       for text, var_name in placeholders)
+
+    rendered = value.copy()
+    for key, child in placeholders.items():
+        rendered[key] = _render_value(value[key], child)
+    return rendered
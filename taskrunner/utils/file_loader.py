@@ -1,36 +1,203 @@
 import json
 import os
 import yaml
-from typing import List
+from typing import Iterator, List
 from enum import Enum
 
 from ..models.task_model import TaskModel
+from ..models.task_record import TaskRecord, TaskStore
+from .compiled_tasks import iter_compiled_tasks, load_compiled_records
+from .matrix import expand_entry
+
+# Constants
+JSON_READ_CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = " \t\r\n"
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class FileLoaderMessages(Enum):
     FILE_NOT_FOUND = "Task file {} not found"
-    UNSUPPORTED_FORMAT = "Unsupported file format. Use .json or .yaml"
+    UNSUPPORTED_FORMAT = "Unsupported file format. Use .json, .jsonl, .yaml or a compiled .trc"
     INVALID_TASKS_FORMAT = "Tasks file must contain a list of tasks."
+    INVALID_TASK_ENTRY = "Invalid task entry at {}: expected an object"
+    INVALID_JSON = "Invalid JSON in task file {}: {}"
 
 
 class SupportedFormats(Enum):
     JSON = ".json"
+    JSONL = ".jsonl"
     YAML = ".yaml"
     YML = ".yml"
+    COMPILED = ".trc"
 
 
 def load_tasks_from_file(file_path: str) -> List[TaskModel]:
+    return list(iter_tasks_from_file(file_path))
+
+
+def iter_tasks_from_file(file_path: str) -> Iterator[TaskModel]:
+    if is_compiled_task_file(file_path):
+        return _iter_compiled_file(file_path)
+    return _build_tasks(_iter_entries(file_path))
+
+
+def load_task_records(file_path: str) -> List[TaskRecord]:
+    # Each entry is validated as a TaskModel and kept only in its compact form; the store
+    # compiles the shared configs itself
+    store = TaskStore()
+    if is_compiled_task_file(file_path):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(FileLoaderMessages.FILE_NOT_FOUND.value.format(file_path))
+        records = load_compiled_records(file_path, store)
+    else:
+        records = list(store.records(_build_tasks(_iter_entries(file_path), compile_templates=False)))
+    store.release()
+    return records
+
+
+def is_compiled_task_file(file_path: str) -> bool:
+    return file_path.endswith(SupportedFormats.COMPILED.value)
+
+
+def _iter_compiled_file(file_path):
+    # Entries were expanded and validated by 'taskrunner compile'; they are decoded one at a time
     if not os.path.exists(file_path):
         raise FileNotFoundError(FileLoaderMessages.FILE_NOT_FOUND.value.format(file_path))
+    return iter_compiled_tasks(file_path)
+
+
+def iter_task_records(file_path: str) -> Iterator[TaskRecord]:
+    # Streamed records are dropped once they ran, so configs are not pooled (the pool would keep them alive)
+    return TaskStore(share_configs=False).records(iter_tasks_from_file(file_path))
+
+
+def _iter_entries(file_path):
+    # Errors about the file itself are raised right away; entries are parsed lazily as the caller iterates
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(FileLoaderMessages.FILE_NOT_FOUND.value.format(file_path))
+
+    if file_path.endswith(SupportedFormats.JSONL.value):
+        entries = _iter_json_lines(file_path)
+    elif file_path.endswith(SupportedFormats.JSON.value):
+        entries = _iter_json_array(file_path)
+    elif file_path.endswith((SupportedFormats.YAML.value, SupportedFormats.YML.value)):
+        entries = _iter_yaml_documents(file_path)
+    else:
+        raise ValueError(FileLoaderMessages.UNSUPPORTED_FORMAT.value)
+    return entries
+
 
+def _build_tasks(entries, compile_templates=True):
+    for location, entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError(FileLoaderMessages.INVALID_TASK_ENTRY.value.format(location))
+        # A matrix/foreach entry expands into one task per combination as the caller iterates
+        for expanded in expand_entry(entry):
+            task = TaskModel(**expanded)
+            # Compile env placeholders once so each run only renders the paths that contain them
+            if compile_templates:
+                task.config_template()
+            yield task
+
+
+def _iter_json_lines(file_path):
+    with open(file_path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                raise ValueError(FileLoaderMessages.INVALID_JSON.value.format(file_path, e))
+            yield f"line {line_number}", entry
+
+
+def _iter_json_array(file_path):
+    # Decodes one array element at a time from a sliding buffer instead of loading the whole document,
+    # while accepting exactly what json.load accepts for a top-level array
+    decoder = json.JSONDecoder()
     with open(file_path, "r") as f:
-        if file_path.endswith(SupportedFormats.JSON.value):
-            data = json.load(f)
-        elif file_path.endswith((SupportedFormats.YAML.value, SupportedFormats.YML.value)):
-            data = yaml.safe_load(f)
-        else:
-            raise ValueError(FileLoaderMessages.UNSUPPORTED_FORMAT.value)
+        buffer, position, eof = _skip_whitespace(f, "", 0, False)
+        if not buffer.startswith("[", position):
+            _raise_unless_list(file_path, buffer[position:] + f.read())
+        buffer, position, eof = _skip_whitespace(f, buffer, position + 1, eof)
+        index = 0
+
+        if not buffer.startswith("]", position):
+            while True:
+                if position >= len(buffer):
+                    raise ValueError(FileLoaderMessages.INVALID_JSON.value.format(file_path, "unterminated array"))
+                try:
+                    entry, end = decoder.raw_decode(buffer, position)
+                except ValueError as e:
+                    if eof:
+                        raise ValueError(FileLoaderMessages.INVALID_JSON.value.format(file_path, e))
+                    # The element is split across chunks; read more and retry
+                    buffer, position, eof = _refill(f, buffer, position)
+                    continue
+
+                # A number at the very end of the buffer may still be truncated
+                if end == len(buffer) and not eof:
+                    buffer, position, eof = _refill(f, buffer, position)
+                    continue
+
+                yield f"index {index}", entry
+                index += 1
+
+                # Exactly one comma between elements, and the array ends right after the last one
+                buffer, position, eof = _skip_whitespace(f, buffer, end, eof)
+                if buffer.startswith("]", position):
+                    break
+                if not buffer.startswith(",", position):
+                    raise ValueError(FileLoaderMessages.INVALID_JSON.value.format(
+                        file_path, f"expected ',' or ']' after index {index - 1}"))
+                buffer, position, eof = _skip_whitespace(f, buffer, position + 1, eof)
 
+        # Only whitespace may follow the closing bracket
+        buffer, position, eof = _skip_whitespace(f, buffer, position + 1, eof)
+        if position < len(buffer):
+            raise ValueError(FileLoaderMessages.INVALID_JSON.value.format(file_path, "extra data after the array"))
+
+
+def _skip_whitespace(f, buffer, position, eof):
+    # Refills as needed, so runs of whitespace longer than a chunk are skipped too
+    while True:
+        while position < len(buffer) and buffer[position] in JSON_WHITESPACE:
+            position += 1
+        if position < len(buffer) or eof:
+            return buffer, position, eof
+        buffer, position, eof = _refill(f, buffer, position)
+
+
+def _refill(f, buffer, position):
+    # At least as much as is still unparsed, so an element spanning many chunks is decoded a
+    # logarithmic number of times instead of once per chunk
+    remaining = buffer[position:]
+    chunk = f.read(max(JSON_READ_CHUNK_SIZE, len(remaining)))
+    return remaining + chunk, 0, not chunk
+
+
+def _raise_unless_list(file_path, content):
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        raise ValueError(FileLoaderMessages.INVALID_JSON.value.format(file_path, e))
     if not isinstance(data, list):
         raise ValueError(FileLoaderMessages.INVALID_TASKS_FORMAT.value)
-    return [TaskModel(**t) for t in data]
+
+
+def _iter_yaml_documents(file_path):
+    # A single document holding a list keeps the classic format; otherwise every document is one task
+    with open(file_path, "r") as f:
+        for document_index, document in enumerate(yaml.load_all(f, Loader=YAML_LOADER)):
+            if document is None:
+                continue
+            if isinstance(document, list):
+                for index, entry in enumerate(document):
+                    yield f"document {document_index}, index {index}", entry
+            elif isinstance(document, dict):
+                yield f"document {document_index}", document
+            else:
+                raise ValueError(FileLoaderMessages.INVALID_TASKS_FORMAT.value)
@@ -0,0 +1,106 @@
+import logging
+import os
+import threading
+from typing import Optional, TYPE_CHECKING
+from enum import Enum
+
+if TYPE_CHECKING:
+    import requests
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_POOL_CONNECTIONS = 10  # Number of per-host pools kept alive
+DEFAULT_POOL_MAXSIZE = 10  # Connections per host; extra requests wait for a free one
+DEFAULT_TIMEOUT = 30.0
+HTTP_SCHEMES = ("http://", "https://")
+
+
+class HttpSessionMessages(Enum):
+    CREATING_SESSION = "Creating shared HTTP session (pool_connections={}, pool_maxsize={}, timeout={})"
+    CLOSING_SESSION = "Closing shared HTTP session"
+
+
+class HttpSessionSettings:
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+
+
+_settings = HttpSessionSettings()
+_session = None
+_session_lock = threading.Lock()
+
+
+def configure_http_session(pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                           timeout: Optional[float] = None):
+    # Takes effect for the next session; an existing one is closed so the new limits apply
+    if pool_connections is not None:
+        _settings.pool_connections = pool_connections
+    if pool_maxsize is not None:
+        _settings.pool_maxsize = pool_maxsize
+    if timeout is not None:
+        _settings.timeout = timeout
+    close_http_session()
+
+
+def reset_http_session():
+    # Back to the defaults, e.g. between daemon clients so one client's --http-* options don't leak
+    configure_http_session(DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, DEFAULT_TIMEOUT)
+
+
+def get_default_timeout() -> float:
+    return _settings.timeout
+
+
+def get_http_session() -> "requests.Session":
+    global _session
+    session = _session
+    if session is not None:
+        return session
+
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+
+def close_http_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            logger.debug(HttpSessionMessages.CLOSING_SESSION.value)
+            _session.close()
+            _session = None
+
+
+def _create_session():
+    # Imported here so runs without HTTP tasks never pay for importing requests
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    logger.debug(HttpSessionMessages.CREATING_SESSION.value.format(
+        _settings.pool_connections, _settings.pool_maxsize, _settings.timeout))
+    session = requests.Session()
+
+    # pool_block caps concurrent connections per host instead of opening throwaway extras
+    adapter = HTTPAdapter(pool_connections=_settings.pool_connections,
+                          pool_maxsize=_settings.pool_maxsize,
+                          pool_block=True)
+    for scheme in HTTP_SCHEMES:
+        session.mount(scheme, adapter)
+    return session
+
+
+def _reset_after_fork():
+    # Sockets inherited from the parent must not be shared with forked workers
+    global _session, _session_lock
+    _session = None
+    _session_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
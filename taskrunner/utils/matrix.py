@@ -0,0 +1,107 @@
+import itertools
+import re
+from typing import Dict, Iterator
+from enum import Enum
+
+
+class MatrixPatterns(Enum):
+    VARIABLE_PATTERN = r'\$\{matrix\.([A-Za-z0-9_\-]+)\}'
+
+
+class MatrixMessages(Enum):
+    INVALID_MATRIX = "'matrix' of task '{}' must map variable names to non-empty lists"
+    INVALID_FOREACH = "'foreach' of task '{}' must be a non-empty list of objects"
+    UNKNOWN_VARIABLE = "Task '{}' uses unknown matrix variable '{}'"
+
+
+# Constants
+MATRIX_KEY = "matrix"
+FOREACH_KEY = "foreach"
+VARIABLE_MARKER = "${matrix."
+NAME_SEPARATOR = "-"
+_VARIABLE_REGEX = re.compile(MatrixPatterns.VARIABLE_PATTERN.value)
+
+
+def has_matrix(entry: Dict) -> bool:
+    return MATRIX_KEY in entry or FOREACH_KEY in entry
+
+
+def expand_entry(entry: Dict) -> Iterator[Dict]:
+    # One definition becomes one entry per combination, produced lazily. Only the containers on
+    # the way to a ${matrix.x} placeholder are copied; every other subtree is shared by all entries.
+    if not has_matrix(entry):
+        yield entry
+        return
+
+    name = entry.get("name")
+    combinations = _combinations(entry, name)
+    template = {key: value for key, value in entry.items() if key not in (MATRIX_KEY, FOREACH_KEY)}
+    placeholders = _compile_value(template)
+    # Names without placeholders get the combination's values appended so they stay unique
+    suffix_name = not (isinstance(name, str) and VARIABLE_MARKER in name)
+
+    for variables in combinations:
+        expanded = _render_value(template, placeholders, variables, name) if placeholders else dict(template)
+        if suffix_name:
+            expanded["name"] = NAME_SEPARATOR.join([str(name)] + [str(value) for value in variables.values()])
+        yield expanded
+
+
+def _combinations(entry, name) -> Iterator[Dict]:
+    matrix = entry.get(MATRIX_KEY) or {}
+    if not isinstance(matrix, dict) or not all(isinstance(values, list) and values for values in matrix.values()):
+        raise ValueError(MatrixMessages.INVALID_MATRIX.value.format(name))
+
+    foreach = entry.get(FOREACH_KEY, [{}])
+    if not isinstance(foreach, list) or not foreach or not all(isinstance(item, dict) for item in foreach):
+        raise ValueError(MatrixMessages.INVALID_FOREACH.value.format(name))
+
+    # Cartesian product of the matrix, once per foreach item; the lists are small even when the
+    # number of combinations is large, so combinations are produced on demand
+    keys = list(matrix)
+    return (dict(item, **dict(zip(keys, values)))
+            for item in foreach for values in itertools.product(*(matrix[key] for key in keys)))
+
+
+def _compile_value(value):
+    # None for values without placeholders, True for strings with one, and a map of the children
+    # that contain one for containers
+    if isinstance(value, str):
+        return True if VARIABLE_MARKER in value else None
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return None
+
+    placeholders = {}
+    for key, item in items:
+        compiled = _compile_value(item)
+        if compiled is not None:
+            placeholders[key] = compiled
+    return placeholders or None
+
+
+def _render_value(value, placeholders, variables, name):
+    if placeholders is True:
+        return _render_string(value, variables, name)
+
+    rendered = value.copy()
+    for key, child in placeholders.items():
+        rendered[key] = _render_value(value[key], child, variables, name)
+    return rendered
+
+
+def _render_string(value, variables, name):
+    def replace(match):
+        if match.group(1) not in variables:
+            raise ValueError(MatrixMessages.UNKNOWN_VARIABLE.value.format(name, match.group(1)))
+        return str(variables[match.group(1)])
+
+    # A value that is just one placeholder keeps the variable's type (e.g. a port number)
+    whole = _VARIABLE_REGEX.fullmatch(value)
+    if whole:
+        replace(whole)
+        return variables[whole.group(1)]
+    return _VARIABLE_REGEX.sub(replace, value)
@@ -0,0 +1,181 @@
+import contextlib
+import contextvars
+import json
+import queue
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+from enum import Enum
+
+# Constants
+DEFAULT_OUTPUT_BATCH_SIZE = 1024
+_STOP = object()
+
+
+class OutputMode(Enum):
+    TEXT = "text"
+    JSONL = "jsonl"
+    QUIET = "quiet"
+
+
+# (timestamp, task name, message, is_error)
+OutputRecord = Tuple[float, Optional[str], str, bool]
+
+# Output of the task running in the current thread or asyncio task, if it is being captured
+_task_buffer = contextvars.ContextVar("taskrunner_task_buffer", default=None)
+_active_sink = None
+
+
+class _TaskBuffer:
+    __slots__ = ("task_name", "records", "buffered", "batch_task_names")
+
+    def __init__(self, task_name, buffered, batch_task_names=None):
+        self.task_name = task_name
+        self.records = []
+        self.buffered = buffered
+        self.batch_task_names = batch_task_names
+
+
+class OutputSink:
+    # Producers only put records on a queue; a single writer thread formats them and writes
+    # whatever has accumulated in one call, so workers never contend on stdout
+    def __init__(self, mode: str = OutputMode.TEXT.value, stream=None,
+                 batch_size: int = DEFAULT_OUTPUT_BATCH_SIZE):
+        self.mode = mode
+        self._stream = stream if stream is not None else sys.stdout
+        self._batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name="taskrunner-output")
+        self._writer.start()
+
+    def write(self, records: List[OutputRecord]):
+        self._queue.put(records)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    def _write_loop(self):
+        while True:
+            batches = [self._queue.get()]
+            while len(batches) < self._batch_size:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(batch is _STOP for batch in batches)
+            lines = [self._format(record) for batch in batches if batch is not _STOP for record in batch]
+            lines = [line for line in lines if line is not None]
+            if lines:
+                self._stream.write("".join(lines))
+                self._stream.flush()
+            if stop:
+                return
+
+    def _format(self, record):
+        timestamp, task_name, message, error = record
+        if self.mode == OutputMode.JSONL.value:
+            return json.dumps({"time": timestamp, "task": task_name, "level": "error" if error else "info",
+                               "message": message}) + "\n"
+        if self.mode == OutputMode.QUIET.value and not error:
+            return None
+        return message + "\n"
+
+
+def emit(message: str, task_name: Optional[str] = None, error: bool = False):
+    buffer = _task_buffer.get()
+    if buffer is not None and buffer.buffered:
+        buffer.records.append((time.time(), task_name or buffer.task_name, message, error))
+        return
+
+    sink = _active_sink
+    if sink is None:
+        # No run is writing through a sink (library use, tests): behave like a plain print
+        print(message)
+        return
+    if task_name is None and buffer is not None:
+        task_name = buffer.task_name
+    sink.write([(time.time(), task_name, message, error)])
+
+
+def emit_records(records: List[OutputRecord]):
+    sink = _active_sink
+    if sink is None:
+        for record in records:
+            print(record[2])
+    elif records:
+        sink.write(records)
+
+
+@contextlib.contextmanager
+def task_output(task_name: str, buffered: bool = True):
+    # While a sink is active, everything the task emits is kept together and handed to the
+    # writer in one piece when the task finishes, so lines of parallel tasks never interleave
+    buffer = _TaskBuffer(task_name, buffered and _active_sink is not None)
+    token = _task_buffer.set(buffer)
+    try:
+        yield
+    finally:
+        _task_buffer.reset(token)
+        if buffer.records:
+            emit_records(buffer.records)
+
+
+@contextlib.contextmanager
+def batch_output(task_names: List[str], buffered: bool = True):
+    # task_output for the tasks of one run_batch call: their lines are written as one block, and
+    # what the plugin emits inside batch_item(position) is attributed to the task at that position
+    buffer = _TaskBuffer(None, buffered and _active_sink is not None, task_names)
+    token = _task_buffer.set(buffer)
+    try:
+        yield
+    finally:
+        _task_buffer.reset(token)
+        if buffer.records:
+            emit_records(buffer.records)
+
+
+@contextlib.contextmanager
+def batch_item(position: int):
+    # Used by run_batch implementations around the work for configs[position]
+    buffer = _task_buffer.get()
+    if buffer is None or buffer.batch_task_names is None:
+        yield
+        return
+    item = _TaskBuffer(buffer.batch_task_names[position], buffer.buffered)
+    # Shared with the batch, so the block keeps the order lines were emitted in
+    item.records = buffer.records
+    token = _task_buffer.set(item)
+    try:
+        yield
+    finally:
+        _task_buffer.reset(token)
+
+
+@contextlib.contextmanager
+def capture_output(task_name: Optional[str] = None):
+    # Always buffers, e.g. in worker processes that hand their output back to the parent
+    buffer = _TaskBuffer(task_name, True)
+    token = _task_buffer.set(buffer)
+    try:
+        yield buffer.records
+    finally:
+        _task_buffer.reset(token)
+
+
+@contextlib.contextmanager
+def output_sink(mode: str = OutputMode.TEXT.value, stream=None):
+    global _active_sink
+    sink = OutputSink(mode, stream)
+    previous, _active_sink = _active_sink, sink
+    try:
+        yield sink
+    finally:
+        _active_sink = previous
+        sink.close()
@@ -1,9 +1,12 @@
+import ast
 import importlib
+import importlib.util
 import os
 import pkgutil
 import logging
 import sys
-from typing import Dict, Type
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Tuple, Type
 from enum import Enum
 
 from ..plugin_base import BaseTaskRunner
@@ -20,6 +23,10 @@ PLUGIN_EXTERNAL_FOUND_MESSAGE = "Found external plugin: {}"
 PLUGIN_IMPORT_ERROR = "Error loading plugin module {}: {}"
 PLUGIN_EXTERNAL_IMPORT_ERROR = "Error loading plugin from module {}: {}"
 PLUGIN_PACKAGES_ERROR = "Error discovering plugins from packages: {}"
+PLUGIN_SOURCE_ERROR = "Error scanning plugin source {}: {}"
+TYPE_NAME_ATTRIBUTE = "type_name"
+INIT_MODULE = "__init__"
+PYTHON_SOURCE_SUFFIX = ".py"
 
 
 class PluginDiscoveryMessages(Enum):
@@ -27,6 +34,9 @@ class PluginDiscoveryMessages(Enum):
     IMPORTING_MODULE = "Importing module {}"
     DISCOVERING_EXTERNAL = "Discovering plugins from packages with prefix '{}'"
     CHECKING_MODULE = "Checking module {} for plugins"
+    INDEXED_PLUGIN = "Indexed plugin {} -> {}.{}"
+    LOADING_PLUGIN = "Loading plugin {} from {}"
+    INVALID_LAZY_PLUGIN = "{}.{} is not a plugin with type_name '{}'"
 
 
 def discover_plugins(plugin_folder: str = None, package_prefix: str = None) -> Dict[str, Type[BaseTaskRunner]]:
@@ -138,3 +148,167 @@ def _is_valid_plugin_class(obj):
     return (isinstance(obj, type) and
             issubclass(obj, BaseTaskRunner) and
             obj is not BaseTaskRunner)
+
+
+
+class LazyPlugin:
+    # Stands in for a plugin class until it is needed, so unused plugins (and their dependencies) are never imported
+    def __init__(self, type_name: str, module_name: str, class_name: str):
+        self.type_name = type_name
+        self.module_name = module_name
+        self.class_name = class_name
+        self._plugin = None
+
+    def load(self) -> Type[BaseTaskRunner]:
+        if self._plugin is None:
+            logger.debug(PluginDiscoveryMessages.LOADING_PLUGIN.value.format(self.type_name, self.module_name))
+            plugin = importlib.import_module(self.module_name)
+            for attribute in self.class_name.split("."):
+                plugin = getattr(plugin, attribute)
+            if not _is_valid_plugin_class(plugin) or plugin.type_name != self.type_name:
+                raise ImportError(PluginDiscoveryMessages.INVALID_LAZY_PLUGIN.value.format(
+                    self.module_name, self.class_name, self.type_name))
+            self._plugin = plugin
+        return self._plugin
+
+
+class PluginRegistry(Mapping):
+    # Maps type_name to plugin class; membership and iteration never import, lookups import on first use
+    def __init__(self, entries: Dict[str, LazyPlugin] = None):
+        self._entries = dict(entries or {})
+
+    def __getitem__(self, type_name: str) -> Type[BaseTaskRunner]:
+        return self._entries[type_name].load()
+
+    def __contains__(self, type_name) -> bool:
+        return type_name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> Dict[str, LazyPlugin]:
+        return dict(self._entries)
+
+    def select(self, type_names) -> "PluginRegistry":
+        return PluginRegistry({name: entry for name, entry in self._entries.items() if name in type_names})
+
+
+def discover_plugins_lazily(plugin_folder: str = None, package_prefix: str = None) -> PluginRegistry:
+    # Same sources and precedence as discover_plugins, but found by reading source instead of importing it
+    entries = {}
+
+    if plugin_folder is None:
+        plugin_folder = _get_default_plugin_folder()
+
+    logger.debug(PluginDiscoveryMessages.DISCOVERING_PLUGINS.value.format(plugin_folder))
+    _index_local_plugins(entries, plugin_folder)
+
+    if package_prefix:
+        _index_external_plugins(entries, package_prefix)
+
+    return PluginRegistry(entries)
+
+
+def _index_local_plugins(entries, plugin_folder):
+    if not os.path.exists(plugin_folder):
+        return
+
+    for _, module_name, is_package in pkgutil.iter_modules([plugin_folder]):
+        path = os.path.join(plugin_folder, module_name)
+        path = os.path.join(path, INIT_MODULE + PYTHON_SOURCE_SUFFIX) if is_package else path + PYTHON_SOURCE_SUFFIX
+        _index_plugin_source(entries, path, f"{MODULE_PREFIX}{module_name}")
+
+
+def _index_external_plugins(entries, package_prefix):
+    logger.debug(PluginDiscoveryMessages.DISCOVERING_EXTERNAL.value.format(package_prefix))
+
+    try:
+        spec = importlib.util.find_spec(package_prefix)
+    except (ImportError, ValueError):
+        spec = None
+
+    if spec is None:
+        # Not an importable name: treat it as a prefix of top-level modules, as discover_plugins does
+        for _, module_name, _ in pkgutil.iter_modules():
+            if module_name.startswith(package_prefix):
+                _index_external_module(entries, module_name)
+        return
+
+    _index_external_module(entries, package_prefix, spec)
+
+
+def _index_external_module(entries, module_name, spec=None):
+    try:
+        spec = spec or importlib.util.find_spec(module_name)
+    except (ImportError, ValueError) as e:
+        logger.error(PLUGIN_EXTERNAL_IMPORT_ERROR.format(module_name, e))
+        return
+    if spec is None:
+        return
+
+    if spec.submodule_search_locations:
+        for location in spec.submodule_search_locations:
+            for path, submodule_name in _iter_package_sources(location, module_name):
+                _index_plugin_source(entries, path, submodule_name, avoid_overwrite=True)
+    elif spec.origin and spec.origin.endswith(PYTHON_SOURCE_SUFFIX):
+        _index_plugin_source(entries, spec.origin, module_name, avoid_overwrite=True)
+
+
+def _iter_package_sources(location, package_name) -> Iterator[Tuple[str, str]]:
+    for root, dirs, files in os.walk(location):
+        dirs[:] = sorted(d for d in dirs if os.path.exists(os.path.join(root, d, INIT_MODULE + PYTHON_SOURCE_SUFFIX)))
+        relative = os.path.relpath(root, location)
+        parts = [package_name] + ([] if relative == os.curdir else relative.split(os.sep))
+        for name in sorted(files):
+            if not name.endswith(PYTHON_SOURCE_SUFFIX):
+                continue
+            stem = name[:-len(PYTHON_SOURCE_SUFFIX)]
+            yield os.path.join(root, name), ".".join(parts if stem == INIT_MODULE else parts + [stem])
+
+
+def _index_plugin_source(entries, path, module_name, avoid_overwrite=False):
+    try:
+        plugin_classes = _scan_plugin_source(path)
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.error(PLUGIN_SOURCE_ERROR.format(path, e))
+        return
+
+    for type_name, class_name in plugin_classes:
+        # Avoid overwriting local plugins with the same type_name for external plugins
+        if avoid_overwrite and type_name in entries:
+            continue
+        entries[type_name] = LazyPlugin(type_name, module_name, class_name)
+        logger.debug(PluginDiscoveryMessages.INDEXED_PLUGIN.value.format(type_name, module_name, class_name))
+
+
+def _scan_plugin_source(path) -> List[Tuple[str, str]]:
+    # Top-level classes that assign a string literal to type_name are plugin candidates;
+    # LazyPlugin.load confirms they really subclass BaseTaskRunner once imported
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    plugin_classes = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef) or not node.bases:
+            continue
+        type_name = _find_type_name(node)
+        if type_name:
+            plugin_classes.append((type_name, node.name))
+    return plugin_classes
+
+
+def _find_type_name(class_node):
+    for statement in class_node.body:
+        if isinstance(statement, ast.Assign):
+            targets, value = statement.targets, statement.value
+        elif isinstance(statement, ast.AnnAssign):
+            targets, value = [statement.target], statement.value
+        else:
+            continue
+        if any(isinstance(target, ast.Name) and target.id == TYPE_NAME_ATTRIBUTE for target in targets):
+            if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                return value.value
+    return None
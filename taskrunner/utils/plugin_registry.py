@@ -0,0 +1,199 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Dict, Iterable, Optional
+from enum import Enum
+
+from .plugin_discovery import (
+    LazyPlugin,
+    PluginRegistry,
+    discover_plugins_lazily,
+    _get_default_plugin_folder,
+    PLUGIN_IMPORT_ERROR
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constants
+REGISTRY_FORMAT_VERSION = 1
+REGISTRY_DIR_ENV = "TASKRUNNER_PLUGIN_REGISTRY_DIR"
+DISABLE_REGISTRY_ENV = "TASKRUNNER_NO_PLUGIN_REGISTRY"
+DEFAULT_REGISTRY_SUBDIR = os.path.join("taskrunner", "plugin_registry")
+LOCAL_REGISTRY_NAME = "local"
+PACKAGE_NAME = "taskrunner"
+
+
+class PluginRegistryMessages(Enum):
+    USING_MANIFEST = "Using plugin registry manifest {}"
+    MANIFEST_STALE = "Plugin registry manifest {} is missing or stale, rediscovering plugins"
+    MANIFEST_ENTRY_INVALID = "Plugin registry entry for '{}' is invalid ({}), rediscovering plugins"
+    MANIFEST_WRITE_ERROR = "Could not write plugin registry manifest {}: {}"
+
+
+def resolve_plugins(task_types: Iterable[str], plugin_folder: str = None,
+                    package_prefix: str = None) -> PluginRegistry:
+    # Imports only the plugin modules needed for the given types; the manifest also skips the source scan
+    task_types = set(task_types)
+    if plugin_folder is None:
+        plugin_folder = _get_default_plugin_folder()
+
+    manifest_path = _get_manifest_path(package_prefix)
+    if manifest_path is None:
+        return _load_selected(discover_plugins_lazily(plugin_folder, package_prefix), task_types)
+
+    fingerprint = _compute_fingerprint(plugin_folder, package_prefix)
+    manifest = _load_manifest(manifest_path)
+    if manifest is not None and manifest.get("fingerprint") == fingerprint:
+        logger.debug(PluginRegistryMessages.USING_MANIFEST.value.format(manifest_path))
+        registry = _registry_from_manifest(manifest["plugins"])
+        if registry is not None:
+            plugins = _load_selected(registry, task_types, strict=True)
+            if plugins is not None:
+                return plugins
+    else:
+        logger.debug(PluginRegistryMessages.MANIFEST_STALE.value.format(manifest_path))
+
+    registry = discover_plugins_lazily(plugin_folder, package_prefix)
+    _save_manifest(manifest_path, fingerprint, registry)
+    return _load_selected(registry, task_types)
+
+
+def _load_selected(registry, task_types, strict=False) -> Optional[PluginRegistry]:
+    # Types unknown to the registry are left out and reported by the caller as unknown task types
+    selected = registry.select(task_types)
+    loaded = {}
+    for type_name, entry in selected.entries().items():
+        try:
+            entry.load()
+        except Exception as e:
+            if strict:
+                logger.debug(PluginRegistryMessages.MANIFEST_ENTRY_INVALID.value.format(type_name, e))
+                return None
+            logger.error(PLUGIN_IMPORT_ERROR.format(entry.module_name, e))
+            continue
+        loaded[type_name] = entry
+    return PluginRegistry(loaded)
+
+
+def _registry_from_manifest(entries) -> Optional[PluginRegistry]:
+    try:
+        return PluginRegistry({type_name: LazyPlugin(type_name, entry["module"], entry["class"])
+                               for type_name, entry in entries.items()})
+    except (KeyError, TypeError):
+        return None
+
+
+def _get_manifest_path(package_prefix):
+    if os.environ.get(DISABLE_REGISTRY_ENV):
+        return None
+
+    registry_dir = os.environ.get(REGISTRY_DIR_ENV)
+    if not registry_dir:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        registry_dir = os.path.join(cache_home, DEFAULT_REGISTRY_SUBDIR)
+
+    # One manifest per plugin source, so runs with different --plugin-prefix values don't evict each other
+    name = LOCAL_REGISTRY_NAME
+    if package_prefix:
+        name = f"{LOCAL_REGISTRY_NAME}-{hashlib.sha256(package_prefix.encode('utf-8')).hexdigest()[:16]}"
+    return os.path.join(registry_dir, f"{name}.json")
+
+
+def _compute_fingerprint(plugin_folder, package_prefix):
+    parts = [REGISTRY_FORMAT_VERSION, list(sys.version_info[:2]), _get_distribution_version(PACKAGE_NAME)]
+    parts.append(_tree_stamp(plugin_folder))
+
+    if package_prefix:
+        parts.append(_get_distribution_version(package_prefix.split(".")[0]))
+        parts.append(_package_stamp(package_prefix))
+
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _package_stamp(package_prefix):
+    try:
+        spec = importlib.util.find_spec(package_prefix)
+    except (ImportError, ValueError):
+        spec = None
+
+    if spec is not None and spec.submodule_search_locations:
+        return [_tree_stamp(location) for location in spec.submodule_search_locations]
+    if spec is not None and spec.origin and os.path.exists(spec.origin):
+        return _file_stamp(spec.origin)
+
+    # Prefix scans walk every top-level module on sys.path, so track the directories they come from
+    stamps = []
+    for entry in sys.path:
+        if not entry or not os.path.isdir(entry):
+            continue
+        stamps.append([entry, os.stat(entry).st_mtime_ns])
+        for name in sorted(os.listdir(entry)):
+            if name.startswith(package_prefix):
+                path = os.path.join(entry, name)
+                stamps.append(_tree_stamp(path) if os.path.isdir(path) else _file_stamp(path))
+    return stamps
+
+
+def _tree_stamp(folder):
+    stamps = []
+    if not os.path.isdir(folder):
+        return stamps
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py"):
+                stamps.append(_file_stamp(os.path.join(root, name)))
+    return stamps
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [path, None]
+    return [path, stat.st_mtime_ns, stat.st_size]
+
+
+def _get_distribution_version(name):
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        return None
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def _load_manifest(manifest_path) -> Optional[Dict]:
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("plugins"), dict):
+        return None
+    return manifest
+
+
+def _save_manifest(manifest_path, fingerprint, registry):
+    manifest = {
+        "fingerprint": fingerprint,
+        "plugins": {type_name: {"module": entry.module_name, "class": entry.class_name}
+                    for type_name, entry in registry.entries().items()},
+    }
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        # Write to a temporary file and rename so concurrent runs never read a partial manifest
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(manifest_path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, manifest_path)
+    except OSError as e:
+        logger.warning(PluginRegistryMessages.MANIFEST_WRITE_ERROR.value.format(manifest_path, e))
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from enum import Enum
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_CACHE_DIR = ".taskrunner-cache"
+DEFAULT_MAX_ENTRIES = 10000
+ENTRIES_DIR = "entries"
+EVICTION_FRACTION = 0.1  # Evict in batches so a full cache doesn't rescan the store on every write
+
+
+class ResultCacheMessages(Enum):
+    CACHE_HIT = "Cache hit for {} ({})"
+    CACHE_STORE_ERROR = "Could not record cache entry {}: {}"
+    EVICTED_ENTRIES = "Evicted {} cache entries"
+
+
+def compute_task_hash(type_name: str, config: Dict, inputs: Any = None) -> str:
+    payload = json.dumps([type_name, config, inputs], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entries_dir = os.path.join(cache_dir, ENTRIES_DIR)
+        self._lock = threading.Lock()
+        os.makedirs(self._entries_dir, exist_ok=True)
+        self._entry_count = sum(1 for _ in self._iter_entry_paths())
+
+    def key_for(self, runner, type_name: str, config: Dict) -> Optional[str]:
+        if not getattr(runner, "cacheable", False):
+            return None
+        return compute_task_hash(type_name, config, runner.cache_inputs(config))
+
+    def is_fresh(self, runner, type_name: str, config: Dict) -> bool:
+        key = self.key_for(runner, type_name, config)
+        if key is None:
+            return False
+
+        path = self._entry_path(key)
+        try:
+            # Touching the entry keeps recently used results at the end of the LRU order
+            os.utime(path)
+        except OSError:
+            return False
+        logger.debug(ResultCacheMessages.CACHE_HIT.value.format(type_name, key[:12]))
+        return True
+
+    def store(self, runner, type_name: str, config: Dict):
+        # Keyed on the state after the run, so an untouched output matches the next run's lookup
+        key = self.key_for(runner, type_name, config)
+        if key is None:
+            return
+
+        path = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            created = not os.path.exists(path)
+            with open(path, "w") as f:
+                json.dump({"type": type_name, "stored_at": time.time()}, f)
+        except OSError as e:
+            logger.warning(ResultCacheMessages.CACHE_STORE_ERROR.value.format(key[:12], e))
+            return
+
+        if created:
+            with self._lock:
+                self._entry_count += 1
+                if self._entry_count > self.max_entries:
+                    self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self._iter_entry_paths():
+            try:
+                entries.append((os.stat(path).st_mtime, path))
+            except OSError:
+                continue
+        entries.sort()
+
+        target = int(self.max_entries * (1 - EVICTION_FRACTION))
+        evicted = 0
+        for _, path in entries[:max(0, len(entries) - target)]:
+            try:
+                os.remove(path)
+                evicted += 1
+            except OSError:
+                continue
+        self._entry_count = len(entries) - evicted
+        logger.debug(ResultCacheMessages.EVICTED_ENTRIES.value.format(evicted))
+
+    def _entry_path(self, key):
+        # Shard by prefix to keep directories small
+        return os.path.join(self._entries_dir, key[:2], key)
+
+    def _iter_entry_paths(self):
+        for shard in os.scandir(self._entries_dir):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    yield entry.path
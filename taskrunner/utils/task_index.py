@@ -0,0 +1,114 @@
+import fnmatch
+from typing import Dict, Iterable, List, NamedTuple, Sequence
+from enum import Enum
+
+
+class TaskIndexMessages(Enum):
+    NO_TASK_MATCHES = "No task matches '{}'"
+    EMPTY_SELECTOR = "Empty task selector in '{}'"
+
+
+class SelectorKind(Enum):
+    NAME = "name"
+    TYPE = "type"
+    TAG = "tag"
+
+
+# Constants
+SELECTOR_SEPARATOR = ","
+SELECTOR_PREFIX_SEPARATOR = ":"
+_PREFIXED_KINDS = {SelectorKind.TYPE.value, SelectorKind.TAG.value}
+_GLOB_CHARACTERS = set("*?[")
+
+
+class TaskSelector(NamedTuple):
+    kind: str
+    pattern: str
+    text: str
+
+    @property
+    def is_glob(self) -> bool:
+        return not _GLOB_CHARACTERS.isdisjoint(self.pattern)
+
+    def matches(self, task) -> bool:
+        if self.kind == SelectorKind.TYPE.value:
+            values = (task.type,)
+        elif self.kind == SelectorKind.TAG.value:
+            values = task.tags
+        else:
+            values = (task.name,)
+        if self.is_glob:
+            return any(fnmatch.fnmatchcase(value, self.pattern) for value in values)
+        return self.pattern in values
+
+
+def parse_selectors(expressions: Iterable[str]) -> List[TaskSelector]:
+    # "build-*,type:http_get" and repeated --only options are the same list of selectors; a task is
+    # selected when any of them matches. Names may contain ':' unless they start with type: or tag:.
+    selectors = []
+    for expression in expressions or ():
+        for text in expression.split(SELECTOR_SEPARATOR):
+            text = text.strip()
+            prefix, separator, pattern = text.partition(SELECTOR_PREFIX_SEPARATOR)
+            if separator and prefix in _PREFIXED_KINDS:
+                selector = TaskSelector(prefix, pattern.strip(), text)
+            else:
+                selector = TaskSelector(SelectorKind.NAME.value, text, text)
+            if not selector.pattern:
+                raise ValueError(TaskIndexMessages.EMPTY_SELECTOR.value.format(expression))
+            selectors.append(selector)
+    return selectors
+
+
+def exact_names(selectors: Sequence[TaskSelector]) -> bool:
+    # True when every selector is a plain name, which can be looked up without scanning
+    return bool(selectors) and all(selector.kind == SelectorKind.NAME.value and not selector.is_glob
+                                   for selector in selectors)
+
+
+class TaskIndex:
+    # Task positions by name, type and tag, built in one pass when the tasks are loaded
+    def __init__(self, tasks: Sequence):
+        self.tasks = tasks
+        self.by_name: Dict[str, int] = {}
+        self.by_type: Dict[str, List[int]] = {}
+        self.by_tag: Dict[str, List[int]] = {}
+        self.duplicates: Dict[str, None] = {}
+        for position, task in enumerate(tasks):
+            if self.by_name.setdefault(task.name, position) != position:
+                self.duplicates[task.name] = None
+            self.by_type.setdefault(task.type, []).append(position)
+            for tag in task.tags:
+                self.by_tag.setdefault(tag, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def get(self, name: str):
+        position = self.by_name.get(name)
+        return None if position is None else self.tasks[position]
+
+    def select(self, selectors: Sequence[TaskSelector]) -> List:
+        # Matching tasks in file order; every selector must match at least one task
+        positions = set()
+        for selector in selectors:
+            matched = self._positions(selector)
+            if not matched:
+                raise ValueError(TaskIndexMessages.NO_TASK_MATCHES.value.format(selector.text))
+            positions.update(matched)
+        return [self.tasks[position] for position in sorted(positions)]
+
+    def _positions(self, selector: TaskSelector) -> List[int]:
+        if selector.kind == SelectorKind.NAME.value:
+            if not selector.is_glob:
+                position = self.by_name.get(selector.pattern)
+                return [] if position is None else [position]
+            return [position for name, position in self.by_name.items()
+                    if fnmatch.fnmatchcase(name, selector.pattern)]
+
+        # Types and tags are few compared to tasks, so globs only scan the keys
+        table = self.by_type if selector.kind == SelectorKind.TYPE.value else self.by_tag
+        if not selector.is_glob:
+            return table.get(selector.pattern, [])
+        return [position for key, positions in table.items() if fnmatch.fnmatchcase(key, selector.pattern)
+                for position in positions]
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+from taskrunner.models.task_model import TaskModel
+from taskrunner.plugin_base import BaseTaskRunner
+from taskrunner.tasks.async_executor import run_tasks_async, _run_single_task_async
+
+
+class RecordingTask(BaseTaskRunner):
+    type_name = "recording"
+    executed = []
+
+    def run(self, config):
+        RecordingTask.executed.append((config["name"], threading.current_thread().name))
+        if config.get("fail"):
+            raise Exception("boom")
+
+
+class SleepingTask(BaseTaskRunner):
+    type_name = "sleeping"
+    active = 0
+    peak = 0
+
+    async def run_async(self, config):
+        SleepingTask.active += 1
+        SleepingTask.peak = max(SleepingTask.peak, SleepingTask.active)
+        await asyncio.sleep(0.01)
+        SleepingTask.active -= 1
+
+
+def test_base_run_async_offloads_sync_run_to_thread():
+    RecordingTask.executed = []
+    asyncio.run(RecordingTask().run_async({"name": "sync"}))
+
+    assert RecordingTask.executed[0][0] == "sync"
+    assert RecordingTask.executed[0][1] != threading.main_thread().name
+
+
+def test_run_tasks_async_runs_all_tasks_concurrently():
+    SleepingTask.active = 0
+    SleepingTask.peak = 0
+    tasks = [TaskModel(name=f"task{i}", type="sleeping") for i in range(50)]
+
+    with patch('builtins.print'):
+        run_tasks_async(tasks, {"sleeping": SleepingTask}, max_concurrency=10)
+
+    assert SleepingTask.peak == 10
+
+
+def test_run_tasks_async_respects_dependencies():
+    RecordingTask.executed = []
+    tasks = [
+        TaskModel(name="second", type="recording", config={"name": "second"}, depends_on=["first"]),
+        TaskModel(name="first", type="recording", config={"name": "first"}),
+        TaskModel(name="broken", type="recording", config={"name": "broken", "fail": True}),
+        TaskModel(name="after_broken", type="recording", config={"name": "after_broken"}, depends_on=["broken"]),
+    ]
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_async(tasks, {"recording": RecordingTask})
+
+    executed = [name for name, _ in RecordingTask.executed]
+    assert executed.index("first") < executed.index("second")
+    assert "after_broken" not in executed
+    mock_print.assert_any_call("[BROKEN] Task 'broken' failed: boom")
+    mock_print.assert_any_call("[AFTER BROKEN] Task 'after_broken' skipped: dependency 'broken' failed")
+
+
+def test_run_single_task_async_with_exception():
+    RecordingTask.executed = []
+    task = TaskModel(name="test_task", type="recording")
+
+    with patch('builtins.print') as mock_print:
+        result = asyncio.run(_run_single_task_async(task, RecordingTask(), {"name": "x", "fail": True}, verbose=False))
+
+    assert result == ("error", "boom")
+    mock_print.assert_called_with("[TEST TASK] Running task: test_task")
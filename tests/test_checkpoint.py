@@ -0,0 +1,69 @@
+import os
+from unittest.mock import patch
+
+from taskrunner.models.task_model import TaskModel
+from taskrunner.plugin_base import BaseTaskRunner
+from taskrunner.tasks.executor import run_tasks_sequentially, run_tasks_in_parallel
+from taskrunner.utils.checkpoint import CheckpointJournal, checkpoint_hash, is_checkpointed, load_checkpoint
+
+
+class RecordingTask(BaseTaskRunner):
+    type_name = "rec"
+
+    def run(self, config):
+        if config.get("fail"):
+            raise Exception("boom")
+
+
+def test_journal_round_trip(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    task = TaskModel(name="task1", type="rec", config={"value": 1})
+
+    with CheckpointJournal(path) as journal:
+        journal.record(task)
+
+    completed = load_checkpoint(path)
+    assert completed == {"task1": checkpoint_hash(task)}
+    assert is_checkpointed(task, completed)
+    # A changed config no longer matches the recorded hash
+    assert not is_checkpointed(TaskModel(name="task1", type="rec", config={"value": 2}), completed)
+
+
+def test_journal_batches_fsync(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+
+    with patch('taskrunner.utils.checkpoint.os.fsync') as mock_fsync:
+        journal = CheckpointJournal(path, flush_interval=60, batch_size=100)
+        for i in range(10):
+            journal.record(TaskModel(name=f"task{i}", type="rec"))
+        journal.close()
+
+    assert mock_fsync.call_count == 1
+    assert len(load_checkpoint(path)) == 10
+
+
+def test_load_checkpoint_ignores_truncated_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text('{"name": "task1", "hash": "abc"}\n{"name": "task2", "ha')
+
+    assert load_checkpoint(str(path)) == {"task1": "abc"}
+    assert load_checkpoint(str(tmp_path / "missing.jsonl")) == {}
+
+
+def test_executors_record_successful_tasks(tmp_path):
+    tasks = [
+        TaskModel(name="good", type="rec", config={}),
+        TaskModel(name="broken", type="rec", config={"fail": True}),
+        TaskModel(name="after_broken", type="rec", config={}, depends_on=["broken"]),
+    ]
+
+    parallel_path = str(tmp_path / "parallel.jsonl")
+    with patch('builtins.print'), CheckpointJournal(parallel_path) as journal:
+        run_tasks_in_parallel(tasks, {"rec": RecordingTask}, checkpoint=journal)
+    assert set(load_checkpoint(parallel_path)) == {"good"}
+
+    sequential_path = str(tmp_path / "sequential.jsonl")
+    with patch('builtins.print'), CheckpointJournal(sequential_path) as journal:
+        run_tasks_sequentially(tasks[:1], {"rec": RecordingTask}, checkpoint=journal)
+    assert os.path.getsize(sequential_path) > 0
+    assert set(load_checkpoint(sequential_path)) == {"good"}
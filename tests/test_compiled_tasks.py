@@ -0,0 +1,105 @@
+import os
+import tempfile
+
+import pytest
+
+from taskrunner.models.task_model import TaskModel
+from taskrunner.models.task_record import TaskRecord
+from taskrunner.utils.compiled_tasks import (
+    CompiledTaskFile,
+    CompiledTaskMessages,
+    find_compiled_task,
+    iter_compiled_tasks,
+    write_compiled_tasks,
+)
+from taskrunner.utils.file_loader import load_task_records, load_tasks_from_file
+
+
+def _tasks():
+    return [
+        TaskModel(name="setup", type="log", config={"message": "Hello"}),
+        TaskModel(name="wait", type="wait", config={"seconds": 1}, depends_on=["setup"], retries=2),
+        TaskModel(name="again", type="log", config={"message": "Hello"}, priority=5),
+    ]
+
+
+@pytest.fixture
+def compiled_path():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "tasks.trc")
+        write_compiled_tasks(_tasks(), path)
+        yield path
+
+
+def test_round_trip_keeps_order_and_fields(compiled_path):
+    tasks = list(iter_compiled_tasks(compiled_path))
+
+    assert [task.name for task in tasks] == ["setup", "wait", "again"]
+    assert tasks[1].depends_on == ["setup"]
+    assert tasks[1].retries == 2
+    assert tasks[1].config == {"seconds": 1}
+    assert tasks[2].priority == 5
+    assert tasks[0].depends_on == []
+    assert tasks[0].timeout is None
+
+
+def test_write_returns_task_count_and_leaves_no_temp_file(compiled_path):
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "tasks.trc")
+        assert write_compiled_tasks(_tasks(), path) == 3
+        assert os.listdir(folder) == ["tasks.trc"]
+
+
+def test_identical_configs_are_stored_once(compiled_path):
+    with CompiledTaskFile(compiled_path) as compiled:
+        assert len(compiled) == 3
+        assert compiled._config_count == 2
+        assert compiled.task(0).config is compiled.task(2).config
+
+
+def test_find_present_and_missing(compiled_path):
+    assert find_compiled_task(compiled_path, "wait").config == {"seconds": 1}
+    assert find_compiled_task(compiled_path, "again").priority == 5
+    assert find_compiled_task(compiled_path, "missing") is None
+
+
+def test_find_many_names():
+    tasks = [TaskModel(name=f"task-{index}", type="log", config={"message": str(index % 7)})
+             for index in range(500)]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "tasks.trc")
+        write_compiled_tasks(tasks, path)
+        with CompiledTaskFile(path) as compiled:
+            assert compiled.names() == [task.name for task in tasks]
+            for task in tasks[::37]:
+                assert compiled.find(task.name).config == task.config
+            assert compiled.find("task-500") is None
+
+
+def test_rejects_files_that_are_not_compiled():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "tasks.trc")
+        with open(path, "wb") as f:
+            f.write(b"[" * 64)
+
+        with pytest.raises(ValueError) as exc_info:
+            CompiledTaskFile(path)
+        assert str(exc_info.value) == CompiledTaskMessages.NOT_COMPILED.value.format(path)
+
+
+def test_file_loader_reads_compiled_files(compiled_path):
+    tasks = load_tasks_from_file(compiled_path)
+    assert [task.name for task in tasks] == ["setup", "wait", "again"]
+
+    records = load_task_records(compiled_path)
+    assert all(isinstance(record, TaskRecord) for record in records)
+    assert records[1].depends_on == ("setup",)
+    assert records[0].config is records[2].config
+    assert records[0].config_template() is records[2].config_template()
+
+
+def test_file_loader_missing_compiled_file():
+    with pytest.raises(FileNotFoundError):
+        load_task_records("missing.trc")
+    with pytest.raises(FileNotFoundError):
+        load_tasks_from_file("missing.trc")
@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel, Field
+
+from taskrunner.models.task_model import TaskModel
+from taskrunner.plugin_base import BaseTaskRunner
+from taskrunner.tasks.executor import run_tasks_sequentially
+from taskrunner.utils.config_validation import ValidatedConfigCache, validate_task_configs
+
+
+class CountingConfig(BaseModel):
+    count: int = Field(..., ge=0)
+
+
+class CountingTask(BaseTaskRunner):
+    type_name = "counting"
+    config_model = CountingConfig
+
+    def run(self, config):
+        self.received = config
+
+
+def test_validated_config_cache_reuses_models():
+    cache = ValidatedConfigCache()
+
+    first = cache.validate(CountingConfig, {"count": 1})
+    second = cache.validate(CountingConfig, {"count": 1})
+
+    assert first is second
+    assert cache.validate(CountingConfig, {"count": 2}) is not first
+    # Already validated models pass straight through
+    assert cache.validate(CountingConfig, first) is first
+
+
+def test_validated_config_cache_evicts_oldest():
+    cache = ValidatedConfigCache(max_entries=1)
+
+    first = cache.validate(CountingConfig, {"count": 1})
+    cache.validate(CountingConfig, {"count": 2})
+
+    assert cache.validate(CountingConfig, {"count": 1}) is not first
+
+
+def test_validate_config_without_model():
+    config = {"anything": True}
+    assert BaseTaskRunner.validate_config(config) is config
+
+
+def test_validate_task_configs_reports_all_errors():
+    tasks = [
+        TaskModel(name="good", type="counting", config={"count": 1}),
+        TaskModel(name="negative", type="counting", config={"count": -1}),
+        TaskModel(name="missing", type="counting", config={}),
+    ]
+
+    with pytest.raises(ValueError) as exc_info:
+        validate_task_configs(tasks, {"counting": CountingTask})
+
+    message = str(exc_info.value)
+    assert "Invalid config for task 'negative'" in message
+    assert "Invalid config for task 'missing'" in message
+    assert "'good'" not in message
+
+
+def test_run_receives_validated_model():
+    runners = []
+
+    class RecordingTask(CountingTask):
+        def run(self, config):
+            runners.append(config)
+
+    with patch('builtins.print'):
+        run_tasks_sequentially([TaskModel(name="task1", type="counting", config={"count": 3})],
+                               {"counting": RecordingTask})
+
+    assert isinstance(runners[0], CountingConfig)
+    assert runners[0].count == 3
@@ -0,0 +1,165 @@
+import io
+import logging
+import os
+import socket
+import stat
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from taskrunner.daemon import _DaemonRequestHandler, _DaemonServer, _client_context, _invoke_cli, _log_to
+from taskrunner.daemon_client import DAEMON_SOCKET_ENV, is_daemon_running, main, run_via_daemon
+from taskrunner.utils.http_session import (
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+    configure_http_session,
+    get_default_timeout,
+    get_http_session
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def daemon_socket(tmp_path):
+    socket_path = str(tmp_path / "taskrunner.sock")
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    process = subprocess.Popen([sys.executable, "-m", "taskrunner", "daemon", "--socket", socket_path],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    deadline = time.monotonic() + 15
+    while not is_daemon_running(socket_path):
+        assert time.monotonic() < deadline and process.poll() is None
+        time.sleep(0.05)
+    yield socket_path
+    process.terminate()
+    process.wait()
+
+
+def test_run_via_daemon(daemon_socket, tmp_path, capsys, monkeypatch):
+    task_file = tmp_path / "tasks.yaml"
+    task_file.write_text("- name: greet\n  type: log\n  config:\n    message: \"Hello ${DAEMON_TEST_NAME}\"\n")
+    # The client's environment and working directory are used for the run
+    monkeypatch.setenv("DAEMON_TEST_NAME", "from client")
+    monkeypatch.chdir(tmp_path)
+
+    assert run_via_daemon(["run", "tasks.yaml"], daemon_socket) == 0
+    assert "[LogTask] Hello from client" in capsys.readouterr().out
+
+    assert run_via_daemon(["run", "missing.yaml"], daemon_socket) == 1
+    assert "Error:" in capsys.readouterr().out
+
+
+def test_run_via_daemon_without_daemon(tmp_path):
+    assert run_via_daemon(["run", "tasks.yaml"], str(tmp_path / "missing.sock")) is None
+
+
+def test_main_falls_back_to_in_process_cli(tmp_path, monkeypatch):
+    monkeypatch.setenv(DAEMON_SOCKET_ENV, str(tmp_path / "missing.sock"))
+    monkeypatch.setattr(sys, "argv", ["taskrunner", "list-plugins"])
+
+    with patch('taskrunner.cli.cli') as mock_cli:
+        main()
+
+    mock_cli.assert_called_once_with()
+
+
+def test_client_context_restores_process_state(tmp_path):
+    previous_cwd = os.getcwd()
+    with _client_context(str(tmp_path), {"ONLY_VAR": "1"}):
+        assert os.getcwd() == str(tmp_path)
+        assert dict(os.environ) == {"ONLY_VAR": "1"}
+
+    assert os.getcwd() == previous_cwd
+    assert "ONLY_VAR" not in os.environ
+
+
+def test_invoke_cli_exit_codes():
+    with patch('builtins.print'):
+        assert _invoke_cli(["list-plugins"]) == 0
+        assert _invoke_cli(["run", "missing.yaml"]) == 1
+        assert _invoke_cli(["no-such-command"]) == 2
+
+
+def test_client_context_resets_http_settings(tmp_path):
+    configure_http_session(pool_maxsize=3, timeout=1)
+    previous_session = get_http_session()
+
+    with _client_context(str(tmp_path), dict(os.environ)):
+        assert get_default_timeout() == DEFAULT_TIMEOUT
+        assert get_http_session() is not previous_session
+        assert get_http_session().get_adapter("https://example.com")._pool_maxsize == DEFAULT_POOL_MAXSIZE
+
+
+def test_daemon_socket_is_owner_only_from_the_moment_it_is_bound(tmp_path):
+    socket_path = str(tmp_path / "taskrunner.sock")
+
+    previous_umask = os.umask(0)
+    try:
+        with _DaemonServer(socket_path, _DaemonRequestHandler):
+            assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+            # The process umask is only changed while binding
+            assert os.umask(0) == 0
+    finally:
+        os.umask(previous_umask)
+
+
+def test_daemon_serves_clients_concurrently(daemon_socket, tmp_path, monkeypatch):
+    (tmp_path / "slow.yaml").write_text("- name: slow\n  type: wait\n  config:\n    seconds: 3\n")
+    monkeypatch.chdir(tmp_path)
+    slow_codes = []
+    slow_client = threading.Thread(target=lambda: slow_codes.append(
+        run_via_daemon(["run", "slow.yaml"], daemon_socket)))
+
+    with patch('builtins.print'):
+        slow_client.start()
+        time.sleep(0.5)
+        start = time.monotonic()
+        assert run_via_daemon(["list-plugins"], daemon_socket) == 0
+        # Served while the slow run is still going, instead of queueing behind it
+        assert time.monotonic() - start < 2
+        assert slow_client.is_alive()
+        slow_client.join()
+
+    assert slow_codes == [0]
+
+
+def test_daemon_logging_reaches_the_client(daemon_socket, tmp_path, capsys, monkeypatch):
+    (tmp_path / "tasks.yaml").write_text("- name: greet\n  type: log\n  config:\n    message: hi\n")
+    monkeypatch.chdir(tmp_path)
+
+    assert run_via_daemon(["run", "--verbose", "tasks.yaml"], daemon_socket) == 0
+    assert "Loaded 1 tasks" in capsys.readouterr().err
+
+
+def test_log_to_restores_handler_streams():
+    handler = logging.StreamHandler(io.StringIO())
+    previous_stream = handler.stream
+    stream = io.StringIO()
+    logging.getLogger().addHandler(handler)
+    try:
+        with _log_to(stream):
+            logging.getLogger("taskrunner.test").warning("to the client")
+        logging.getLogger("taskrunner.test").warning("to the daemon")
+    finally:
+        logging.getLogger().removeHandler(handler)
+
+    assert stream.getvalue() == "to the client\n"
+    assert handler.stream is previous_stream
+    assert previous_stream.getvalue() == "to the daemon\n"
+
+
+def test_run_via_daemon_falls_back_when_the_daemon_does_not_answer(tmp_path, monkeypatch):
+    socket_path = str(tmp_path / "busy.sock")
+    monkeypatch.setattr('taskrunner.daemon_client.DAEMON_ANSWER_TIMEOUT', 0.2)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        # Accepted by the kernel but never answered, like a daemon that is stuck
+        listener.bind(socket_path)
+        listener.listen(1)
+        start = time.monotonic()
+        assert run_via_daemon(["list-plugins"], socket_path) is None
+        assert time.monotonic() - start < 2
@@ -1,6 +1,7 @@
 import os
+from unittest.mock import patch
 
-from taskrunner.utils.env_substitution import substitute_env_vars
+from taskrunner.utils.env_substitution import substitute_env_vars, compile_config
 
 
 def test_substitute_env_vars_simple():
@@ -110,4 +111,53 @@ def test_substitute_env_vars_complex_config():
     assert result['database']['credentials']['timeout'] == 30
     assert result['services'][0]['url'] == 'http://localhost:8080/api'
     assert result['services'][1]['url'] == 'https://localhost/v2'
-    assert result['settings']['debug'] is True
\ No newline at end of file
+    assert result['settings']['debug'] is True
+
+def test_compile_config_shares_unchanged_subtrees():
+    os.environ['TEST_VAR'] = 'test_value'
+    payload = {'rows': list(range(1000))}
+    config = {
+        'payload': payload,
+        'nested': {'url': 'http://${TEST_VAR}/api', 'static': {'a': 1}},
+        'items': ['static', '${TEST_VAR}']
+    }
+
+    result = compile_config(config).render()
+
+    assert result['payload'] is payload
+    assert result['nested']['static'] is config['nested']['static']
+    assert result['nested']['url'] == 'http://test_value/api'
+    assert result['items'] == ['static', 'test_value']
+    # The original config is left untouched
+    assert config['nested']['url'] == 'http://${TEST_VAR}/api'
+
+
+def test_compile_config_without_placeholders():
+    config = {'key': 'value', 'dollar': '$HOME {braces}', 'unclosed': '${OPEN'}
+
+    template = compile_config(config)
+
+    assert template.has_placeholders is False
+    assert template.render() is config
+
+
+def test_compile_config_reads_environment_at_render_time():
+    template = compile_config({'key': '${RENDER_TIME_VAR}'})
+
+    os.environ['RENDER_TIME_VAR'] = 'first'
+    assert template.render() == {'key': 'first'}
+    os.environ['RENDER_TIME_VAR'] = 'second'
+    assert template.render() == {'key': 'second'}
+    del os.environ['RENDER_TIME_VAR']
+    assert template.render() == {'key': '${RENDER_TIME_VAR}'}
+
+
+def test_compile_config_memo_shares_compiled_subtrees():
+    shared = {"url": "https://example.com?token=${TOKEN}"}
+    memo = {}
+    first = compile_config({"request": shared, "id": 1}, memo)
+    second = compile_config({"request": shared, "id": 2}, memo)
+
+    assert first._placeholders["request"] is second._placeholders["request"]
+    with patch.dict(os.environ, {"TOKEN": "secret"}):
+        assert second.render() == {"request": {"url": "https://example.com?token=secret"}, "id": 2}
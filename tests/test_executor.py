@@ -1,3 +1,5 @@
+import threading
+import time
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -10,11 +12,17 @@ from taskrunner.tasks.executor import (
     format_task_tag,
     _log_task_execution,
     _execute_single_task,
-    _submit_tasks_for_parallel_execution,
-    _process_completed_tasks,
+    _submit_task,
     _handle_task_result,
-    _run_single_task
+    _run_single_task,
+    run_tasks_in_processes,
+    ProcessTaskPool,
+    _run_in_process_worker,
+    _worker_plugins
 )
+from taskrunner.plugin_base import BaseTaskRunner
+from taskrunner.plugins.file_task import FileTask
+from taskrunner.utils.result_cache import ResultCache
 
 
 def test_get_cpu_count():
@@ -63,8 +71,7 @@ def test_run_tasks_sequentially():
     
     # Mock the helper functions
     with patch('taskrunner.tasks.executor._log_task_execution') as mock_log_execution, \
-         patch('taskrunner.tasks.executor._execute_single_task') as mock_execute_single, \
-         patch('taskrunner.tasks.executor.substitute_env_vars', side_effect=lambda x: x):
+         patch('taskrunner.tasks.executor._execute_single_task') as mock_execute_single:
         
         run_tasks_sequentially(tasks, plugins, verbose=False)
         
@@ -94,85 +101,146 @@ def test_run_tasks_in_parallel():
         "wait": mock_wait_plugin
     }
     
-    # Mock the helper functions
-    with patch('taskrunner.tasks.executor._submit_tasks_for_parallel_execution') as mock_submit, \
-         patch('taskrunner.tasks.executor._process_completed_tasks') as mock_process:
-        
-        # Mock the return value of _submit_tasks_for_parallel_execution
-        mock_submit.return_value = [("future1", "task1"), ("future2", "task2")]
+    # Mock the scheduler loop
+    with patch('taskrunner.tasks.executor._run_dependency_graph') as mock_run_graph:
         
         run_tasks_in_parallel(tasks, plugins, verbose=False)
         
-        # Verify that the functions were called
-        mock_submit.assert_called_once_with(tasks, plugins, False)
-        mock_process.assert_called_once_with([("future1", "task1"), ("future2", "task2")])
+        # Verify that the tasks were handed to the scheduler loop
+        mock_run_graph.assert_called_once_with(tasks, plugins, False, None, None, cache=None, metrics=None,
+                                               checkpoint=None, type_limits=None, type_weights=None,
+                                               batch_sizes=None)
 
 
-def test_submit_tasks_for_parallel_execution():
-    # Create mock tasks
-    task1 = TaskModel(name="task1", type="log", config={"message": "Hello"})
-    task2 = TaskModel(name="task2", type="wait", config={"seconds": 1})
-    tasks = [task1, task2]
-    
-    # Create mock plugins
-    mock_log_plugin = MagicMock()
-    mock_wait_plugin = MagicMock()
-    plugins = {
-        "log": mock_log_plugin,
-        "wait": mock_wait_plugin
-    }
-    
-    # Mock ThreadPoolExecutor
-    with patch('taskrunner.tasks.executor.ThreadPoolExecutor') as mock_executor_class, \
-         patch('taskrunner.tasks.executor.substitute_env_vars', side_effect=lambda x: x), \
-         patch('taskrunner.tasks.executor._run_single_task') as mock_run_single, \
-         patch('taskrunner.tasks.executor.format_task_tag', return_value="TASK"):
-        
-        # Create a mock executor instance
-        mock_executor_instance = MagicMock()
-        mock_executor_class.return_value.__enter__.return_value = mock_executor_instance
-        
-        # Mock print to capture output
-        with patch('builtins.print') as mock_print:
-            result = _submit_tasks_for_parallel_execution(tasks, plugins, verbose=False)
-            
-            # Verify that executor.submit was called for each task
-            assert mock_executor_instance.submit.call_count == 2
-            
-            # Verify that we got the expected result format
-            assert len(result) == 2
-            assert all(isinstance(item, tuple) and len(item) == 2 for item in result)
-
-
-def test_process_completed_tasks():
-    # Create mock futures
-    mock_future1 = MagicMock()
-    mock_future2 = MagicMock()
-    mock_future3 = MagicMock()
-    
-    # Configure the futures to return different results
-    mock_future1.result.return_value = ("success", None)
-    mock_future2.result.return_value = ("error", "Something went wrong")
-    mock_future3.result.side_effect = Exception("Task failed")
-    
-    futures = [
-        (mock_future1, "task1"),
-        (mock_future2, "task2"),
-        (mock_future3, "task3")
+def test_run_tasks_in_parallel_bounds_in_flight_tasks():
+    in_flight = []
+    peak = []
+
+    class RecordingRunner:
+        def run(self, config):
+            time.sleep(0.005)
+
+    def tracking_submit(*args, **kwargs):
+        future = _submit_task(*args, **kwargs)
+        in_flight.append(None)
+        peak.append(len(in_flight))
+        future.add_done_callback(lambda finished: in_flight.pop())
+        return future
+
+    tasks = [TaskModel(name=f"task{i}", type="rec", config={}) for i in range(50)]
+
+    with patch('taskrunner.tasks.executor._submit_task', side_effect=tracking_submit), \
+         patch('builtins.print'):
+        run_tasks_in_parallel(tasks, {"rec": RecordingRunner}, max_workers=2)
+
+    assert len(peak) == 50
+    assert max(peak) <= 4
+
+
+def test_run_tasks_in_parallel_respects_type_limits():
+    lock = threading.Lock()
+    running = {"slow": 0, "fast": 0}
+    peak = {"slow": 0, "fast": 0}
+
+    def make_runner(type_name):
+        class RecordingRunner:
+            def run(self, config):
+                with lock:
+                    running[type_name] += 1
+                    peak[type_name] = max(peak[type_name], running[type_name])
+                time.sleep(0.01)
+                with lock:
+                    running[type_name] -= 1
+        return RecordingRunner
+
+    tasks = [TaskModel(name=f"{type_name}{i}", type=type_name, config={})
+             for i in range(10) for type_name in ("slow", "fast")]
+    plugins = {"slow": make_runner("slow"), "fast": make_runner("fast")}
+
+    with patch('builtins.print'):
+        run_tasks_in_parallel(tasks, plugins, max_workers=4, type_limits={"slow": 1})
+
+    assert peak["slow"] == 1
+    assert peak["fast"] > 1
+
+
+def test_run_tasks_in_parallel_starts_higher_priority_first():
+    started = []
+
+    class RecordingRunner:
+        def run(self, config):
+            started.append(config["name"])
+
+    tasks = [TaskModel(name=f"task{i}", type="rec", config={"name": f"task{i}"}, priority=i % 3)
+             for i in range(6)]
+    tasks.append(TaskModel(name="gate", type="rec", config={"name": "gate"}))
+    for task in tasks[:6]:
+        task.depends_on = ["gate"]
+
+    with patch('builtins.print'):
+        run_tasks_in_parallel(tasks, {"rec": RecordingRunner}, max_workers=1)
+
+    assert started == ["gate", "task2", "task5", "task1", "task4", "task0", "task3"]
+
+
+def test_run_tasks_in_parallel_orders_lists_without_dependencies_by_priority():
+    started = []
+
+    class RecordingRunner:
+        def run(self, config):
+            started.append(config["name"])
+
+    tasks = [TaskModel(name=f"task{i}", type="rec", config={"name": f"task{i}"}) for i in range(100)]
+    tasks.append(TaskModel(name="urgent", type="rec", config={"name": "urgent"}, priority=10))
+
+    with patch('builtins.print'):
+        run_tasks_in_parallel(tasks, {"rec": RecordingRunner}, max_workers=1)
+
+    assert started[0] == "urgent"
+    assert started[1:] == [f"task{i}" for i in range(100)]
+
+
+def test_run_tasks_in_parallel_does_not_starve_types_behind_a_type_limit():
+    lock = threading.Lock()
+    finished = []
+
+    class RecordingRunner:
+        def run(self, config):
+            if config.get("seconds"):
+                time.sleep(config["seconds"])
+            with lock:
+                finished.append(config["name"])
+
+    tasks = [TaskModel(name=f"wait{i}", type="wait", config={"name": f"wait{i}", "seconds": 0.005})
+             for i in range(50)]
+    tasks += [TaskModel(name=f"fast{i}", type="fast", config={"name": f"fast{i}"}) for i in range(5)]
+
+    with patch('builtins.print'):
+        run_tasks_in_parallel(tasks, {"wait": RecordingRunner, "fast": RecordingRunner}, max_workers=4,
+                              type_limits={"wait": 1})
+
+    assert len(finished) == 55
+    assert max(finished.index(f"fast{i}") for i in range(5)) < 10
+
+
+def test_run_tasks_in_parallel_reports_failures_as_they_happen():
+    class SlowOrBrokenRunner:
+        def run(self, config):
+            if config.get("fail"):
+                raise Exception("boom")
+            time.sleep(0.2)
+
+    tasks = [
+        TaskModel(name="slow", type="rec", config={}),
+        TaskModel(name="broken", type="rec", config={"fail": True}),
     ]
-    
-    # Mock the helper function
-    with patch('taskrunner.tasks.executor._handle_task_result') as mock_handle_result, \
-         patch('taskrunner.tasks.executor.format_task_tag', return_value="TASK"), \
-         patch('builtins.print') as mock_print:
-        
-        _process_completed_tasks(futures)
-        
-        # Verify that successful results are passed to _handle_task_result
-        mock_handle_result.assert_any_call(("success", None), "task1")
-        
-        # Verify that exceptions are caught and printed (should be 1 call for the exception)
-        assert mock_print.call_count == 1
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_in_parallel(tasks, {"rec": SlowOrBrokenRunner}, max_workers=2)
+
+    printed = [call[0][0] for call in mock_print.call_args_list]
+    assert printed.index("[BROKEN] Task 'broken' failed: boom") < \
+        printed.index("[SLOW] Task 'slow' completed successfully")
 
 
 def test_handle_task_result():
@@ -296,4 +364,383 @@ def test_execute_single_task_with_exception():
             _execute_single_task(mock_runner, task, {"message": "Hello"})
         
         # Verify that error message was printed
-        mock_print.assert_called_with("[TEST TASK] Task 'test_task' failed: Task failed")
\ No newline at end of file
+        mock_print.assert_called_with("[TEST TASK] Task 'test_task' failed: Task failed")
+
+def test_run_tasks_sequentially_respects_dependencies():
+    task1 = TaskModel(name="task1", type="log", config={}, depends_on=["task2"])
+    task2 = TaskModel(name="task2", type="log", config={})
+    plugins = {"log": MagicMock()}
+
+    with patch('taskrunner.tasks.executor._log_task_execution'), \
+         patch('taskrunner.tasks.executor._execute_single_task') as mock_execute_single:
+
+        run_tasks_sequentially([task1, task2], plugins, verbose=False)
+
+        executed = [call[0][1].name for call in mock_execute_single.call_args_list]
+        assert executed == ["task2", "task1"]
+
+
+def test_run_tasks_in_parallel_with_dependencies():
+    executed = []
+
+    class RecordingRunner:
+        def run(self, config):
+            executed.append(config["name"])
+            if config["name"] == "broken":
+                raise Exception("boom")
+
+    tasks = [
+        TaskModel(name="last", type="rec", config={"name": "last"}, depends_on=["first", "second"]),
+        TaskModel(name="first", type="rec", config={"name": "first"}),
+        TaskModel(name="second", type="rec", config={"name": "second"}, depends_on=["first"]),
+        TaskModel(name="broken", type="rec", config={"name": "broken"}),
+        TaskModel(name="after_broken", type="rec", config={"name": "after_broken"}, depends_on=["broken"]),
+    ]
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_in_parallel(tasks, {"rec": RecordingRunner}, verbose=False)
+
+    assert "after_broken" not in executed
+    assert executed.index("first") < executed.index("second") < executed.index("last")
+    mock_print.assert_any_call("[AFTER BROKEN] Task 'after_broken' skipped: dependency 'broken' failed")
+
+
+
+def test_process_task_pool_handles():
+    class ThreadPlugin(BaseTaskRunner):
+        type_name = "thread_plugin"
+
+    class ProcessPlugin(BaseTaskRunner):
+        type_name = "process_plugin"
+        execution = "process"
+
+    pool = ProcessTaskPool()
+    assert pool.handles(ThreadPlugin) is False
+    assert pool.handles(ProcessPlugin) is True
+    assert ProcessTaskPool(run_all=True).handles(ThreadPlugin) is True
+
+
+def test_run_in_process_worker():
+    class Plugin(BaseTaskRunner):
+        type_name = "plugin"
+
+        def run(self, config):
+            if config.get("fail"):
+                raise Exception("Task failed")
+
+    with patch.dict(_worker_plugins, {"plugin": Plugin}, clear=True):
+        assert _run_in_process_worker("plugin", {})[:2] == ("success", None)
+        assert _run_in_process_worker("plugin", {"fail": True})[:2] == ("error", "Task failed")
+        assert _run_in_process_worker("missing", {})[0] == "error"
+
+
+def test_run_tasks_in_processes(tmp_path):
+    tasks = [
+        TaskModel(name=f"create{i}", type="file",
+                  config={"action": "create", "path": str(tmp_path / f"file{i}.txt"), "content": str(i)})
+        for i in range(3)
+    ]
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_in_processes(tasks, {"file": FileTask}, max_workers=2)
+
+    for i in range(3):
+        assert (tmp_path / f"file{i}.txt").read_text() == str(i)
+    mock_print.assert_any_call("[CREATE0] Task 'create0' completed successfully")
+
+
+
+def test_run_tasks_in_parallel_with_streamed_tasks():
+    executed = []
+
+    class RecordingRunner:
+        def run(self, config):
+            executed.append(config["name"])
+
+    def stream():
+        yield TaskModel(name="first", type="rec", config={"name": "first"})
+        yield TaskModel(name="second", type="rec", config={"name": "second"}, depends_on=["first"])
+        yield TaskModel(name="third", type="rec", config={"name": "third"})
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_in_parallel(stream(), {"rec": RecordingRunner}, verbose=False)
+
+    assert sorted(executed) == ["first", "second", "third"]
+    assert executed.index("first") < executed.index("second")
+    mock_print.assert_any_call("Running streamed tasks in parallel")
+
+
+def test_run_tasks_sequentially_skips_cached_tasks(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    runs = []
+
+    class CountingPlugin(BaseTaskRunner):
+        type_name = "counting"
+        cacheable = True
+
+        def run(self, config):
+            runs.append(config["value"])
+
+    tasks = [TaskModel(name="task1", type="counting", config={"value": 1})]
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_sequentially(tasks, {"counting": CountingPlugin}, cache=cache)
+        run_tasks_sequentially(tasks, {"counting": CountingPlugin}, cache=cache)
+
+    assert runs == [1]
+    mock_print.assert_any_call("[TASK1] Task 'task1' is up to date, skipping")
+
+
+def test_run_tasks_in_parallel_skips_cached_tasks(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    runs = []
+
+    class CountingPlugin(BaseTaskRunner):
+        type_name = "counting"
+        cacheable = True
+
+        def run(self, config):
+            runs.append(config["value"])
+
+    tasks = [TaskModel(name=f"task{i}", type="counting", config={"value": i}) for i in range(3)]
+
+    with patch('builtins.print'):
+        run_tasks_in_parallel(tasks, {"counting": CountingPlugin}, cache=cache)
+        run_tasks_in_parallel(tasks + [TaskModel(name="task3", type="counting", config={"value": 3})],
+                              {"counting": CountingPlugin}, cache=cache)
+
+    assert sorted(runs) == [0, 1, 2, 3]
+
+
+def test_run_tasks_sequentially_batches_consecutive_tasks():
+    batches = []
+
+    class BatchPlugin(BaseTaskRunner):
+        type_name = "batch"
+        max_batch_size = 3
+
+        def run(self, config):
+            raise AssertionError("batched tasks should not run one at a time")
+
+        def run_batch(self, configs):
+            batches.append([config["value"] for config in configs])
+            return [None] * len(configs)
+
+    tasks = [TaskModel(name=f"task{i}", type="batch", config={"value": i}) for i in range(5)]
+    tasks.append(TaskModel(name="after", type="batch", config={"value": 5}, depends_on=["task4"]))
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_sequentially(tasks, {"batch": BatchPlugin})
+
+    # Split by max_batch_size, and again where a task depends on one in the current batch
+    assert batches == [[0, 1, 2], [3, 4], [5]]
+    mock_print.assert_any_call("[TASK3] Task 'task3' completed successfully")
+
+
+def test_run_tasks_sequentially_reports_batch_failures_per_task():
+    class BatchPlugin(BaseTaskRunner):
+        type_name = "batch"
+        max_batch_size = 10
+
+        def run_batch(self, configs):
+            return [ValueError("boom") if config["value"] == 1 else None for config in configs]
+
+    tasks = [TaskModel(name=f"task{i}", type="batch", config={"value": i}) for i in range(3)]
+
+    with patch('builtins.print') as mock_print:
+        with pytest.raises(ValueError):
+            run_tasks_sequentially(tasks, {"batch": BatchPlugin})
+
+    mock_print.assert_any_call("[TASK0] Task 'task0' completed successfully")
+    mock_print.assert_any_call("[TASK1] Task 'task1' failed: boom")
+    mock_print.assert_any_call("[TASK2] Task 'task2' completed successfully")
+
+
+def _file_tasks(tmp_path):
+    return [TaskModel(name="broken", type="file", config={"action": "create", "path": str(tmp_path / "no" / "x")}),
+            TaskModel(name="after", type="file", config={"action": "create", "path": str(tmp_path / "after.txt")})]
+
+
+def test_run_tasks_sequentially_stops_at_the_first_failed_file_task(tmp_path):
+    with patch('builtins.print') as mock_print:
+        with pytest.raises(FileNotFoundError):
+            run_tasks_sequentially(_file_tasks(tmp_path), {"file": FileTask})
+
+    # File tasks are not batched unless asked to, so nothing after the failure runs
+    assert not (tmp_path / "after.txt").exists()
+    mock_print.assert_any_call(f"[FileTask] Creating file {tmp_path / 'no' / 'x'}")
+
+
+def test_run_tasks_sequentially_batches_file_tasks_when_asked_to(tmp_path):
+    with patch.object(FileTask, "run_batch", autospec=True, side_effect=FileTask.run_batch) as run_batch, \
+            patch('builtins.print') as mock_print:
+        with pytest.raises(FileNotFoundError):
+            run_tasks_sequentially(_file_tasks(tmp_path), {"file": FileTask}, batch_sizes={"file": 10})
+
+    # The batch runs as a whole before its failure stops the run
+    assert run_batch.call_count == 1
+    assert (tmp_path / "after.txt").read_text() == ""
+    mock_print.assert_any_call(f"[FileTask] File {tmp_path / 'after.txt'} created successfully")
+    mock_print.assert_any_call("[AFTER] Task 'after' completed successfully")
+
+
+def test_run_tasks_in_parallel_batches_file_tasks_when_asked_to(tmp_path):
+    tasks = [TaskModel(name=f"task{i}", type="file", config={"action": "create", "path": str(tmp_path / f"{i}.txt")})
+             for i in range(20)]
+
+    with patch.object(FileTask, "run_batch", autospec=True, side_effect=FileTask.run_batch) as run_batch, \
+            patch('builtins.print'):
+        run_tasks_in_parallel(tasks, {"file": FileTask}, max_workers=2)
+        assert run_batch.call_count == 0
+        run_tasks_in_parallel(tasks, {"file": FileTask}, max_workers=2, batch_sizes={"file": 10})
+
+    assert run_batch.call_count == 2
+    assert len(list(tmp_path.iterdir())) == 20
+
+
+def test_run_tasks_sequentially_runs_tasks_with_retries_alone():
+    calls = []
+
+    class BatchPlugin(BaseTaskRunner):
+        type_name = "batch"
+        max_batch_size = 10
+
+        def run(self, config):
+            calls.append(("run", config["value"]))
+
+        def run_batch(self, configs):
+            calls.append(("batch", [config["value"] for config in configs]))
+            return [None] * len(configs)
+
+    tasks = [TaskModel(name="task0", type="batch", config={"value": 0}),
+             TaskModel(name="task1", type="batch", config={"value": 1}, retries=2),
+             TaskModel(name="task2", type="batch", config={"value": 2})]
+
+    with patch('builtins.print'):
+        run_tasks_sequentially(tasks, {"batch": BatchPlugin})
+
+    assert calls == [("batch", [0]), ("run", 1), ("batch", [2])]
+
+
+def _batch_plugin(batches, max_batch_size=10, max_batch_latency=0.0, fail_on=None):
+    class BatchPlugin(BaseTaskRunner):
+        type_name = "batch"
+
+        def run(self, config):
+            raise AssertionError("batched tasks should not run one at a time")
+
+        def run_batch(self, configs):
+            batches.append(sorted(config["value"] for config in configs))
+            return [ValueError("boom") if config["value"] == fail_on else None for config in configs]
+
+    BatchPlugin.max_batch_size = max_batch_size
+    BatchPlugin.max_batch_latency = max_batch_latency
+    return BatchPlugin
+
+
+def test_run_tasks_in_parallel_coalesces_ready_tasks():
+    batches = []
+    tasks = [TaskModel(name=f"task{i}", type="batch", config={"value": i}) for i in range(25)]
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_in_parallel(tasks, {"batch": _batch_plugin(batches)}, max_workers=2)
+
+    assert sorted(value for batch in batches for value in batch) == list(range(25))
+    assert max(len(batch) for batch in batches) == 10
+    mock_print.assert_any_call("[TASK24] Task 'task24' completed successfully")
+
+
+def test_run_tasks_in_parallel_maps_batch_failures_to_tasks():
+    batches = []
+    tasks = [TaskModel(name=f"task{i}", type="batch", config={"value": i}) for i in range(3)]
+    tasks.append(TaskModel(name="after", type="batch", config={"value": 3}, depends_on=["task1"]))
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_in_parallel(tasks, {"batch": _batch_plugin(batches, fail_on=1)})
+
+    assert batches == [[0, 1, 2]]
+    mock_print.assert_any_call("[TASK0] Task 'task0' completed successfully")
+    mock_print.assert_any_call("[TASK1] Task 'task1' failed: boom")
+    mock_print.assert_any_call("[AFTER] Task 'after' skipped: dependency 'task1' failed")
+
+
+def test_run_tasks_in_parallel_batch_waits_for_tasks_becoming_ready():
+    batches = []
+
+    class GatePlugin(BaseTaskRunner):
+        type_name = "gate"
+
+        def run(self, config):
+            time.sleep(0.2)
+
+    tasks = [TaskModel(name="gate", type="gate", config={})]
+    tasks += [TaskModel(name=f"task{i}", type="batch", config={"value": i}) for i in range(3)]
+    tasks += [TaskModel(name=f"later{i}", type="batch", config={"value": 3 + i}, depends_on=["gate"])
+              for i in range(2)]
+    plugins = {"gate": GatePlugin, "batch": _batch_plugin(batches, max_batch_latency=10)}
+
+    started = time.perf_counter()
+    with patch('builtins.print'):
+        run_tasks_in_parallel(tasks, plugins)
+
+    # The partial batch took in the tasks freed by the gate, and ran as soon as nothing else could
+    # add to it instead of waiting out the latency
+    assert batches == [[0, 1, 2, 3, 4]]
+    assert time.perf_counter() - started < 5
+
+
+def test_run_tasks_in_parallel_batches_around_tasks_that_run_alone():
+    batches = []
+
+    class SlowPlugin(BaseTaskRunner):
+        type_name = "slow"
+
+        def run(self, config):
+            time.sleep(0.3)
+
+    class MixedPlugin(BaseTaskRunner):
+        type_name = "mixed"
+        max_batch_size = 8
+        max_batch_latency = 0.05
+
+        def run(self, config):
+            batches.append([config["name"]])
+
+        def run_batch(self, configs):
+            batches.append(sorted(config["name"] for config in configs))
+            return [None] * len(configs)
+
+    # The slow task keeps a partial batch forming while tasks with retries, which run alone, sit
+    # between the batchable tasks freed by the gate
+    tasks = [TaskModel(name="slow", type="slow", config={}),
+             TaskModel(name="gate", type="mixed", config={"name": "gate"}, retries=1)]
+    tasks += [TaskModel(name=name, type="mixed", config={"name": name}, depends_on=["gate"],
+                        retries=1 if name.startswith("r") else None)
+              for name in ["a", "r1", "b", "r2", "c"]]
+
+    finished = threading.Event()
+
+    def run():
+        with patch('builtins.print'):
+            run_tasks_in_parallel(tasks, {"slow": SlowPlugin, "mixed": MixedPlugin}, max_workers=4)
+        finished.set()
+
+    threading.Thread(target=run, daemon=True).start()
+    assert finished.wait(10)
+    assert sorted(name for batch in batches for name in batch) == ["a", "b", "c", "gate", "r1", "r2"]
+    assert ["a", "b", "c"] in batches
+
+
+def test_run_tasks_sequentially_streamed_batches_respect_latency():
+    def stream():
+        for i in range(3):
+            time.sleep(0.05)
+            yield TaskModel(name=f"task{i}", type="batch", config={"value": i})
+
+    waiting, patient = [], []
+    with patch('builtins.print'):
+        run_tasks_sequentially(stream(), {"batch": _batch_plugin(waiting, max_batch_latency=0.0)})
+        run_tasks_sequentially(stream(), {"batch": _batch_plugin(patient, max_batch_latency=10)})
+
+    assert waiting == [[0], [1], [2]]
+    assert patient == [[0, 1, 2]]
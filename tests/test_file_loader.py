@@ -3,7 +3,15 @@ import json
 import yaml
 import tempfile
 import os
-from taskrunner.utils.file_loader import load_tasks_from_file, FileLoaderMessages
+from unittest.mock import patch
+from taskrunner.utils.file_loader import (
+    load_tasks_from_file,
+    iter_tasks_from_file,
+    load_task_records,
+    iter_task_records,
+    FileLoaderMessages
+)
+from taskrunner.models.task_record import TaskRecord
 from taskrunner.models.task_model import TaskModel
 
 
@@ -112,4 +120,175 @@ def test_load_tasks_invalid_format():
         
         assert FileLoaderMessages.INVALID_TASKS_FORMAT.value in str(exc_info.value)
     finally:
-        os.unlink(temp_file_path)
\ No newline at end of file
+        os.unlink(temp_file_path)
+
+
+def test_load_tasks_from_jsonl_file():
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as f:
+        f.write(json.dumps({"name": "task1", "type": "log", "config": {"message": "Hello"}}) + "\n")
+        f.write("\n")
+        f.write(json.dumps({"name": "task2", "type": "wait", "config": {"seconds": 1}}) + "\n")
+        temp_file_path = f.name
+
+    try:
+        tasks = load_tasks_from_file(temp_file_path)
+
+        assert [task.name for task in tasks] == ["task1", "task2"]
+        assert tasks[1].config == {"seconds": 1}
+    finally:
+        os.unlink(temp_file_path)
+
+
+def test_load_task_records_shares_configs():
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as f:
+        for i in range(3):
+            f.write(json.dumps({"name": f"task{i}", "type": "log", "config": {"message": "Hello"}}) + "\n")
+        temp_file_path = f.name
+
+    try:
+        records = load_task_records(temp_file_path)
+        streamed = list(iter_task_records(temp_file_path))
+
+        assert [record.name for record in records] == ["task0", "task1", "task2"]
+        assert all(isinstance(record, TaskRecord) for record in records + streamed)
+        assert records[0].config is records[2].config
+        assert streamed[2].config == {"message": "Hello"}
+    finally:
+        os.unlink(temp_file_path)
+
+
+def test_load_tasks_expands_matrix_entries():
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+        yaml.safe_dump([
+            {"name": "log-${matrix.region}", "type": "log", "matrix": {"region": ["us", "eu"]},
+             "config": {"message": "hello ${matrix.region}"}},
+            {"name": "done", "type": "log", "config": {"message": "done"}},
+        ], f)
+        temp_file_path = f.name
+
+    try:
+        tasks = load_tasks_from_file(temp_file_path)
+
+        assert [task.name for task in tasks] == ["log-us", "log-eu", "done"]
+        assert tasks[1].config == {"message": "hello eu"}
+    finally:
+        os.unlink(temp_file_path)
+
+
+def test_load_tasks_from_multi_document_yaml_file():
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+        yaml.dump_all([
+            {"name": "task1", "type": "log", "config": {"message": "Hello"}},
+            {"name": "task2", "type": "log", "config": {"message": "World"}}
+        ], f)
+        temp_file_path = f.name
+
+    try:
+        tasks = load_tasks_from_file(temp_file_path)
+
+        assert [task.name for task in tasks] == ["task1", "task2"]
+    finally:
+        os.unlink(temp_file_path)
+
+
+def test_iter_tasks_from_json_file_across_chunk_boundaries():
+    test_tasks = [
+        {"name": f"task{i}", "type": "log", "config": {"message": "x" * i, "count": i * 1000}}
+        for i in range(20)
+    ]
+
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        json.dump(test_tasks, f, indent=2)
+        temp_file_path = f.name
+
+    try:
+        # A tiny chunk size forces elements and numbers to be split between reads
+        with patch('taskrunner.utils.file_loader.JSON_READ_CHUNK_SIZE', 7):
+            tasks = list(iter_tasks_from_file(temp_file_path))
+
+        assert [task.name for task in tasks] == [t["name"] for t in test_tasks]
+        assert [task.config for task in tasks] == [t["config"] for t in test_tasks]
+    finally:
+        os.unlink(temp_file_path)
+
+
+@pytest.mark.parametrize("content", [
+    '[{"name": "a", "type": "log"} {"name": "b", "type": "log"}]',
+    '[,{"name": "a", "type": "log"}]',
+    '[{"name": "a", "type": "log"},,{"name": "b", "type": "log"}]',
+    '[{"name": "a", "type": "log"},]',
+    '[{"name": "a", "type": "log"}] junk',
+    '[{"name": "a", "type": "log"}',
+])
+def test_iter_tasks_from_json_file_rejects_malformed_arrays(content, tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text(content)
+
+    # Small chunks as well as one read, so separators split across chunks are checked too
+    for chunk_size in (3, 64 * 1024):
+        with patch('taskrunner.utils.file_loader.JSON_READ_CHUNK_SIZE', chunk_size):
+            with pytest.raises(ValueError):
+                list(iter_tasks_from_file(str(path)))
+        with pytest.raises(ValueError):
+            json.loads(content)
+
+
+def test_iter_tasks_from_json_file_with_long_leading_whitespace(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text(" " * 20 + "\n" * 20 + '[ {"name": "a", "type": "log"} ,\n {"name": "b", "type": "log"} ]\n\n  ')
+
+    with patch('taskrunner.utils.file_loader.JSON_READ_CHUNK_SIZE', 8):
+        tasks = list(iter_tasks_from_file(str(path)))
+
+    assert [task.name for task in tasks] == ["a", "b"]
+
+
+def test_iter_tasks_from_json_file_large_element_is_decoded_a_few_times(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps([{"name": "big", "type": "log", "config": {"message": "x" * 100000}}]))
+
+    with patch('taskrunner.utils.file_loader.JSON_READ_CHUNK_SIZE', 64), \
+            patch('json.JSONDecoder.raw_decode', autospec=True, side_effect=json.JSONDecoder.raw_decode) as raw_decode:
+        tasks = list(iter_tasks_from_file(str(path)))
+
+    assert len(tasks[0].config["message"]) == 100000
+    # Reads grow with the unparsed element, so there is no decode attempt per 64-character chunk
+    assert raw_decode.call_count < 20
+
+
+def test_iter_tasks_from_json_file_empty_array(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text("  [ ]  ")
+
+    assert list(iter_tasks_from_file(str(path))) == []
+
+
+def test_iter_tasks_from_file_is_lazy():
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as f:
+        f.write(json.dumps({"name": "task1", "type": "log"}) + "\n")
+        f.write("not json\n")
+        temp_file_path = f.name
+
+    try:
+        tasks = iter_tasks_from_file(temp_file_path)
+
+        # The first task is available before the broken line is parsed
+        assert next(tasks).name == "task1"
+        with pytest.raises(ValueError):
+            next(tasks)
+    finally:
+        os.unlink(temp_file_path)
+
+
+def test_iter_tasks_invalid_entry():
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        json.dump([{"name": "task1", "type": "log"}, "not a task"], f)
+        temp_file_path = f.name
+
+    try:
+        with pytest.raises(ValueError) as exc_info:
+            load_tasks_from_file(temp_file_path)
+
+        assert FileLoaderMessages.INVALID_TASK_ENTRY.value.format("index 1") in str(exc_info.value)
+    finally:
+        os.unlink(temp_file_path)
@@ -1,3 +1,5 @@
+import os
+import stat
 from unittest.mock import patch, mock_open
 
 import pytest
@@ -156,4 +158,82 @@ def test_file_task_run_invalid_action():
     }
     
     with pytest.raises(ValidationError):
-        task.run(config)
\ No newline at end of file
+        task.run(config)
+
+def test_file_task_run_batch_creates_and_deletes(tmp_path):
+    task = FileTask()
+    (tmp_path / "old.txt").write_text("old")
+    configs = [
+        {"action": "create", "path": str(tmp_path / f"file{i}.txt"), "content": str(i)} for i in range(20)
+    ] + [
+        {"action": "delete", "path": str(tmp_path / "old.txt")},
+        {"action": "delete", "path": str(tmp_path / "missing.txt")},
+    ]
+
+    with patch('builtins.print') as mock_print:
+        results = task.run_batch(configs)
+
+    assert results == [None] * len(configs)
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(f"file{i}.txt" for i in range(20))
+    assert (tmp_path / "file7.txt").read_text() == "7"
+    # Each file is reported like a single run would
+    mock_print.assert_any_call(f"[FileTask] Creating file {tmp_path / 'file7.txt'}")
+    mock_print.assert_any_call(f"[FileTask] File {tmp_path / 'file7.txt'} created successfully")
+    mock_print.assert_any_call(f"[FileTask] File {tmp_path / 'old.txt'} deleted successfully")
+    mock_print.assert_any_call(f"[FileTask] File {tmp_path / 'missing.txt'} does not exist")
+
+
+def test_file_task_run_batch_keeps_order_per_path(tmp_path):
+    path = str(tmp_path / "file.txt")
+    configs = [
+        {"action": "create", "path": path, "content": "first"},
+        {"action": "delete", "path": path},
+        {"action": "create", "path": path, "content": "second"},
+        {"action": "create", "path": str(tmp_path / "other.txt"), "content": "other"},
+    ]
+
+    with patch('builtins.print'):
+        assert FileTask().run_batch(configs) == [None] * 4
+    assert (tmp_path / "file.txt").read_text() == "second"
+
+
+def test_file_task_run_batch_reports_errors_per_config(tmp_path):
+    configs = [
+        {"action": "create", "path": str(tmp_path / "missing" / "file.txt")},
+        {"action": "create", "path": str(tmp_path / "ok.txt")},
+        {"action": "invalid", "path": str(tmp_path / "x.txt")},
+    ]
+
+    with patch('builtins.print'):
+        results = FileTask().run_batch(configs)
+
+    assert isinstance(results[0], FileNotFoundError)
+    assert results[1] is None
+    assert isinstance(results[2], ValidationError)
+    # Failed writes leave no temporary files behind
+    assert [path.name for path in tmp_path.iterdir()] == ["ok.txt"]
+
+
+def test_file_task_run_batch_writes_through_symlinks(tmp_path):
+    (tmp_path / "real.txt").write_text("old")
+    (tmp_path / "link.txt").symlink_to(tmp_path / "real.txt")
+
+    with patch('builtins.print'):
+        assert FileTask().run_batch([{"action": "create", "path": str(tmp_path / "link.txt"), "content": "new"}]) == [None]
+
+    # The link is kept and the file it points to is overwritten, as a single run would
+    assert (tmp_path / "link.txt").is_symlink()
+    assert (tmp_path / "real.txt").read_text() == "new"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["link.txt", "real.txt"]
+
+
+def test_file_task_run_batch_keeps_the_mode_of_an_overwritten_file(tmp_path):
+    path = tmp_path / "secret.txt"
+    path.write_text("old")
+    os.chmod(path, 0o640)
+
+    with patch('builtins.print'):
+        assert FileTask().run_batch([{"action": "create", "path": str(path), "content": "new"}]) == [None]
+
+    assert path.read_text() == "new"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
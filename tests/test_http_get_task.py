@@ -2,6 +2,8 @@ import pytest
 from unittest.mock import patch, MagicMock
 import requests
 from taskrunner.plugins.http_get_task import HttpGetTask, HttpGetTaskConfig
+from taskrunner.tasks.retry import call_with_timeout
+from taskrunner.utils.http_session import DEFAULT_TIMEOUT
 
 
 def test_http_get_task_config_creation():
@@ -36,17 +38,19 @@ def test_http_get_task_run_method():
     task = HttpGetTask()
     config = {"url": "https://example.com"}
     
-    # Mock requests.get to avoid actual HTTP request
+    # Mock the shared session to avoid actual HTTP request
     mock_response = MagicMock()
     mock_response.status_code = 200
     
-    with patch('requests.get', return_value=mock_response) as mock_get:
+    with patch('taskrunner.plugins.http_get_task.get_http_session') as mock_session:
+        mock_get = mock_session.return_value.get
+        mock_get.return_value = mock_response
         # Mock print to capture output
         with patch('builtins.print') as mock_print:
             task.run(config)
             
-            # Verify that requests.get was called with the correct URL
-            mock_get.assert_called_once_with("https://example.com")
+            # Verify that the shared session was called with the correct URL
+            mock_get.assert_called_once_with("https://example.com", timeout=DEFAULT_TIMEOUT)
             
             # Verify that print was called with the expected messages
             assert mock_print.call_count == 2
@@ -58,17 +62,19 @@ def test_http_get_task_run_method_with_error_status():
     task = HttpGetTask()
     config = {"url": "https://example.com"}
     
-    # Mock requests.get to return an error status
+    # Mock the shared session to return an error status
     mock_response = MagicMock()
     mock_response.status_code = 404
     
-    with patch('requests.get', return_value=mock_response) as mock_get:
+    with patch('taskrunner.plugins.http_get_task.get_http_session') as mock_session:
+        mock_get = mock_session.return_value.get
+        mock_get.return_value = mock_response
         # Mock print to capture output
         with patch('builtins.print') as mock_print:
             task.run(config)
             
-            # Verify that requests.get was called with the correct URL
-            mock_get.assert_called_once_with("https://example.com")
+            # Verify that the shared session was called with the correct URL
+            mock_get.assert_called_once_with("https://example.com", timeout=DEFAULT_TIMEOUT)
             
             # Verify that print was called with the expected messages
             assert mock_print.call_count == 2
@@ -80,8 +86,9 @@ def test_http_get_task_run_method_with_request_exception():
     task = HttpGetTask()
     config = {"url": "https://example.com"}
     
-    # Mock requests.get to raise an exception
-    with patch('requests.get', side_effect=requests.RequestException("Connection error")):
+    # Mock the shared session to raise an exception
+    with patch('taskrunner.plugins.http_get_task.get_http_session') as mock_session:
+        mock_session.return_value.get.side_effect = requests.RequestException("Connection error")
         # Mock print to capture output
         with patch('builtins.print') as mock_print:
             # Should raise the exception
@@ -89,4 +96,30 @@ def test_http_get_task_run_method_with_request_exception():
                 task.run(config)
             
             # Verify that print was called with the GET message but not the status message
-            mock_print.assert_called_once_with("[HttpGetTask] GET https://example.com")
\ No newline at end of file
+            mock_print.assert_called_once_with("[HttpGetTask] GET https://example.com")
+
+
+def test_http_get_task_run_method_with_timeout():
+    task = HttpGetTask()
+
+    with patch('taskrunner.plugins.http_get_task.get_http_session') as mock_session, \
+         patch('builtins.print'):
+        task.run({"url": "https://example.com", "timeout": 2.5})
+
+        mock_session.return_value.get.assert_called_once_with("https://example.com", timeout=2.5)
+
+
+def test_http_get_task_request_ends_within_the_task_timeout():
+    task = HttpGetTask()
+
+    with patch('taskrunner.plugins.http_get_task.get_http_session') as mock_session, \
+         patch('builtins.print'):
+        call_with_timeout(task.run, 1.5, {"url": "https://example.com", "timeout": 2.5})
+        call_with_timeout(task.run, 5, {"url": "https://example.com", "timeout": 2.5})
+
+    assert [call.kwargs["timeout"] for call in mock_session.return_value.get.call_args_list] == [1.5, 2.5]
+
+
+def test_http_get_task_config_invalid_timeout():
+    with pytest.raises(Exception):
+        HttpGetTaskConfig(url="https://example.com", timeout=0)
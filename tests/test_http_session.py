@@ -0,0 +1,53 @@
+import threading
+
+from taskrunner.utils.http_session import (
+    configure_http_session,
+    get_http_session,
+    close_http_session,
+    get_default_timeout,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT
+)
+
+
+def teardown_function():
+    configure_http_session(DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, DEFAULT_TIMEOUT)
+
+
+def test_get_http_session_is_shared_across_threads():
+    close_http_session()
+    sessions = []
+
+    threads = [threading.Thread(target=lambda: sessions.append(get_http_session())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(session) for session in sessions}) == 1
+
+
+def test_configure_http_session_applies_pool_limits():
+    configure_http_session(pool_connections=3, pool_maxsize=7, timeout=5)
+
+    adapter = get_http_session().get_adapter("https://example.com")
+
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    assert adapter._pool_block is True
+    assert get_default_timeout() == 5
+
+
+def test_configure_http_session_replaces_existing_session():
+    first = get_http_session()
+    configure_http_session(pool_maxsize=4)
+
+    assert get_http_session() is not first
+
+
+def test_close_http_session():
+    first = get_http_session()
+    close_http_session()
+
+    assert get_http_session() is not first
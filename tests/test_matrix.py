@@ -0,0 +1,76 @@
+import pytest
+
+from taskrunner.utils.matrix import MatrixMessages, expand_entry, has_matrix
+
+
+def test_entry_without_matrix_is_unchanged():
+    entry = {"name": "task1", "type": "log", "config": {"message": "hi"}}
+
+    assert has_matrix(entry) is False
+    assert list(expand_entry(entry)) == [entry]
+
+
+def test_matrix_expands_cartesian_product():
+    entry = {
+        "name": "fetch-${matrix.region}-${matrix.endpoint}",
+        "type": "http_get",
+        "matrix": {"region": ["us", "eu"], "endpoint": ["users", "orders"]},
+        "config": {"url": "https://${matrix.region}.example.com/${matrix.endpoint}", "headers": {"Accept": "*/*"}},
+    }
+
+    expanded = list(expand_entry(entry))
+
+    assert [task["name"] for task in expanded] == ["fetch-us-users", "fetch-us-orders", "fetch-eu-users",
+                                                   "fetch-eu-orders"]
+    assert expanded[1]["config"]["url"] == "https://us.example.com/orders"
+    assert all("matrix" not in task for task in expanded)
+    # Subtrees without placeholders are shared, not copied
+    assert expanded[0]["config"]["headers"] is expanded[3]["config"]["headers"] is entry["config"]["headers"]
+
+
+def test_foreach_with_matrix_and_typed_values():
+    entry = {
+        "name": "probe",
+        "type": "http_get",
+        "foreach": [{"host": "a"}, {"host": "b"}],
+        "matrix": {"port": [80, 443]},
+        "depends_on": ["setup-${matrix.host}"],
+        "config": {"host": "${matrix.host}", "port": "${matrix.port}", "env": "${HOME}"},
+    }
+
+    expanded = list(expand_entry(entry))
+
+    # Names without placeholders get the values appended
+    assert [task["name"] for task in expanded] == ["probe-a-80", "probe-a-443", "probe-b-80", "probe-b-443"]
+    assert expanded[1]["config"] == {"host": "a", "port": 443, "env": "${HOME}"}
+    assert expanded[2]["depends_on"] == ["setup-b"]
+
+
+def test_expansion_is_lazy():
+    entry = {"name": "t-${matrix.i}", "type": "log", "matrix": {"i": list(range(1000)), "j": list(range(1000))},
+             "config": {"message": "${matrix.i}/${matrix.j}"}}
+
+    expanded = expand_entry(entry)
+
+    assert next(expanded)["config"]["message"] == "0/0"
+    assert next(expanded)["config"]["message"] == "0/1"
+
+
+def test_unknown_variable():
+    entry = {"name": "t", "type": "log", "matrix": {"i": [1]}, "config": {"message": "${matrix.missing}"}}
+
+    with pytest.raises(ValueError) as exc_info:
+        list(expand_entry(entry))
+    assert str(exc_info.value) == MatrixMessages.UNKNOWN_VARIABLE.value.format("t", "missing")
+
+
+@pytest.mark.parametrize("fields, message", [
+    ({"matrix": {"i": []}}, MatrixMessages.INVALID_MATRIX),
+    ({"matrix": ["a"]}, MatrixMessages.INVALID_MATRIX),
+    ({"foreach": []}, MatrixMessages.INVALID_FOREACH),
+    ({"foreach": ["a"]}, MatrixMessages.INVALID_FOREACH),
+])
+def test_invalid_matrix(fields, message):
+    with pytest.raises(ValueError) as exc_info:
+        list(expand_entry(dict({"name": "t", "type": "log"}, **fields)))
+    assert str(exc_info.value) == message.value.format("t")
@@ -0,0 +1,123 @@
+import json
+from unittest.mock import patch
+
+from taskrunner.models.task_model import TaskModel
+from taskrunner.plugin_base import BaseTaskRunner
+from taskrunner.tasks.async_executor import run_tasks_async
+from taskrunner.tasks.executor import run_tasks_sequentially, run_tasks_in_parallel, run_tasks_in_processes
+from taskrunner.tasks.metrics import RunMetrics, TaskMetrics, percentile, _find_critical_path
+from taskrunner.plugins.file_task import FileTask
+
+
+class RecordingPlugin(BaseTaskRunner):
+    type_name = "rec"
+
+    def run(self, config):
+        if config.get("fail"):
+            raise Exception("boom")
+
+
+def _finished_task(name, depends_on, run_seconds, finished_at):
+    task = TaskMetrics(name, "rec", depends_on)
+    task.run_seconds = run_seconds
+    task.finished_at = finished_at
+    task.status = "success"
+    return task
+
+
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 99) == 99.01
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) is None
+
+
+def test_find_critical_path():
+    tasks = [
+        _finished_task("first", [], 1.0, 1),
+        _finished_task("slow", [], 5.0, 2),
+        _finished_task("second", ["first"], 2.0, 3),
+        _finished_task("last", ["second", "slow"], 1.0, 4),
+    ]
+
+    path, seconds = _find_critical_path(tasks)
+
+    assert path == ["slow", "last"]
+    assert seconds == 6.0
+    assert _find_critical_path([]) == ([], 0.0)
+
+
+def test_build_report():
+    metrics = RunMetrics("thread")
+    tasks = [
+        TaskModel(name="first", type="rec", config={}),
+        TaskModel(name="second", type="rec", config={"fail": True}, depends_on=["first"]),
+        TaskModel(name="third", type="rec", config={}, depends_on=["second"]),
+    ]
+
+    with patch('builtins.print'):
+        run_tasks_in_parallel(tasks, {"rec": RecordingPlugin}, metrics=metrics)
+    metrics.finish()
+    report = metrics.build_report()
+
+    assert report["engine"] == "thread"
+    assert report["total_tasks"] == 3
+    assert report["statuses"] == {"success": 1, "error": 1, "skipped": 1}
+    assert report["critical_path"] == ["first", "second"]
+    assert report["plugins"]["rec"]["count"] == 2
+    assert set(report["plugins"]["rec"]["run_seconds"]) == {"p50", "p95", "p99", "max", "total"}
+    assert [task["name"] for task in report["tasks"]] == ["first", "second"]
+    assert report["tasks"][0]["validation_seconds"] >= 0
+
+
+def test_run_tasks_sequentially_records_failed_task():
+    metrics = RunMetrics("sequential")
+    tasks = [TaskModel(name="broken", type="rec", config={"fail": True})]
+
+    with patch('builtins.print'):
+        try:
+            run_tasks_sequentially(tasks, {"rec": RecordingPlugin}, metrics=metrics)
+        except Exception:
+            pass
+
+    report = metrics.build_report()
+    assert report["statuses"] == {"error": 1}
+    assert report["tasks"][0]["run_seconds"] >= 0
+
+
+def test_run_tasks_async_records_metrics():
+    metrics = RunMetrics("asyncio")
+    tasks = [TaskModel(name=f"task{i}", type="rec", config={}) for i in range(3)]
+
+    with patch('builtins.print'):
+        run_tasks_async(tasks, {"rec": RecordingPlugin}, metrics=metrics)
+
+    assert metrics.build_report()["statuses"] == {"success": 3}
+
+
+def test_run_tasks_in_processes_records_worker_timings(tmp_path):
+    metrics = RunMetrics("process")
+    tasks = [TaskModel(name="create", type="file",
+                       config={"action": "create", "path": str(tmp_path / "file.txt"), "content": "x"})]
+
+    with patch('builtins.print'):
+        run_tasks_in_processes(tasks, {"file": FileTask}, max_workers=1, metrics=metrics)
+
+    task = metrics.build_report()["tasks"][0]
+    assert task["status"] == "success"
+    assert task["run_seconds"] > 0
+
+
+def test_write_report(tmp_path):
+    metrics = RunMetrics("sequential")
+    with patch('builtins.print'):
+        run_tasks_sequentially([TaskModel(name="task1", type="rec", config={})], {"rec": RecordingPlugin},
+                               metrics=metrics)
+    metrics.finish()
+
+    path = tmp_path / "report.json"
+    message = metrics.write_report(str(path))
+
+    assert message == f"Run report written to {path}"
+    assert json.loads(path.read_text())["tasks"][0]["name"] == "task1"
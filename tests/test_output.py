@@ -0,0 +1,158 @@
+import io
+import json
+import time
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from taskrunner.cli import cli
+from taskrunner.models.task_model import TaskModel
+from taskrunner.plugin_base import BaseTaskRunner
+from taskrunner.tasks.executor import run_tasks_in_parallel, _run_in_process_worker, _worker_plugins
+from taskrunner.utils.output import (
+    OutputMode,
+    batch_item,
+    batch_output,
+    capture_output,
+    emit,
+    output_sink,
+    task_output
+)
+
+
+class ChattyTask(BaseTaskRunner):
+    type_name = "chatty"
+
+    def run(self, config):
+        for i in range(3):
+            emit(f"{config['name']} line {i}")
+            time.sleep(0.001)
+
+
+def test_emit_prints_without_sink():
+    with patch('builtins.print') as mock_print:
+        emit("hello")
+
+    mock_print.assert_called_once_with("hello")
+
+
+def test_text_sink_writes_lines():
+    stream = io.StringIO()
+    with output_sink(OutputMode.TEXT.value, stream):
+        emit("first")
+        emit("second", "task1")
+
+    assert stream.getvalue() == "first\nsecond\n"
+
+
+def test_jsonl_sink_writes_records():
+    stream = io.StringIO()
+    with output_sink(OutputMode.JSONL.value, stream):
+        with task_output("task1"):
+            emit("running")
+        emit("failed", "task2", error=True)
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(record["task"], record["level"], record["message"]) for record in records] == [
+        ("task1", "info", "running"),
+        ("task2", "error", "failed"),
+    ]
+
+
+def test_quiet_sink_writes_only_errors():
+    stream = io.StringIO()
+    with output_sink(OutputMode.QUIET.value, stream):
+        emit("running", "task1")
+        emit("failed", "task1", error=True)
+
+    assert stream.getvalue() == "failed\n"
+
+
+def test_task_output_keeps_parallel_tasks_together():
+    stream = io.StringIO()
+    tasks = [TaskModel(name=f"task{i}", type="chatty", config={"name": f"task{i}"}) for i in range(8)]
+
+    with output_sink(OutputMode.TEXT.value, stream):
+        run_tasks_in_parallel(tasks, {"chatty": ChattyTask}, max_workers=4)
+
+    lines = stream.getvalue().splitlines()
+    for i in range(8):
+        start = lines.index(f"[TASK{i}] Running task: task{i}")
+        assert lines[start + 1:start + 4] == [f"task{i} line {n}" for n in range(3)]
+
+
+def test_capture_output_in_process_worker():
+    with patch.dict(_worker_plugins, {"chatty": ChattyTask}, clear=True), patch('builtins.print') as mock_print:
+        status, message, timings = _run_in_process_worker("chatty", {"name": "task1"})
+
+    assert status == "success"
+    assert [record[2] for record in timings["output"]] == [f"task1 line {n}" for n in range(3)]
+    mock_print.assert_not_called()
+
+
+def test_capture_output_collects_records():
+    with capture_output("task1") as records:
+        emit("captured")
+
+    assert records[0][1:] == ("task1", "captured", False)
+
+
+def test_run_with_jsonl_output_writes_only_records(tmp_path, monkeypatch):
+    (tmp_path / "tasks.yaml").write_text("- name: greet\n  type: log\n  config:\n    message: hi\n")
+    (tmp_path / "journal.jsonl").write_text("")
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["run", "tasks.yaml", "--output", "jsonl", "--resume", "journal.jsonl",
+                                 "--report", "report.json"])
+    failed = runner.invoke(cli, ["run", "missing.yaml", "--output", "jsonl"])
+
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert result.exit_code == 0
+    assert "greet" in {record["task"] for record in records}
+    assert (records[0]["task"], records[0]["message"]) == (
+        None, "Resuming from journal.jsonl: skipping 0 task(s) that already succeeded")
+    assert (records[-1]["task"], records[-1]["message"]) == (None, "Run report written to report.json")
+
+    error_records = [json.loads(line) for line in failed.stdout.splitlines()]
+    assert failed.exit_code == 1
+    assert [(record["level"], record["message"]) for record in error_records] == [
+        ("error", "Error: Task file missing.yaml not found"),
+    ]
+
+
+def test_batch_output_attributes_lines_to_batch_positions():
+    stream = io.StringIO()
+    with output_sink(OutputMode.JSONL.value, stream):
+        with batch_output(["first", "second"]):
+            emit("starting batch")
+            with batch_item(1):
+                emit("second line")
+            with batch_item(0):
+                emit("first line")
+            # Written as one block when the batch finishes
+            assert stream.getvalue() == ""
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(record["task"], record["message"]) for record in records] == [
+        (None, "starting batch"),
+        ("second", "second line"),
+        ("first", "first line"),
+    ]
+
+
+def test_batched_parallel_run_attributes_plugin_lines_to_tasks(tmp_path, monkeypatch):
+    tasks = "".join(f"- name: write{i}\n  type: file\n  config:\n    action: create\n    path: out{i}.txt\n"
+                    for i in range(20))
+    (tmp_path / "tasks.yaml").write_text(tasks)
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(cli, ["run", "tasks.yaml", "--parallel", "--batch-size", "file=20",
+                                      "--output", "jsonl"])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    file_records = [record for record in records if record["message"].startswith("[FileTask]")]
+    assert len(file_records) == 40
+    for record in file_records:
+        assert f"out{record['task'][len('write'):]}.txt" in record["message"]
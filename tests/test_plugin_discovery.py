@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch, MagicMock
 import os
+import subprocess
 import sys
 from taskrunner.utils.plugin_discovery import (
     discover_plugins, 
@@ -9,7 +10,11 @@ from taskrunner.utils.plugin_discovery import (
     _load_local_plugin_module,
     _discover_external_plugins,
     _register_plugin_classes,
-    _is_valid_plugin_class
+    _is_valid_plugin_class,
+    discover_plugins_lazily,
+    _scan_plugin_source,
+    LazyPlugin,
+    PluginRegistry
 )
 from taskrunner.plugin_base import BaseTaskRunner
 
@@ -158,4 +163,81 @@ def test_discover_plugins_with_package_prefix():
         # Should call both local and external discovery
         mock_discover_external.assert_called_once()
         
-        assert isinstance(result, dict)
\ No newline at end of file
+        assert isinstance(result, dict)
+
+
+def test_scan_plugin_source(tmp_path):
+    source = tmp_path / "plugins.py"
+    source.write_text(
+        "from taskrunner.plugin_base import BaseTaskRunner\n"
+        "import heavy_dependency_that_is_not_installed\n"
+        "class First(BaseTaskRunner):\n"
+        "    type_name = 'first'\n"
+        "class Annotated(BaseTaskRunner):\n"
+        "    type_name: str = 'annotated'\n"
+        "class NoTypeName(BaseTaskRunner):\n"
+        "    pass\n"
+        "class NotAClass:\n"
+        "    pass\n"
+    )
+
+    assert _scan_plugin_source(str(source)) == [("first", "First"), ("annotated", "Annotated")]
+
+
+def test_discover_plugins_lazily_does_not_import_plugins():
+    # Run in a fresh interpreter so modules imported by other tests don't interfere
+    code = (
+        "import sys\n"
+        "from taskrunner.utils.plugin_discovery import discover_plugins_lazily\n"
+        "plugins = discover_plugins_lazily()\n"
+        "assert {'log', 'wait', 'http_get', 'file'} <= set(plugins), set(plugins)\n"
+        "assert 'taskrunner.plugins.http_get_task' not in sys.modules\n"
+        "assert plugins['log'].type_name == 'log'\n"
+        "assert 'taskrunner.plugins.log_task' in sys.modules\n"
+        "assert 'taskrunner.plugins.http_get_task' not in sys.modules\n"
+        "assert 'requests' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_discover_plugins_lazily_external_package(tmp_path, monkeypatch):
+    package = tmp_path / "lazy_external_plugins"
+    (package / "nested").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "setup.py").write_text("raise SystemExit('must not be imported')\n")
+    (package / "nested" / "__init__.py").write_text("")
+    (package / "nested" / "tasks.py").write_text(
+        "from taskrunner.plugin_base import BaseTaskRunner\n"
+        "class ExternalLog(BaseTaskRunner):\n"
+        "    type_name = 'log'\n"
+        "class Nested(BaseTaskRunner):\n"
+        "    type_name = 'nested'\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    plugins = discover_plugins_lazily(package_prefix="lazy_external_plugins")
+
+    # Local plugins keep precedence over external ones with the same type_name
+    assert plugins.entries()["log"].module_name == "taskrunner.plugins.log_task"
+    assert plugins.entries()["nested"].module_name == "lazy_external_plugins.nested.tasks"
+    assert plugins["nested"].__name__ == "Nested"
+
+
+def test_lazy_plugin_rejects_non_plugins():
+    plugin = LazyPlugin("log", "taskrunner.plugins.log_task", "LogTaskConfig")
+
+    with pytest.raises(ImportError):
+        plugin.load()
+
+
+def test_plugin_registry_mapping():
+    registry = PluginRegistry({"log": LazyPlugin("log", "taskrunner.plugins.log_task", "LogTask")})
+
+    assert "log" in registry
+    assert "wait" not in registry
+    assert list(registry) == ["log"]
+    assert len(registry) == 1
+    assert registry["log"].type_name == "log"
+    assert len(registry.select({"wait"})) == 0
@@ -0,0 +1,96 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from taskrunner.plugins.log_task import LogTask
+from taskrunner.plugins.wait_task import WaitTask
+from taskrunner.utils.plugin_discovery import LazyPlugin, PluginRegistry
+from taskrunner.utils.plugin_registry import (
+    resolve_plugins,
+    _get_manifest_path,
+    _compute_fingerprint,
+    _get_default_plugin_folder,
+    REGISTRY_DIR_ENV,
+    DISABLE_REGISTRY_ENV
+)
+
+
+@pytest.fixture
+def registry_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(REGISTRY_DIR_ENV, str(tmp_path))
+    monkeypatch.delenv(DISABLE_REGISTRY_ENV, raising=False)
+    return tmp_path
+
+
+def test_resolve_plugins_writes_manifest(registry_dir):
+    plugins = resolve_plugins({"log"})
+
+    assert plugins == {"log": LogTask}
+    with open(_get_manifest_path(None)) as f:
+        manifest = json.load(f)
+    assert manifest["plugins"]["log"] == {"module": "taskrunner.plugins.log_task", "class": "LogTask"}
+    assert manifest["plugins"]["wait"] == {"module": "taskrunner.plugins.wait_task", "class": "WaitTask"}
+
+
+def test_resolve_plugins_uses_manifest_without_discovery(registry_dir):
+    resolve_plugins({"log"})
+
+    with patch('taskrunner.utils.plugin_registry.discover_plugins_lazily') as mock_discover, \
+         patch('taskrunner.utils.plugin_discovery.importlib.import_module',
+               wraps=__import__('importlib').import_module) as mock_import:
+        plugins = resolve_plugins({"wait", "unknown"})
+
+        mock_discover.assert_not_called()
+        mock_import.assert_called_once_with("taskrunner.plugins.wait_task")
+        assert plugins == {"wait": WaitTask}
+
+
+def test_resolve_plugins_rediscovers_when_fingerprint_changes(registry_dir):
+    resolve_plugins({"log"})
+
+    with patch('taskrunner.utils.plugin_registry._compute_fingerprint', return_value="changed"), \
+         patch('taskrunner.utils.plugin_registry.discover_plugins_lazily',
+               return_value=PluginRegistry({"log": LazyPlugin("log", "taskrunner.plugins.log_task", "LogTask")})) \
+            as mock_discover:
+        plugins = resolve_plugins({"log"})
+
+        mock_discover.assert_called_once()
+        assert plugins == {"log": LogTask}
+
+
+def test_resolve_plugins_rediscovers_on_broken_entry(registry_dir):
+    resolve_plugins({"log"})
+    manifest_path = _get_manifest_path(None)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest["plugins"]["log"] = {"module": "taskrunner.plugins.missing_module", "class": "LogTask"}
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+    assert resolve_plugins({"log"}) == {"log": LogTask}
+
+
+def test_resolve_plugins_disabled(registry_dir, monkeypatch):
+    monkeypatch.setenv(DISABLE_REGISTRY_ENV, "1")
+
+    assert resolve_plugins({"log"}) == {"log": LogTask}
+    assert not os.listdir(registry_dir)
+
+
+def test_manifest_path_depends_on_prefix(registry_dir):
+    assert _get_manifest_path(None) != _get_manifest_path("my_plugins")
+    assert _get_manifest_path("my_plugins") == _get_manifest_path("my_plugins")
+
+
+def test_compute_fingerprint_tracks_plugin_files(tmp_path):
+    plugin_file = tmp_path / "my_plugin.py"
+    plugin_file.write_text("x = 1\n")
+    before = _compute_fingerprint(str(tmp_path), None)
+
+    plugin_file.write_text("x = 22\n")
+
+    assert _compute_fingerprint(str(tmp_path), None) != before
+    assert _compute_fingerprint(_get_default_plugin_folder(), None) == \
+        _compute_fingerprint(_get_default_plugin_folder(), None)
@@ -0,0 +1,95 @@
+import os
+
+from taskrunner.plugin_base import BaseTaskRunner
+from taskrunner.plugins.file_task import FileTask
+from taskrunner.utils.result_cache import ResultCache, compute_task_hash
+
+
+class CacheablePlugin(BaseTaskRunner):
+    type_name = "cacheable"
+    cacheable = True
+
+
+class UncacheablePlugin(BaseTaskRunner):
+    type_name = "uncacheable"
+    cacheable = False
+
+
+def test_compute_task_hash_is_stable_and_order_independent():
+    first = compute_task_hash("log", {"a": 1, "b": {"c": [1, 2]}})
+    second = compute_task_hash("log", {"b": {"c": [1, 2]}, "a": 1})
+
+    assert first == second
+    assert first != compute_task_hash("log", {"a": 2, "b": {"c": [1, 2]}})
+    assert first != compute_task_hash("wait", {"a": 1, "b": {"c": [1, 2]}})
+    assert first != compute_task_hash("log", {"a": 1, "b": {"c": [1, 2]}}, inputs=[1])
+
+
+def test_result_cache_store_and_lookup(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    runner = CacheablePlugin()
+
+    assert cache.is_fresh(runner, "cacheable", {"x": 1}) is False
+    cache.store(runner, "cacheable", {"x": 1})
+
+    assert cache.is_fresh(runner, "cacheable", {"x": 1}) is True
+    assert cache.is_fresh(runner, "cacheable", {"x": 2}) is False
+
+    # Entries persist on disk across cache instances
+    assert ResultCache(str(tmp_path)).is_fresh(runner, "cacheable", {"x": 1}) is True
+
+
+def test_result_cache_ignores_uncacheable_plugins(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    runner = UncacheablePlugin()
+
+    cache.store(runner, "uncacheable", {"x": 1})
+
+    assert cache.is_fresh(runner, "uncacheable", {"x": 1}) is False
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=10)
+    runner = CacheablePlugin()
+
+    for i in range(10):
+        cache.store(runner, "cacheable", {"x": i})
+        path = cache._entry_path(cache.key_for(runner, "cacheable", {"x": i}))
+        os.utime(path, (i, i))
+
+    # Using entry 0 makes it the most recently used one
+    assert cache.is_fresh(runner, "cacheable", {"x": 0}) is True
+    cache.store(runner, "cacheable", {"x": 10})
+
+    assert cache.is_fresh(runner, "cacheable", {"x": 0}) is True
+    assert cache.is_fresh(runner, "cacheable", {"x": 1}) is False
+    assert cache.is_fresh(runner, "cacheable", {"x": 10}) is True
+    assert sum(1 for _ in cache._iter_entry_paths()) <= 10
+
+
+def test_result_cache_file_task_inputs(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    target = tmp_path / "out.txt"
+    config = {"action": "create", "path": str(target), "content": "hello"}
+    runner = FileTask()
+
+    target.write_text("hello")
+    cache.store(runner, "file", config)
+    assert cache.is_fresh(runner, "file", config) is True
+
+    # Changing the file outside TaskRunner invalidates the cached result
+    target.write_text("edited by hand")
+    assert cache.is_fresh(runner, "file", config) is False
+
+
+def test_result_cache_only_caches_opted_in_plugins(tmp_path):
+    from taskrunner.plugins.log_task import LogTask
+    from taskrunner.plugins.wait_task import WaitTask
+
+    cache = ResultCache(str(tmp_path))
+    for runner, type_name, config in [(LogTask(), "log", {"message": "hi"}), (WaitTask(), "wait", {"seconds": 1}),
+                                      (BaseTaskRunner(), "plain", {})]:
+        cache.store(runner, type_name, config)
+        assert cache.is_fresh(runner, type_name, config) is False
+
+    assert FileTask.cacheable is True
@@ -0,0 +1,178 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from taskrunner.models.task_model import TaskModel
+from taskrunner.plugin_base import BaseTaskRunner
+from taskrunner.tasks.async_executor import run_tasks_async
+from taskrunner.tasks.executor import run_tasks_sequentially, run_tasks_in_parallel
+from taskrunner.tasks.retry import (
+    TaskTimeoutError,
+    backoff_delay,
+    call_with_timeout,
+    current_task_timeout,
+    retry_limit
+)
+
+
+class FlakyTask(BaseTaskRunner):
+    type_name = "flaky"
+    calls = {}
+
+    def run(self, config):
+        name = config["name"]
+        FlakyTask.calls[name] = FlakyTask.calls.get(name, 0) + 1
+        if FlakyTask.calls[name] <= config.get("failures", 0):
+            raise Exception("transient")
+        if config.get("hang"):
+            time.sleep(config["hang"])
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    FlakyTask.calls.clear()
+
+
+def test_retry_limit_and_backoff_delay():
+    task = TaskModel(name="task", type="flaky", retries=3, backoff=0.5)
+
+    assert retry_limit(task) == 3
+    assert retry_limit(TaskModel(name="task", type="flaky")) == 0
+    for attempt in range(10):
+        assert 0 <= backoff_delay(task, attempt) <= min(60.0, 0.5 * 2 ** attempt)
+
+
+def test_call_with_timeout():
+    assert call_with_timeout(lambda value: value * 2, None, 2) == 4
+    assert call_with_timeout(lambda value: value * 2, 1, 2) == 4
+
+    started = time.monotonic()
+    with pytest.raises(TaskTimeoutError):
+        call_with_timeout(time.sleep, 0.05, 1)
+    assert time.monotonic() - started < 0.5
+
+
+def test_run_tasks_sequentially_retries_transient_failures():
+    tasks = [TaskModel(name="task1", type="flaky", config={"name": "task1", "failures": 2}, retries=2, backoff=0)]
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_sequentially(tasks, {"flaky": FlakyTask})
+
+    assert FlakyTask.calls["task1"] == 3
+    mock_print.assert_any_call("[TASK1] Task 'task1' completed successfully")
+
+
+def test_run_tasks_sequentially_gives_up_after_retries():
+    tasks = [TaskModel(name="task1", type="flaky", config={"name": "task1", "failures": 5}, retries=1, backoff=0)]
+
+    with patch('builtins.print'), pytest.raises(Exception):
+        run_tasks_sequentially(tasks, {"flaky": FlakyTask})
+
+    assert FlakyTask.calls["task1"] == 2
+
+
+def test_run_tasks_in_parallel_retries_and_times_out():
+    tasks = [
+        TaskModel(name="flaky", type="flaky", config={"name": "flaky", "failures": 1}, retries=1, backoff=0.01),
+        TaskModel(name="after", type="flaky", config={"name": "after"}, depends_on=["flaky"]),
+        TaskModel(name="hung", type="flaky", config={"name": "hung", "hang": 5}, timeout=0.05),
+    ]
+
+    started = time.monotonic()
+    with patch('builtins.print') as mock_print:
+        run_tasks_in_parallel(tasks, {"flaky": FlakyTask}, max_workers=1)
+
+    assert time.monotonic() - started < 2
+    assert FlakyTask.calls == {"flaky": 2, "after": 1, "hung": 1}
+    mock_print.assert_any_call("[HUNG] Task 'hung' failed: Timed out after 0.05s")
+
+
+def test_run_tasks_async_retries_and_times_out():
+    tasks = [
+        TaskModel(name="flaky", type="flaky", config={"name": "flaky", "failures": 1}, retries=1, backoff=0.01),
+        TaskModel(name="hung", type="flaky", config={"name": "hung", "hang": 0.5}, timeout=0.05),
+    ]
+
+    with patch('builtins.print') as mock_print:
+        run_tasks_async(tasks, {"flaky": FlakyTask})
+
+    assert FlakyTask.calls["flaky"] == 2
+    mock_print.assert_any_call("[FLAKY] Task 'flaky' completed successfully")
+    mock_print.assert_any_call("[HUNG] Task 'hung' failed: Timed out after 0.05s")
+
+
+class AsyncHangTask(BaseTaskRunner):
+    type_name = "async_hang"
+    calls = 0
+
+    def run(self, config):
+        raise NotImplementedError
+
+    async def run_async(self, config):
+        AsyncHangTask.calls += 1
+        await asyncio.sleep(config["hang"])
+
+
+def _hung_task():
+    return TaskModel(name="hung", type="flaky", config={"name": "hung", "hang": 0.3}, timeout=0.05, retries=2,
+                     backoff=0)
+
+
+@pytest.mark.parametrize("run", [
+    lambda tasks, plugins: run_tasks_in_parallel(tasks, plugins, max_workers=2),
+    lambda tasks, plugins: run_tasks_async(tasks, plugins),
+])
+def test_timed_out_attempts_are_not_retried_while_still_running(run):
+    with patch('builtins.print') as mock_print:
+        run([_hung_task()], {"flaky": FlakyTask})
+
+    assert FlakyTask.calls["hung"] == 1
+    mock_print.assert_any_call("[HUNG] Task 'hung' failed: Timed out after 0.05s")
+
+
+def test_run_tasks_sequentially_does_not_retry_timed_out_attempts():
+    with patch('builtins.print'), pytest.raises(TaskTimeoutError):
+        run_tasks_sequentially([_hung_task()], {"flaky": FlakyTask})
+
+    assert FlakyTask.calls["hung"] == 1
+
+
+def test_run_tasks_async_retries_cancelled_async_plugins():
+    AsyncHangTask.calls = 0
+    tasks = [TaskModel(name="hung", type="async_hang", config={"hang": 5}, timeout=0.05, retries=2, backoff=0)]
+
+    with patch('builtins.print'):
+        run_tasks_async(tasks, {"async_hang": AsyncHangTask})
+
+    assert AsyncHangTask.calls == 3
+
+
+class BoundedHangTask(BaseTaskRunner):
+    type_name = "bounded"
+    enforces_timeout = True
+    limits = []
+
+    def run(self, config):
+        BoundedHangTask.limits.append(current_task_timeout())
+        time.sleep(config["hang"])
+
+
+@pytest.mark.parametrize("run", [
+    lambda tasks, plugins: run_tasks_in_parallel(tasks, plugins, max_workers=2),
+    lambda tasks, plugins: run_tasks_async(tasks, plugins),
+])
+def test_timed_out_attempts_are_retried_for_plugins_that_enforce_the_timeout(run):
+    BoundedHangTask.limits = []
+    tasks = [TaskModel(name="bounded", type="bounded", config={"hang": 0.1}, timeout=0.05, retries=2, backoff=0)]
+
+    with patch('builtins.print') as mock_print:
+        run(tasks, {"bounded": BoundedHangTask})
+
+    printed = [call[0][0] for call in mock_print.call_args_list]
+    assert sum("retrying in" in line for line in printed) == 2
+    assert "[BOUNDED] Task 'bounded' failed: Timed out after 0.05s" in printed
+    # Attempts may still be queued for a thread when the last one times out, so not all have started
+    assert BoundedHangTask.limits and set(BoundedHangTask.limits) == {0.05}
+    assert current_task_timeout() is None
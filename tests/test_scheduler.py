@@ -0,0 +1,232 @@
+import pytest
+from click.testing import CliRunner
+
+from taskrunner.cli import cli
+from taskrunner.models.task_model import TaskModel
+from taskrunner.tasks.scheduler import (
+    validate_dependencies,
+    find_dependency_cycle,
+    topological_order,
+    has_dependencies,
+    has_priorities,
+    DependencyTracker,
+    FairTaskQueue,
+    SchedulerMessages,
+    validate_type_settings
+)
+
+
+def _task(name, depends_on=None, type="log", priority=0):
+    return TaskModel(name=name, type=type, config={"message": name}, depends_on=depends_on or [],
+                     priority=priority)
+
+
+def test_validate_dependencies_valid():
+    tasks = [_task("a"), _task("b", ["a"]), _task("c", ["a", "b"])]
+
+    # Should not raise
+    validate_dependencies(tasks)
+
+
+def test_validate_dependencies_unknown():
+    tasks = [_task("a"), _task("b", ["missing"])]
+
+    with pytest.raises(ValueError) as exc_info:
+        validate_dependencies(tasks)
+
+    assert SchedulerMessages.UNKNOWN_DEPENDENCY.value.format("b", "missing") in str(exc_info.value)
+
+
+def test_validate_dependencies_self():
+    with pytest.raises(ValueError) as exc_info:
+        validate_dependencies([_task("a", ["a"])])
+
+    assert SchedulerMessages.SELF_DEPENDENCY.value.format("a") in str(exc_info.value)
+
+
+def test_validate_dependencies_cycle():
+    tasks = [_task("a", ["c"]), _task("b", ["a"]), _task("c", ["b"])]
+
+    with pytest.raises(ValueError) as exc_info:
+        validate_dependencies(tasks)
+
+    assert "Dependency cycle detected" in str(exc_info.value)
+
+
+def test_find_dependency_cycle():
+    assert find_dependency_cycle([_task("a"), _task("b", ["a"])]) is None
+
+    cycle = find_dependency_cycle([_task("a", ["b"]), _task("b", ["a"])])
+    assert cycle[0] == cycle[-1]
+    assert set(cycle) == {"a", "b"}
+
+
+def test_topological_order_keeps_file_order_for_independent_tasks():
+    tasks = [_task("late", ["first"]), _task("first"), _task("other")]
+
+    ordered = [task.name for task in topological_order(tasks)]
+
+    assert ordered == ["first", "other", "late"]
+
+
+def test_topological_order_cycle():
+    with pytest.raises(ValueError):
+        topological_order([_task("a", ["b"]), _task("b", ["a"])])
+
+
+def test_has_dependencies():
+    assert has_dependencies([_task("a"), _task("b")]) is False
+    assert has_dependencies([_task("a"), _task("b", ["a"])]) is True
+
+
+def test_dependency_tracker_releases_tasks():
+    tasks = [_task("a"), _task("b", ["a"]), _task("c", ["a", "b"])]
+    tracker = DependencyTracker(tasks)
+
+    assert [task.name for task in tracker.ready()] == ["a"]
+    assert [task.name for task in tracker.mark_done("a")] == ["b"]
+    assert [task.name for task in tracker.mark_done("b")] == ["c"]
+    assert tracker.has_pending is True
+    tracker.mark_done("c")
+    assert tracker.has_pending is False
+
+
+def test_dependency_tracker_failure_skips_dependents():
+    tasks = [_task("a"), _task("b", ["a"]), _task("c", ["b"]), _task("d")]
+    tracker = DependencyTracker(tasks)
+
+    assert [task.name for task in tracker.ready()] == ["a", "d"]
+    assert tracker.mark_failed("a") == ["b", "c"]
+    assert tracker.has_pending is True
+    tracker.mark_done("d")
+    assert tracker.has_pending is False
+
+
+def test_dependency_tracker_ignores_filtered_out_dependencies():
+    tracker = DependencyTracker([_task("b", ["a"])])
+
+    assert [task.name for task in tracker.ready()] == ["b"]
+
+
+def test_dependency_tracker_add_streamed_tasks():
+    tracker = DependencyTracker()
+
+    assert tracker.add(_task("a")) == (True, None)
+    assert tracker.add(_task("b", ["a"])) == (False, None)
+    assert [task.name for task in tracker.mark_done("a")] == ["b"]
+
+    # Dependencies that already finished are satisfied immediately
+    assert tracker.add(_task("c", ["a"])) == (True, None)
+
+    assert tracker.add(_task("d")) == (True, None)
+    tracker.mark_failed("d")
+    assert tracker.add(_task("e", ["d"])) == (False, "d")
+
+
+def test_topological_order_prefers_higher_priority():
+    tasks = [_task("a"), _task("b", priority=5), _task("c", ["a"], priority=10), _task("d")]
+
+    assert has_priorities(tasks) is True
+    assert [task.name for task in topological_order(tasks)] == ["b", "a", "c", "d"]
+
+
+def test_fair_task_queue_priority_before_fairness():
+    queue = FairTaskQueue()
+    queue.push(_task("bulk", type="file"))
+    queue.push(_task("urgent", type="http_get", priority=1))
+
+    assert queue.pop().name == "urgent"
+    assert queue.pop().name == "bulk"
+    assert queue.pop() is None
+
+
+def test_fair_task_queue_shares_workers_between_types():
+    queue = FairTaskQueue()
+    for i in range(3):
+        queue.push(_task(f"file{i}", type="file"))
+    queue.push(_task("http0", type="http_get"))
+
+    # The http task is not stuck behind every file task that arrived first
+    assert [queue.pop().name for _ in range(2)] == ["file0", "http0"]
+    assert len(queue) == 2
+
+
+def test_fair_task_queue_weights():
+    queue = FairTaskQueue(type_weights={"http_get": 3})
+    for i in range(4):
+        queue.push(_task(f"file{i}", type="file"))
+        queue.push(_task(f"http{i}", type="http_get"))
+
+    names = [queue.pop().name for _ in range(4)]
+    assert names == ["file0", "http0", "http1", "http2"]
+
+
+def test_fair_task_queue_type_limits():
+    queue = FairTaskQueue(type_limits={"file": 1})
+    queue.push(_task("file0", type="file"))
+    queue.push(_task("file1", type="file"))
+
+    assert queue.pop().name == "file0"
+    assert queue.pop() is None
+    queue.release("file")
+    assert queue.pop().name == "file1"
+
+
+def test_fair_task_queue_rejects_invalid_settings():
+    with pytest.raises(ValueError) as exc_info:
+        FairTaskQueue(type_limits={"file": 0})
+    assert str(exc_info.value) == SchedulerMessages.INVALID_TYPE_LIMIT.value.format("file")
+
+    with pytest.raises(ValueError):
+        FairTaskQueue(type_weights={"file": 0})
+
+    with pytest.raises(ValueError) as exc_info:
+        validate_type_settings(batch_sizes={"file": 0})
+    assert str(exc_info.value) == SchedulerMessages.INVALID_BATCH_SIZE.value.format("file")
+
+
+@pytest.mark.parametrize("option, value, message", [
+    ("--type-limit", "file=0", SchedulerMessages.INVALID_TYPE_LIMIT.value.format("file")),
+    ("--type-weight", "file=-1", SchedulerMessages.INVALID_TYPE_WEIGHT.value.format("file")),
+    ("--batch-size", "file=0", SchedulerMessages.INVALID_BATCH_SIZE.value.format("file")),
+])
+@pytest.mark.parametrize("engine_options", [[], ["--engine", "asyncio"], ["--parallel"]])
+def test_run_rejects_invalid_type_settings_for_every_engine(tmp_path, option, value, message, engine_options):
+    (tmp_path / "tasks.yaml").write_text("- name: greet\n  type: log\n  config:\n    message: hi\n")
+
+    result = CliRunner().invoke(cli, ["run", str(tmp_path / "tasks.yaml"), option, value] + engine_options)
+
+    assert result.exit_code == 2
+    assert message in result.output
+    assert "[LogTask]" not in result.output
+
+
+def test_fair_task_queue_pop_more_shares_the_slot():
+    queue = FairTaskQueue(type_limits={"file": 1})
+    for i in range(4):
+        queue.push(_task(f"file{i}", type="file"))
+    queue.push(_task("slow", type="file", priority=-1))
+
+    first = queue.pop()
+    more = queue.pop_more("file", 10, lambda task: task.priority == 0)
+
+    assert [task.name for task in [first] + more] == ["file0", "file1", "file2", "file3"]
+    assert len(queue) == 1
+    # The batch holds one slot of the type's limit
+    assert queue.pop() is None
+    queue.release("file")
+    assert queue.pop().name == "slow"
+    assert queue.pop_more("file", 10, lambda task: True) == []
+
+
+def test_fair_task_queue_pop_more_passes_over_rejected_tasks():
+    queue = FairTaskQueue()
+    for name in ["first", "alone", "second", "third"]:
+        queue.push(_task(name, type="file"))
+
+    first = queue.pop()
+    more = queue.pop_more("file", 10, lambda task: task.name != "alone")
+
+    assert [task.name for task in [first] + more] == ["first", "second", "third"]
+    assert len(queue) == 1
+    assert queue.pop().name == "alone"
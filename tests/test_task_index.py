@@ -0,0 +1,89 @@
+import pytest
+
+from taskrunner.models.task_model import TaskModel
+from taskrunner.models.task_record import TaskStore
+from taskrunner.utils.task_index import (
+    TaskIndex,
+    TaskIndexMessages,
+    SelectorKind,
+    exact_names,
+    parse_selectors,
+)
+
+
+def _tasks():
+    store = TaskStore()
+    return [store.add(TaskModel(**entry)) for entry in [
+        {"name": "build-api", "type": "log", "tags": ["nightly"], "config": {"message": "api"}},
+        {"name": "build-web", "type": "log", "config": {"message": "web"}},
+        {"name": "fetch", "type": "http_get", "tags": ["nightly", "network"], "config": {"url": "https://x"}},
+        {"name": "pause", "type": "wait", "config": {"seconds": 1}},
+    ]]
+
+
+def _select(*expressions):
+    return [task.name for task in TaskIndex(_tasks()).select(parse_selectors(expressions))]
+
+
+def test_parse_selectors():
+    selectors = parse_selectors(["build-*, type:http_get", "tag:nightly", "ns:task"])
+
+    assert [(selector.kind, selector.pattern) for selector in selectors] == [
+        (SelectorKind.NAME.value, "build-*"),
+        (SelectorKind.TYPE.value, "http_get"),
+        (SelectorKind.TAG.value, "nightly"),
+        (SelectorKind.NAME.value, "ns:task"),
+    ]
+    assert parse_selectors(()) == []
+
+
+def test_parse_rejects_empty_selectors():
+    with pytest.raises(ValueError) as exc_info:
+        parse_selectors(["a,,b"])
+    assert str(exc_info.value) == TaskIndexMessages.EMPTY_SELECTOR.value.format("a,,b")
+
+    with pytest.raises(ValueError):
+        parse_selectors(["type:"])
+
+
+def test_exact_names():
+    assert exact_names(parse_selectors(["a", "b"]))
+    assert not exact_names(parse_selectors(["a", "b*"]))
+    assert not exact_names(parse_selectors(["type:log"]))
+    assert not exact_names([])
+
+
+def test_select_by_name_glob_type_and_tag():
+    assert _select("pause") == ["pause"]
+    assert _select("build-*") == ["build-api", "build-web"]
+    assert _select("type:http_get") == ["fetch"]
+    assert _select("type:*") == ["build-api", "build-web", "fetch", "pause"]
+    assert _select("tag:nightly") == ["build-api", "fetch"]
+    assert _select("tag:net*") == ["fetch"]
+
+
+def test_select_keeps_file_order_without_repeats():
+    assert _select("pause,build-api", "tag:nightly") == ["build-api", "fetch", "pause"]
+
+
+def test_select_requires_every_selector_to_match():
+    with pytest.raises(ValueError) as exc_info:
+        _select("pause", "tag:missing")
+    assert str(exc_info.value) == TaskIndexMessages.NO_TASK_MATCHES.value.format("tag:missing")
+
+
+def test_selector_matches_single_tasks():
+    tasks = _tasks()
+    selector, = parse_selectors(["tag:network"])
+
+    assert [selector.matches(task) for task in tasks] == [False, False, True, False]
+
+
+def test_index_reports_duplicates_and_lookups():
+    tasks = _tasks()
+    index = TaskIndex(tasks + tasks[:2])
+
+    assert list(index.duplicates) == ["build-api", "build-web"]
+    assert index.get("fetch") is tasks[2]
+    assert index.get("missing") is None
+    assert index.by_type["log"] == [0, 1, 4, 5]
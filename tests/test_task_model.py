@@ -36,4 +36,23 @@ def test_task_model_invalid_data():
     
     # Missing type
     with pytest.raises(Exception):
-        TaskModel(name="test_task", config={"message": "Hello"})
\ No newline at end of file
+        TaskModel(name="test_task", config={"message": "Hello"})
+
+def test_task_model_depends_on():
+    task = TaskModel(name="test_task", type="log")
+    assert task.depends_on == []
+
+    task = TaskModel(name="test_task", type="log", depends_on=["other_task"])
+    assert task.depends_on == ["other_task"]
+
+
+def test_task_model_config_template_is_cached():
+    task = TaskModel(name="test", type="log", config={"message": "${USER_NAME_FOR_TEMPLATE}"})
+
+    assert task.config_template() is task.config_template()
+    assert task.config_template().has_placeholders is True
+
+
+def test_task_model_priority():
+    assert TaskModel(name="a", type="log").priority == 0
+    assert TaskModel(name="b", type="log", priority=5).priority == 5
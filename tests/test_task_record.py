@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+import pytest
+
+from taskrunner.models.task_model import TaskModel
+from taskrunner.models.task_record import TaskRecord, TaskStore
+from taskrunner.tasks.executor import run_tasks_in_parallel
+
+
+def _model(name, config, **fields):
+    return TaskModel(name=name, type="http_get", config=config, **fields)
+
+
+def test_store_keeps_task_fields():
+    store = TaskStore()
+    record = store.add(_model("task1", {"url": "https://example.com"}, depends_on=["task0"], retries=2,
+                              backoff=0.5, priority=3, timeout=10, tags=["nightly"]))
+
+    assert isinstance(record, TaskRecord)
+    assert (record.name, record.type, record.depends_on) == ("task1", "http_get", ("task0",))
+    assert (record.retries, record.backoff, record.priority, record.timeout) == (2, 0.5, 3, 10)
+    assert record.tags == ("nightly",)
+    assert record.dict() == _model("task1", {"url": "https://example.com"}, depends_on=["task0"], retries=2,
+                                   backoff=0.5, priority=3, timeout=10, tags=["nightly"]).dict()
+
+
+def test_store_shares_identical_configs_and_subtrees():
+    store = TaskStore()
+    headers = {"Accept": "application/json"}
+    first = store.add(_model("a", {"url": "https://example.com/1", "headers": dict(headers)}))
+    second = store.add(_model("b", {"url": "https://example.com/2", "headers": dict(headers)}))
+    third = store.add(_model("c", {"url": "https://example.com/1", "headers": dict(headers)}))
+
+    assert first.config is not second.config
+    assert first.config["headers"] is second.config["headers"]
+    assert first.config is third.config
+    assert first.config_template() is third.config_template()
+
+
+def test_store_keeps_scalar_types_apart():
+    store = TaskStore()
+    records = [store.add(_model(str(i), {"value": value})) for i, value in enumerate([1, 1.0, True])]
+
+    assert [type(record.config["value"]) for record in records] == [int, float, bool]
+
+
+def test_store_without_sharing_keeps_configs():
+    model = _model("a", {"url": "https://example.com"})
+    record = TaskStore(share_configs=False).add(model)
+
+    assert record.config is model.config
+
+
+def test_record_renders_placeholders():
+    store = TaskStore()
+    record = store.add(_model("a", {"request": {"url": "https://example.com?token=${BENCH_TOKEN}"}}))
+
+    with patch.dict("os.environ", {"BENCH_TOKEN": "secret"}):
+        assert record.config_template().render() == {"request": {"url": "https://example.com?token=secret"}}
+    # The stored config itself is never modified
+    assert record.config == {"request": {"url": "https://example.com?token=${BENCH_TOKEN}"}}
+
+
+def test_records_run_in_parallel():
+    ran = []
+
+    class RecordingTask:
+        def run(self, config):
+            ran.append(config["value"])
+
+    store = TaskStore()
+    records = [store.add(TaskModel(name=f"task{i}", type="rec", config={"value": i % 2})) for i in range(4)]
+    records.append(store.add(TaskModel(name="last", type="rec", config={"value": 2}, depends_on=["task0"])))
+
+    with patch('builtins.print'):
+        run_tasks_in_parallel(records, {"rec": RecordingTask}, max_workers=2)
+
+    assert sorted(ran) == [0, 0, 1, 1, 2]
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import patch
 
 import pytest
@@ -63,4 +64,15 @@ def test_wait_task_run_method_zero_seconds():
             # Verify that print was called with the expected messages
             assert mock_print.call_count == 2
             mock_print.assert_any_call("[WaitTask] Waiting 0 seconds...")
-            mock_print.assert_any_call("[WaitTask] Done.")
\ No newline at end of file
+            mock_print.assert_any_call("[WaitTask] Done.")
+
+def test_wait_task_run_async_method():
+    task = WaitTask()
+
+    # Mock asyncio.sleep so the event loop is not actually blocked
+    with patch('asyncio.sleep') as mock_sleep, patch('builtins.print') as mock_print:
+        asyncio.run(task.run_async({"seconds": 3}))
+
+        mock_sleep.assert_called_once_with(3)
+        mock_print.assert_any_call("[WaitTask] Waiting 3 seconds...")
+        mock_print.assert_any_call("[WaitTask] Done.")
@@ -0,0 +1,181 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from taskrunner.models.task_model import TaskModel
+from taskrunner.plugin_base import BaseTaskRunner
+from taskrunner.plugins.file_task import FileTask
+from taskrunner.tasks.work_queue import WorkQueue, WorkQueueMessages, parse_address, run_worker, serve_queue
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RecordingTask(BaseTaskRunner):
+    type_name = "rec"
+    executed = []
+
+    def run(self, config):
+        RecordingTask.executed.append(config.get("name"))
+        if config.get("fail"):
+            raise Exception("boom")
+
+
+def _start_queue(tasks, **kwargs):
+    ready = threading.Event()
+    address = {}
+    result = {}
+
+    def on_ready(server_address):
+        address["value"] = f"{server_address[0]}:{server_address[1]}"
+        ready.set()
+
+    def serve():
+        result["queue"] = serve_queue(tasks, "127.0.0.1:0", on_ready=on_ready, **kwargs)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    return address["value"], thread, result
+
+
+def test_parse_address():
+    assert parse_address("127.0.0.1:8765") == ("127.0.0.1", 8765)
+    with pytest.raises(ValueError):
+        parse_address("localhost")
+
+
+def test_work_queue_leases_in_dependency_order():
+    tasks = [
+        TaskModel(name="second", type="rec", depends_on=["first"]),
+        TaskModel(name="first", type="rec"),
+    ]
+
+    with patch('builtins.print'):
+        work_queue = WorkQueue(tasks)
+        lease_id, task = work_queue.lease("w1")
+        assert task.name == "first"
+        assert work_queue.lease("w2") is None
+
+        assert work_queue.complete(lease_id, "success")
+        lease_id, task = work_queue.lease("w2")
+        assert task.name == "second"
+        assert work_queue.complete(lease_id, "success")
+
+    assert work_queue.finished
+    assert work_queue.succeeded == ["first", "second"]
+
+
+def test_work_queue_requeues_expired_and_released_leases():
+    tasks = [TaskModel(name="task1", type="rec"), TaskModel(name="task2", type="rec")]
+
+    with patch('builtins.print'):
+        work_queue = WorkQueue(tasks, lease_timeout=0.01)
+        first_lease, _ = work_queue.lease("w1")
+        time.sleep(0.02)
+        work_queue.expire_leases()
+
+        # The expired lease no longer counts; the task is handed out again
+        assert work_queue.heartbeat(first_lease) is False
+        assert work_queue.complete(first_lease, "success") is False
+        assert work_queue.lease("w2")[1].name == "task1"
+
+        work_queue.lease_timeout = 30
+        work_queue.lease("w3")
+        work_queue.release_worker("w3")
+        assert work_queue.lease("w4")[1].name == "task2"
+
+
+def test_work_queue_fails_tasks_that_keep_losing_workers():
+    tasks = [TaskModel(name="task1", type="rec"), TaskModel(name="after", type="rec", depends_on=["task1"])]
+
+    with patch('builtins.print') as mock_print:
+        work_queue = WorkQueue(tasks, max_attempts=2)
+        for worker in ("w1", "w2"):
+            work_queue.lease(worker)
+            work_queue.release_worker(worker)
+
+    assert work_queue.finished
+    assert work_queue.failed == ["task1"]
+    mock_print.assert_any_call("[AFTER] Task 'after' skipped: dependency 'task1' failed")
+
+
+def test_serve_queue_with_local_workers():
+    RecordingTask.executed = []
+    tasks = [TaskModel(name=f"task{i}", type="rec", config={"name": f"task{i}"}) for i in range(10)]
+    tasks.append(TaskModel(name="broken", type="rec", config={"name": "broken", "fail": True}))
+    tasks.append(TaskModel(name="after_broken", type="rec", config={"name": "after_broken"},
+                           depends_on=["broken"]))
+
+    with patch('builtins.print'):
+        address, serve_thread, result = _start_queue(tasks)
+        workers = [threading.Thread(target=run_worker, args=(address, {"rec": RecordingTask})) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(10)
+        serve_thread.join(10)
+
+    work_queue = result["queue"]
+    assert sorted(work_queue.succeeded) == sorted(f"task{i}" for i in range(10))
+    assert work_queue.failed == ["broken"]
+    assert "after_broken" not in RecordingTask.executed
+
+
+def test_serve_queue_reassigns_work_of_killed_worker(tmp_path):
+    target = tmp_path / "done.txt"
+    tasks = [
+        TaskModel(name="long", type="wait", config={"seconds": 30}),
+        TaskModel(name="create", type="file", config={"action": "create", "path": str(target), "content": "ok"}),
+    ]
+
+    with patch('builtins.print'):
+        address, serve_thread, result = _start_queue(tasks, lease_timeout=3)
+
+        # A separate worker process picks up the long task and is killed mid-run
+        env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+        process = subprocess.Popen([sys.executable, "-m", "taskrunner", "worker", "--connect", address],
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, cwd=str(tmp_path))
+        for line in process.stdout:
+            if b"Running task: long" in line:
+                break
+        process.kill()
+        process.wait()
+
+        # The replacement worker gets the same task again; its 'wait' plugin returns immediately
+        run_worker(address, {"wait": RecordingTask, "file": FileTask})
+        serve_thread.join(10)
+
+    assert sorted(result["queue"].succeeded) == ["create", "long"]
+    assert target.read_text() == "ok"
+
+
+def test_serve_queue_replies_to_malformed_requests():
+    tasks = [TaskModel(name="task1", type="rec", config={"name": "task1"})]
+
+    with patch('builtins.print'):
+        address, serve_thread, result = _start_queue(tasks)
+        with socket.create_connection(parse_address(address), timeout=5) as connection:
+            stream = connection.makefile("rwb")
+            replies = []
+            for request in [b"not json", b"[1, 2]", b'{"op": "heartbeat"}', b'{"op": "result", "lease": 1}',
+                            b'{"op": "result", "lease": "1", "status": "success"}', b'{"op": "heartbeat", "lease": 7}']:
+                stream.write(request + b"\n")
+                stream.flush()
+                replies.append(json.loads(stream.readline()))
+
+        run_worker(address, {"rec": RecordingTask})
+        serve_thread.join(10)
+
+    assert [reply["op"] for reply in replies] == ["error"] * 5 + ["ok"]
+    assert replies[1]["message"] == WorkQueueMessages.INVALID_REQUEST.value.format("expected a JSON object")
+    assert replies[2]["message"] == WorkQueueMessages.INVALID_FIELD.value.format("heartbeat", "lease", "an integer")
+    assert replies[3]["message"] == WorkQueueMessages.INVALID_FIELD.value.format("result", "status", "a string")
+    assert replies[5]["valid"] is False
+    assert result["queue"].succeeded == ["task1"]